@@ -37,3 +37,42 @@ exe = EXE(
     entitlements_file=None,
     icon='ressources\\icon.ico',
 )
+
+
+# Version ligne de commande (serveurs sans affichage): b2pc-cli, sans PyQt6
+cli_a = Analysis(
+    ['b2pc.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('ressources', 'ressources')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=['PyQt6'],
+    noarchive=False,
+    optimize=0,
+)
+cli_pyz = PYZ(cli_a.pure)
+
+cli_exe = EXE(
+    cli_pyz,
+    cli_a.scripts,
+    cli_a.binaries,
+    cli_a.datas,
+    [],
+    name='b2pc-cli',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    runtime_tmpdir=None,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon='ressources\\icon.ico',
+)
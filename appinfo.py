@@ -0,0 +1,33 @@
+import json
+import os
+import sys
+import urllib.request
+from typing import Optional, Tuple
+
+# Module sans dépendance Qt: partagé par l'interface, les handlers et la ligne de commande
+
+APP_VERSION = "3.6.5.0"
+UPDATE_URL = "https://raw.githubusercontent.com/RetroGameSets/B2PC/refs/heads/main/ressources/last_version.json"
+DISCORD_URL = "https://discord.gg/chz59Z9Bhj"
+
+
+# Fonction utilitaire pour compatibilité PyInstaller
+def resource_path(relative_path):
+    """Retourne le chemin absolu vers une ressource, compatible PyInstaller."""
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path) # type: ignore
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+def fetch_available_update(timeout: float = 5) -> Optional[Tuple[str, str]]:
+    """Renvoie (version, url) si une autre version est publiée, None sinon ou hors ligne."""
+    try:
+        with urllib.request.urlopen(UPDATE_URL, timeout=timeout) as response:
+            info = json.loads(response.read().decode("utf-8"))
+        latest_version = info.get("version", "")
+        download_url = info.get("url", "")
+        if latest_version and latest_version != APP_VERSION:
+            return latest_version, download_url
+    except Exception as e:
+        print(f"[Update] Impossible de vérifier la mise à jour : {e}")
+    return None
@@ -0,0 +1,296 @@
+"""B2PC en ligne de commande (serveurs sans affichage): n'importe jamais PyQt6.
+
+    python -m b2pc chd /data/isos /data/chd --jobs 4 --delete-source
+    python -m b2pc chd ./isos ./chd --chd-backend native
+    python -m b2pc iso-to-rvz ./isos ./rvz --profile archive
+    python -m b2pc extract-chd ./in ./out --json --json-report rapport.json
+    python -m b2pc --list-operations
+    python -m b2pc --chd-info /data/chd --json
+
+Les handlers sont ceux de l'interface graphique (même registre handlers/factory.py).
+Codes de sortie: 0 succès, 1 erreur(s) de conversion, 2 paramètres ou outils invalides,
+130 interrompu (Ctrl+C).
+"""
+import argparse
+import json
+import multiprocessing
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from appinfo import APP_VERSION, resource_path
+from handlers.factory import OPERATION_IDS, OPERATIONS, create_operation_handler
+from handlers.profiles import ProfileError, load_profiles, select_profile
+from i18n import SOURCE_LANGUAGE, SUPPORTED_LANGUAGES, TranslationCatalog
+
+
+class ConsoleReporter:
+    """Sortie console thread-safe (les handlers appellent log/progress depuis plusieurs jobs)."""
+
+    def __init__(self, json_lines: bool = False, language: str = SOURCE_LANGUAGE, stream=None):
+        self.json_lines = json_lines
+        self.language = language
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+        self._last_progress = None
+        self._catalog = None
+        if language != SOURCE_LANGUAGE:
+            self._catalog = TranslationCatalog(resource_path("ressources/i18n"))
+
+    def _write(self, line: str):
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def _emit(self, event: str, **fields):
+        self._write(json.dumps({"event": event, **fields}, ensure_ascii=False))
+
+    def log(self, message):
+        message = str(message)
+        if self._catalog is not None:
+            message = self._catalog.translate_log(message, self.language)
+        if self.json_lines:
+            self._emit("log", message=message)
+        else:
+            self._write(message)
+
+    def progress(self, value, message):
+        try:
+            percent = int(value)
+        except (TypeError, ValueError):
+            return
+        progress = (percent, str(message))
+        # Une ligne par changement réel (les outils répètent souvent le même pourcentage)
+        if progress == self._last_progress:
+            return
+        self._last_progress = progress
+        if self.json_lines:
+            self._emit("progress", percent=percent, message=progress[1])
+        else:
+            self._write(f"[{percent:3d}%] {progress[1]}")
+
+    def result(self, report: dict):
+        if self.json_lines:
+            self._emit("result", **report)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="b2pc",
+        description=f"B2PC {APP_VERSION} - conversions de jeux sans interface graphique",
+    )
+    parser.add_argument("operation", nargs="?", choices=sorted(OPERATION_IDS), metavar="operation",
+                        help="Opération (voir --list-operations)")
+    parser.add_argument("source", nargs="?", help="Dossier source")
+    parser.add_argument("dest", nargs="?", help="Dossier destination")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Fichiers traités en parallèle (défaut: 1)")
+    parser.add_argument("--archive-lookahead", type=int, default=1,
+                        help="Archives extraites d'avance pendant les conversions (défaut: 1)")
+    parser.add_argument("--chd-backend", choices=("chdman", "native"), default="chdman",
+                        help="Création des CHD: chdman ou compresseur natif multi-cœur (défaut: chdman). "
+                             "L'extraction est native quand le CHD le permet; les CHD à hunks FLAC (CD avec pistes "
+                             "audio créés par chdman, codec cdfl) restent extraits par chdman, sans accélération")
+    parser.add_argument("--parent-chds", action="store_true",
+                        help="Révisions et variantes régionales d'un même disque en CHD enfants d'un parent")
+    parser.add_argument("--sector-check", choices=("off", "report", "exclude"), default="off",
+                        help="Contrôle des secteurs (sync, MSF, EDC/ECC) des CUE/GDI avant la création des CHD; "
+                             "exclude écarte les disques en erreur (défaut: off)")
+    parser.add_argument("--profile", metavar="NOM",
+                        help="Profil de compression: default, staging, archive ou profil utilisateur "
+                             "(voir --list-profiles; défaut: default)")
+    parser.add_argument("--profiles-file", metavar="FICHIER",
+                        help="Fichier JSON de profils utilisateur (défaut: B2PC/compression_profiles.json)")
+    parser.add_argument("--delete-source", action="store_true",
+                        help="Supprimer les fichiers source après une conversion réussie")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Ne relancer que les éléments en échec ou interrompus (journal de la destination)")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="Ne pas tenir le journal de reprise dans la destination")
+    parser.add_argument("--json", action="store_true",
+                        help="Progression et logs en JSON lines sur la sortie standard")
+    parser.add_argument("--json-report", metavar="FICHIER",
+                        help="Écrire un rapport JSON de fin d'opération")
+    parser.add_argument("--lang", choices=SUPPORTED_LANGUAGES, default=SOURCE_LANGUAGE,
+                        help="Langue des messages (défaut: fr)")
+    parser.add_argument("--list-operations", action="store_true",
+                        help="Lister les opérations disponibles")
+    parser.add_argument("--list-profiles", action="store_true",
+                        help="Lister les profils de compression et leurs réglages")
+    parser.add_argument("--chd-info", metavar="DOSSIER",
+                        help="Inventaire des CHD d'un dossier (type, tailles, compression), sans chdman")
+    parser.add_argument("--version", action="version", version=f"B2PC {APP_VERSION}")
+    return parser
+
+
+def write_report(path: str, report: dict):
+    report_path = Path(path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def chd_inventory(folder: str, json_lines: bool) -> int:
+    """Liste les CHD d'un dossier à partir de leurs en-têtes; code 1 si l'un est illisible."""
+    from handlers.chd import scan_chd_folder
+
+    unreadable = 0
+    for path, info, error in scan_chd_folder(folder):
+        if info is None:
+            unreadable += 1
+            if json_lines:
+                print(json.dumps({"event": "chd_info", "file": str(path), "error": error}, ensure_ascii=False))
+            else:
+                print(f"❌ {error}")
+            continue
+        if json_lines:
+            print(json.dumps({"event": "chd_info", **info.to_dict()}, ensure_ascii=False))
+        else:
+            ratio = f"{info.ratio * 100:.1f}%" if info.ratio is not None else "?"
+            codecs = ", ".join(info.compressor_names()) or "aucune"
+            print(f"{path.name}  v{info.version}  {info.kind}  {info.logical_size} o  {info.file_size} o  {ratio}  [{codecs}]")
+    return 1 if unreadable else 0
+
+
+def run_operation(args, reporter: ConsoleReporter) -> int:
+    operation = OPERATION_IDS[args.operation]
+    source = Path(args.source).resolve()
+    dest = Path(args.dest).resolve()
+    if not source.is_dir():
+        reporter.log(f"❌ Dossier source introuvable: {source}")
+        return 2
+    dest.mkdir(parents=True, exist_ok=True)
+
+    handler, method = create_operation_handler(
+        operation, resource_path("ressources"), reporter.log, reporter.progress
+    )
+    handler.source_folder = str(source)
+    handler.dest_folder = str(dest)
+    handler.delete_source_after_conversion = args.delete_source
+    handler.max_jobs = max(1, args.jobs)
+    handler.archive_lookahead = max(0, args.archive_lookahead)
+    handler.use_journal = not args.no_journal
+    handler.retry_failed_only = args.retry_failed
+    if hasattr(handler, "chd_backend"):
+        handler.chd_backend = args.chd_backend
+    if hasattr(handler, "parent_chds"):
+        handler.parent_chds = args.parent_chds
+    if hasattr(handler, "sector_check"):
+        handler.sector_check = args.sector_check
+    if handler.compression_family:
+        try:
+            handler.compression_profile = select_profile(
+                load_profiles(args.profiles_file), args.profile, handler.compression_family
+            )
+        except ProfileError as e:
+            reporter.log(f"❌ {e}")
+            return 2
+
+    # Premier Ctrl+C: arrêt propre des jobs en cours; second: interruption immédiate
+    def on_interrupt(signum, frame):
+        if handler.should_stop:
+            raise KeyboardInterrupt
+        handler.stop_conversion()
+
+    previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+    started = datetime.now()
+    start_time = time.monotonic()
+    results: Optional[dict] = None
+    error: Optional[str] = None
+    try:
+        reporter.log(f"🚀 Début de l'opération : {operation}")
+        reporter.log(f"📁 Dossier source: {source}")
+        reporter.log(f"📁 Dossier destination: {dest}")
+        if not handler.validate_tools():
+            error = "Outils requis manquants"
+        else:
+            results = getattr(handler, method)()
+    except KeyboardInterrupt:
+        error = "Interrompu"
+    except Exception as e:
+        error = str(e)
+        reporter.log(f"❌ Erreur critique : {e}")
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    results = results if isinstance(results, dict) else {}
+    if error and "error" not in results:
+        results["error"] = error
+    try:
+        error_count = int(results.get("error_count", 0) or 0)
+    except (TypeError, ValueError):
+        error_count = 0
+
+    reporter.log("=" * 50)
+    if results.get("error"):
+        reporter.log("❌ Opération terminée avec erreur")
+    elif error_count > 0:
+        reporter.log(f"⚠️ Opération terminée avec {error_count} erreur(s)")
+    else:
+        reporter.log("🎉 Opération terminée avec succès!")
+
+    report = {
+        "version": APP_VERSION,
+        "operation": args.operation,
+        "operation_label": operation,
+        "source": str(source),
+        "dest": str(dest),
+        "jobs": handler.max_jobs,
+        "delete_source": args.delete_source,
+        "retry_failed": args.retry_failed,
+        "started": started.isoformat(timespec="seconds"),
+        "duration_s": round(time.monotonic() - start_time, 3),
+        "results": results,
+    }
+    reporter.result(report)
+    if args.json_report:
+        write_report(args.json_report, report)
+
+    if error == "Interrompu" or results.get("stopped"):
+        return 130
+    if error == "Outils requis manquants":
+        return 2
+    return 1 if results.get("error") or error_count > 0 else 0
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.list_operations:
+        width = max(len(name) for name in OPERATION_IDS)
+        for name, operation in OPERATION_IDS.items():
+            print(f"{name:<{width}}  {operation}")
+        return 0
+    if args.list_profiles:
+        try:
+            profiles = load_profiles(args.profiles_file)
+        except ProfileError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        for profile in profiles.values():
+            if args.json:
+                print(json.dumps(profile.to_dict(), ensure_ascii=False))
+                continue
+            print(profile.name)
+            for target, settings in profile.to_dict().items():
+                if target != "name":
+                    values = json.dumps(settings) if settings else "(défaut de l'outil)"
+                    print(f"  {target:<9} {values}")
+        return 0
+    if args.chd_info:
+        return chd_inventory(args.chd_info, args.json)
+    if not (args.operation and args.source and args.dest):
+        parser.error("operation, source et dest sont requis")
+    if args.retry_failed and args.no_journal:
+        parser.error("--retry-failed nécessite le journal")
+    if OPERATION_IDS[args.operation] not in OPERATIONS:
+        parser.error(f"opération non disponible: {args.operation}")
+    return run_operation(args, ConsoleReporter(json_lines=args.json, language=args.lang))
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Création de CHD: compresseur natif de B2PC comparé à chdman (débit et taux de compression).
+
+Chaque CHD natif est relu entièrement (hunks décodés, SHA1 des données comparé à l'en-tête);
+--verify lance en plus `chdman verify` dessus.
+
+    python benchmarks/chd_compress.py jeu.iso
+    python benchmarks/chd_compress.py jeu.cue --jobs 8 --verify
+    python benchmarks/chd_compress.py jeu.iso --codecs lzma,zlib,zstd --chdman /usr/bin/chdman --json
+
+Sans chdman (ressources/chdman.exe, PATH ou --chdman), seul le compresseur natif est mesuré;
+--verify refuse alors de s'exécuter (code 2). Code de sortie 1 si une vérification échoue.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from handlers.chd import ChdReader, read_chd_info  # noqa: E402
+from handlers.chd_compress import ChdCompressor, read_cue_tracks  # noqa: E402
+
+
+def input_bytes(source: Path) -> int:
+    if source.suffix.lower() == ".cue":
+        return sum(path.stat().st_size for path in {track.file for track in read_cue_tracks(source)})
+    return source.stat().st_size
+
+
+def find_chdman(explicit: str) -> str:
+    if explicit:
+        return explicit
+    bundled = REPO_ROOT / "ressources" / "chdman.exe"
+    if bundled.exists() and os.name == "nt":
+        return str(bundled)
+    return shutil.which("chdman") or ""
+
+
+def native_verify(chd_path: Path) -> bool:
+    """SHA1 des données décodées comparé à celui de l'en-tête (comme chdman verify)."""
+    reader = ChdReader(chd_path)
+    digest = hashlib.sha1()
+    remaining = reader.info.logical_size
+    step = max(1, (4 * 1024 * 1024) // reader.info.hunk_bytes)
+    for start in range(0, len(reader.map), step):
+        data = reader.read_hunks(start, step)
+        digest.update(data[:remaining])
+        remaining -= min(len(data), remaining)
+    return digest.hexdigest() == reader.info.raw_sha1
+
+
+def run_native(source: Path, output: Path, jobs: int, codecs) -> float:
+    compressor = ChdCompressor()
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        start = time.perf_counter()
+        if source.suffix.lower() == ".cue":
+            compressor.compress_cue(source, output, pool, 2 * jobs, codecs)
+        else:
+            compressor.compress_iso(source, output, pool, 2 * jobs, codecs)
+        return time.perf_counter() - start
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def run_chdman(chdman: str, source: Path, output: Path, jobs: int, codecs) -> float:
+    command = "createcd" if source.suffix.lower() == ".cue" else "createdvd"
+    args = [chdman, command, "-i", str(source), "-o", str(output), "-f", "-np", str(jobs)]
+    if codecs:
+        args += ["-c", ",".join(codecs)]
+    start = time.perf_counter()
+    subprocess.run(args, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def chdman_verify(chdman: str, chd_path: Path) -> bool:
+    proc = subprocess.run([chdman, "verify", "-i", str(chd_path)], capture_output=True, text=True)
+    return proc.returncode == 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="ISO ou CUE/BIN à compresser")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Processus (défaut: tous les cœurs)")
+    parser.add_argument("--codecs", default="", help="Codecs imposés aux deux moteurs (ex: cdlz,cdzl)")
+    parser.add_argument("--chdman", default="", help="Chemin de chdman (défaut: ressources/ ou PATH)")
+    parser.add_argument("--verify", action="store_true", help="Lancer chdman verify sur le CHD natif")
+    parser.add_argument("--keep", metavar="DOSSIER", help="Garder les CHD produits dans ce dossier")
+    parser.add_argument("--json", action="store_true", help="Résultat en JSON")
+    args = parser.parse_args()
+
+    source = Path(args.source).resolve()
+    codecs = [c.strip() for c in args.codecs.split(",") if c.strip()] or None
+    jobs = max(1, args.jobs)
+    chdman = find_chdman(args.chdman)
+    if args.verify and not chdman:
+        print("❌ --verify nécessite chdman (--chdman CHEMIN)", file=sys.stderr)
+        return 2
+    size = input_bytes(source)
+    work = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="b2pc_chd_bench_"))
+    work.mkdir(parents=True, exist_ok=True)
+    results = {"source": str(source), "input_bytes": size, "jobs": jobs}
+    failed = False
+    try:
+        runs = [("native", lambda out: run_native(source, out, jobs, codecs))]
+        if chdman:
+            runs.append(("chdman", lambda out: run_chdman(chdman, source, out, jobs, codecs)))
+        for name, run in runs:
+            output = work / f"{source.stem}.{name}.chd"
+            seconds = run(output)
+            info = read_chd_info(output)
+            results[name] = {
+                "seconds": round(seconds, 3),
+                "mb_per_s": round(size / seconds / 1e6, 2),
+                "ratio": round(info.file_size / size, 4),
+                "chd_bytes": info.file_size,
+                "codecs": info.compressor_names(),
+            }
+        results["native"]["verified"] = native_verify(work / f"{source.stem}.native.chd")
+        failed = not results["native"]["verified"]
+        if args.verify and chdman:
+            results["native"]["chdman_verify"] = chdman_verify(chdman, work / f"{source.stem}.native.chd")
+            failed = failed or not results["native"]["chdman_verify"]
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{source.name}: {size / 1e6:.1f} Mo, {jobs} processus")
+        for name in ("native", "chdman"):
+            if name in results:
+                r = results[name]
+                print(f"  {name:<7} {r['seconds']:>8.2f} s  {r['mb_per_s']:>8.2f} Mo/s  "
+                      f"taux {r['ratio'] * 100:5.1f}%  [{', '.join(r['codecs'])}]")
+        if "chdman" not in results:
+            print("  chdman introuvable: comparaison non effectuée")
+        print(f"  vérification native: {'OK' if results['native']['verified'] else 'ÉCHEC'}")
+        if "chdman_verify" in results["native"]:
+            print(f"  chdman verify: {'OK' if results['native']['chdman_verify'] else 'ÉCHEC'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Budget de démarrage de B2PC: temps d'import de main.py et temps jusqu'au premier affichage.
+
+Chaque mesure est faite dans un processus neuf (caches d'import froids côté Python).
+
+    python benchmarks/startup.py              # 5 lancements, médiane comparée au budget
+    python benchmarks/startup.py --runs 10 --offscreen
+
+Code de sortie 1 si une médiane dépasse son budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Budgets (secondes)
+IMPORT_BUDGET_S = 1.0
+FIRST_PAINT_BUDGET_S = 2.5
+
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter() - t0
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+result = {"import_s": t_import}
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and "first_paint_s" not in result:
+            result["first_paint_s"] = time.perf_counter() - t0
+            QTimer.singleShot(0, app.quit)
+        return False
+
+window = main.B2PCMainWindow()
+paint_filter = FirstPaint()
+window.installEventFilter(paint_filter)
+window.show()
+window.start_update_check()
+QTimer.singleShot(10000, app.quit)
+app.exec()
+result["handler_modules_loaded"] = sorted(
+    name for name in sys.modules if name.startswith("handlers.") and name not in (
+        "handlers.base", "handlers.factory", "handlers.tool_cache", "handlers.tool_output"
+    )
+)
+print("B2PC_STARTUP " + json.dumps(result))
+"""
+
+
+def run_once(offscreen: bool) -> dict:
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=str(REPO_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("B2PC_STARTUP "):
+            return json.loads(line[len("B2PC_STARTUP "):])
+    raise RuntimeError(f"Mesure impossible (code {proc.returncode}):\n{proc.stderr}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--offscreen", action="store_true", help="QT_QPA_PLATFORM=offscreen (CI, machine sans écran)")
+    args = parser.parse_args()
+
+    samples = [run_once(args.offscreen) for _ in range(max(1, args.runs))]
+    import_s = statistics.median(s["import_s"] for s in samples)
+    paints = [s["first_paint_s"] for s in samples if "first_paint_s" in s]
+    first_paint_s = statistics.median(paints) if paints else float("inf")
+    eager = sorted({name for s in samples for name in s["handler_modules_loaded"]})
+
+    print(f"import main      : {import_s * 1000:7.1f} ms (budget {IMPORT_BUDGET_S * 1000:.0f} ms)")
+    print(f"premier affichage: {first_paint_s * 1000:7.1f} ms (budget {FIRST_PAINT_BUDGET_S * 1000:.0f} ms)")
+    if eager:
+        print(f"handlers chargés au démarrage: {', '.join(eager)}")
+
+    over_budget = import_s > IMPORT_BUDGET_S or first_paint_s > FIRST_PAINT_BUDGET_S
+    if over_budget:
+        print("❌ Budget de démarrage dépassé")
+        return 1
+    print("✅ Budget de démarrage respecté")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
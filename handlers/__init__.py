@@ -1,9 +1,24 @@
+from .factory import HANDLER_REGISTRY
 
-from .chdv5 import ChdV5Handler
-from .rvz import RvzHandler
-from .xbox_patch import XboxPatchHandler
-from .squashfs import SquashFSHandler
-from .extract_chd import ExtractChdHandler
-from .merge_bin_cue import MergeBinCueHandler
-from .ps3 import Ps3DecryptHandler
-from .wbfs_iso import WbfsIsoHandler
+# Classes exposées à la demande: importer le paquet ne charge aucun module de handler
+_HANDLER_CLASSES = {
+    "ChdV5Handler": "chd_v5",
+    "RvzHandler": "rvz",
+    "XboxPatchHandler": "xbox_patch",
+    "SquashFSHandler": "squashfs",
+    "ExtractChdHandler": "extract_chd",
+    "RecompressChdHandler": "recompress_chd",
+    "MergeBinCueHandler": "merge_bin_cue",
+    "SplitBinCueHandler": "split_bin_cue",
+    "Ps3DecryptHandler": "ps3_decrypt",
+    "WbfsIsoHandler": "wbfs_iso",
+}
+
+__all__ = list(_HANDLER_CLASSES)
+
+
+def __getattr__(name):
+    handler_type = _HANDLER_CLASSES.get(name)
+    if handler_type is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return HANDLER_REGISTRY[handler_type]()
@@ -2,13 +2,491 @@ import subprocess
 import os
 import shutil
 import re
+import posixpath
+import queue
 import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import List, Callable, Optional, Union
+from typing import Dict, List, Callable, Optional, Set, Tuple, Union
+from .profiles import BUILTIN_PROFILES, DEFAULT_PROFILE, CompressionProfile, CompressionSettings
+from .journal import STATE_DONE, STATE_FAILED, STATE_INTERRUPTED, STATE_RUNNING, JobJournal, remove_outputs, source_identity
+from .tool_cache import get_tool_cache
+from .tool_output import ToolOutputEvent, ToolOutputParser, iter_tool_events
+
+
+_NOT_WII_DISC = re.compile(r"not a wii disc", re.IGNORECASE)
+
+# Dossier (dans la destination) où les jobs écrivent avant le renommage final
+PARTIAL_DIR_NAME = ".b2pc_part"
+# Restes d'un lancement interrompu dans <destination>/TEMP
+_STALE_TEMP_PREFIXES = ("B2PC_extract_", "B2PC_wbfs_", "B2PC_ecm_")
+# Reste sans PID lisible: supprimé seulement s'il n'a pas bougé depuis ce délai (secondes)
+_STALE_LEFTOVER_AGE = 24 * 3600
+_JOB_DIR_PID = re.compile(r"^job_(\d+)_")
+
+
+def _process_alive(pid: int) -> bool:
+    """Vrai si le processus pid existe encore (dans le doute, on le considère vivant)."""
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.GetLastError() == 5  # ERROR_ACCESS_DENIED: le processus existe
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # PermissionError: processus d'un autre utilisateur
+    return True
+
+
+def _leftover_is_stale(path: Path) -> bool:
+    """Un reste de .b2pc_part ou de TEMP n'appartient plus à aucun lancement en cours.
+
+    Les dossiers job_<pid>_ d'un autre B2PC encore actif sur la même destination sont
+    conservés; sans PID, seul un reste inchangé depuis _STALE_LEFTOVER_AGE est supprimé.
+    """
+    match = _JOB_DIR_PID.match(path.name)
+    if match:
+        return not _process_alive(int(match.group(1)))
+    try:
+        return time.time() - path.stat().st_mtime > _STALE_LEFTOVER_AGE
+    except OSError:
+        return False
+
+
+def tool_thread_option(tool_name: str, threads: int) -> List[str]:
+    """Options d'un outil pour limiter le nombre de threads qu'il utilise."""
+    if tool_name == "chdman.exe":
+        return ["-np", str(threads)]
+    if tool_name == "gensquashfs.exe":
+        return ["--num-jobs", str(threads)]
+    if tool_name == "7za.exe":
+        return [f"-mmt={threads}"]
+    return []
+
+
+def tool_compression_option(tool_name: str, settings: CompressionSettings) -> List[str]:
+    """Options de compression d'un outil pour les réglages d'un profil (valeurs None omises)."""
+    args: List[str] = []
+    if tool_name == "chdman.exe":
+        if settings.codec:
+            args += ["-c", settings.codec]
+        if settings.block_size:
+            args += ["-hs", str(settings.block_size)]
+    elif tool_name == "dolphin-tool.exe":
+        if settings.codec:
+            args += ["-c", settings.codec]
+        if settings.level is not None and settings.codec != "none":
+            args += ["-l", str(settings.level)]
+        if settings.block_size:
+            args += ["-b", str(settings.block_size)]
+    elif tool_name == "gensquashfs.exe":
+        if settings.codec:
+            args += ["--compressor", settings.codec]
+        if settings.level is not None:
+            args += ["--comp-extra", f"level={settings.level}"]
+        if settings.block_size:
+            args += ["--block-size", str(settings.block_size)]
+    return args
+
+
+def parse_7z_listing(output: str) -> List[str]:
+    """Chemins des fichiers (hors dossiers) d'une sortie `7za l -slt`."""
+    members: List[str] = []
+    started = False
+    path: Optional[str] = None
+    is_dir = False
+    for raw in output.splitlines() + [""]:
+        line = raw.rstrip("\r")
+        if not started:
+            # Les blocs avant le séparateur décrivent l'archive elle-même
+            started = line.startswith("----------")
+            continue
+        if not line.strip():
+            if path and not is_dir:
+                members.append(path)
+            path, is_dir = None, False
+            continue
+        key, sep, value = line.partition(" = ")
+        if not sep:
+            continue
+        if key == "Path":
+            path = value
+        elif key == "Folder":
+            is_dir = is_dir or value.strip() == "+"
+        elif key == "Attributes":
+            flags = value.split(" ")[0]
+            is_dir = is_dir or (flags.isalpha() and "D" in flags)
+    return members
+
+
+def format_duration(seconds: float) -> str:
+    """Durée lisible pour une estimation: '1 h 05 min', '12 min', '40 s'."""
+    seconds = max(0, int(round(seconds)))
+    hours, minutes = seconds // 3600, seconds % 3600 // 60
+    if hours:
+        return f"{hours} h {minutes:02d} min"
+    if minutes:
+        return f"{minutes} min"
+    return f"{seconds} s"
+
+
+def _archive_member_key(member: str) -> str:
+    """Clé de comparaison d'un chemin d'archive (séparateurs, casse, '..')."""
+    return posixpath.normpath(member.replace("\\", "/")).lower()
+
+
+class DescriptorError(ValueError):
+    """CUE ou GDI inutilisable: ligne invalide, piste incohérente ou fichier introuvable."""
+
+
+class DescriptorFile:
+    """Un fichier désigné par le descripteur (commande FILE d'un CUE, fichier d'une piste GDI)."""
+    __slots__ = ("name", "type", "line", "path")
+
+    def __init__(self, name: str, file_type: str, line: int):
+        self.name = name                # Chemin du fichier, relatif au descripteur
+        self.type = file_type           # Type CUE: 'BINARY', 'MOTOROLA', 'WAVE'...
+        self.line = line                # Indice de la ligne dans DescriptorSheet.lines
+        self.path: Optional[Path] = None  # Fichier trouvé sur disque (read_descriptor)
+
+
+class DescriptorIndex:
+    """Un INDEX de CUE: position en trames dans le fichier (FILE) où il apparaît."""
+    __slots__ = ("number", "frames", "file", "line")
+
+    def __init__(self, number: int, frames: int, file: DescriptorFile, line: int):
+        self.number = number
+        self.frames = frames
+        # Souvent le fichier de la piste; le précédent pour un pregap en fin de fichier (façon EAC)
+        self.file = file
+        self.line = line
+
+
+class DescriptorTrack:
+    """Une piste d'un CUE ou d'un GDI: fichier, type, INDEX et gaps non stockés (PREGAP/POSTGAP)."""
+    __slots__ = ("number", "file", "mode", "sector_size", "line", "indexes", "pregap", "postgap")
+
+    def __init__(self, number: int, file: DescriptorFile, mode: str, sector_size: int, line: int):
+        self.number = number
+        self.file = file                # FILE courant à la ligne TRACK
+        self.mode = mode                # Type CUE: 'AUDIO', 'MODE1/2352', 'MODE2/2352'...
+        self.sector_size = sector_size
+        self.line = line
+        self.indexes: List[DescriptorIndex] = []
+        self.pregap = 0                 # Trames de PREGAP / POSTGAP
+        self.postgap = 0
+
+    @property
+    def name(self) -> str:
+        return self.file.name
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self.file.path
+
+    @property
+    def start(self) -> Optional[int]:
+        """Premier INDEX, en secteurs depuis le début de son fichier."""
+        return self.indexes[0].frames if self.indexes else None
+
+    @property
+    def is_data(self) -> bool:
+        return self.mode != "AUDIO"
+
+
+# Types de piste CUE acceptés par chdman
+_CUE_TRACK_MODES = {
+    "AUDIO", "CDG", "MODE1/2048", "MODE1/2352", "MODE2/2048", "MODE2/2324",
+    "MODE2/2336", "MODE2/2352", "CDI/2336", "CDI/2352",
+}
+_GDI_SECTOR_SIZES = {2048, 2336, 2352}
+
+
+def _track_sector_size(mode: str) -> int:
+    if mode == "CDG":
+        return 2448
+    size = mode.rpartition("/")[2]
+    return int(size) if size.isdigit() else 2352
+
+
+def cue_frames(value: str) -> Optional[int]:
+    """Position 'mm:ss:ff' d'un INDEX, PREGAP ou POSTGAP en trames, None si invalide."""
+    parts = value.split(":")
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        return None
+    minutes, seconds, frames = (int(part) for part in parts)
+    if seconds >= 60 or frames >= 75:
+        return None
+    return (minutes * 60 + seconds) * 75 + frames
+
+
+def read_descriptor_text(descriptor_path: Path) -> Tuple[str, str]:
+    """Texte d'un CUE/GDI et son encodage (les titres des vieilles fiches sont souvent en latin-1)."""
+    data = Path(descriptor_path).read_bytes()
+    try:
+        return data.decode("utf-8-sig"), "utf-8"
+    except UnicodeDecodeError:
+        return data.decode("latin-1"), "latin-1"
+
+
+class DescriptorSheet:
+    """Un CUE ou un GDI lu avec ses pistes et les fichiers qu'elles désignent sur disque.
+
+    Les lignes d'origine (lines) et l'indice des lignes de chaque commande CUE (commands)
+    permettent de réécrire la fiche en ne changeant que les FILE et les INDEX.
+    """
+    __slots__ = ("path", "lines", "encoding", "file_entries", "tracks", "commands", "files", "size")
+
+    def __init__(self, path: Path, lines: List[str], encoding: str):
+        self.path = path
+        self.lines = lines
+        self.encoding = encoding
+        self.file_entries: List[DescriptorFile] = []
+        self.tracks: List[DescriptorTrack] = []
+        self.commands: Dict[str, List[int]] = {}  # Mot-clé CUE -> indices de ses lignes
+        self.files: List[Path] = []  # Fichiers trouvés, sans doublon (read_descriptor)
+        self.size = 0  # Octets lus par une conversion: le descripteur et tous ses fichiers de pistes
+
+    @property
+    def missing(self) -> List[str]:
+        return list(dict.fromkeys(entry.name for entry in self.file_entries if entry.path is None))
+
+
+def _parse_gdi(sheet: DescriptorSheet, strict: bool):
+    # numéro, LBA, type (0 audio, 4 données), taille de secteur, fichier, offset
+    lines = sheet.lines
+    body = [(index, line) for index, line in enumerate(lines[1:], 1) if line.strip()]
+    for index, line in body:
+        tokens = re.findall(r'"[^"]*"|\S+', line)
+        valid = (
+            len(tokens) >= 5 and tokens[0].isdigit() and tokens[1].isdigit()
+            and tokens[2] in ("0", "4") and tokens[3].isdigit()
+        )
+        if not valid or (strict and int(tokens[3]) not in _GDI_SECTOR_SIZES):
+            if strict:
+                raise DescriptorError(f"ligne {index + 1} invalide: {line.strip()}")
+            continue
+        size = int(tokens[3])
+        mode = "AUDIO" if tokens[2] == "0" else f"MODE1/{size}"
+        entry = DescriptorFile(tokens[4].strip('"'), "BINARY", index)
+        track = DescriptorTrack(int(tokens[0]), entry, mode, size, index)
+        track.indexes.append(DescriptorIndex(1, 0, entry, index))  # Piste au début de son fichier
+        sheet.file_entries.append(entry)
+        sheet.tracks.append(track)
+    if strict:
+        declared = lines[0].strip() if lines else ""
+        if not declared.isdigit() or int(declared) != len(sheet.tracks):
+            raise DescriptorError(f"nombre de pistes annoncé ({declared or '?'}) différent de {len(sheet.tracks)}")
+
+
+def _parse_cue(sheet: DescriptorSheet, strict: bool):
+    tracks = sheet.tracks
+    current: Optional[DescriptorFile] = None
+    for index, line in enumerate(sheet.lines):
+        parts = line.split()
+        keyword = parts[0].upper() if parts else ""
+        if keyword:
+            sheet.commands.setdefault(keyword, []).append(index)
+        number = index + 1
+        if keyword == "FILE":
+            match = re.match(r'\s*FILE\s+(?:"([^"]+)"|(\S+))(?:\s+(\S+))?', line, re.IGNORECASE)
+            if not match:
+                if strict:
+                    raise DescriptorError(f"ligne {number}: FILE sans nom de fichier")
+                continue
+            current = DescriptorFile(match.group(1) or match.group(2), (match.group(3) or "").upper(), index)
+            sheet.file_entries.append(current)
+        elif keyword == "TRACK":
+            mode = parts[2].upper() if len(parts) == 3 else ""
+            if len(parts) != 3 or not parts[1].isdigit() or current is None or \
+                    (strict and mode not in _CUE_TRACK_MODES):
+                if strict:
+                    reason = "TRACK avant FILE" if current is None else f"TRACK invalide: {line.strip()}"
+                    raise DescriptorError(f"ligne {number}: {reason}")
+                continue
+            tracks.append(DescriptorTrack(int(parts[1]), current, mode, _track_sector_size(mode), index))
+        elif keyword == "INDEX":
+            frames = cue_frames(parts[2]) if len(parts) == 3 and parts[1].isdigit() else None
+            if frames is None or not tracks:
+                if strict:
+                    raise DescriptorError(f"ligne {number}: INDEX invalide: {line.strip()}")
+                continue
+            tracks[-1].indexes.append(DescriptorIndex(int(parts[1]), frames, current, index))
+        elif keyword in ("PREGAP", "POSTGAP"):
+            frames = cue_frames(parts[1]) if len(parts) == 2 else None
+            if frames is None or not tracks:
+                if strict:
+                    raise DescriptorError(f"ligne {number}: {keyword} invalide: {line.strip()}")
+                continue
+            if keyword == "PREGAP":
+                tracks[-1].pregap = frames
+            else:
+                tracks[-1].postgap = frames
+    if strict:
+        for track in tracks:
+            if not track.indexes:
+                raise DescriptorError(f"piste {track.number} sans INDEX")
+
+
+def parse_descriptor(descriptor_path: Path, strict: bool = False) -> DescriptorSheet:
+    """Fiche CUE ou GDI lue sans chercher ses fichiers, pistes dans l'ordre du descripteur.
+
+    Par défaut les lignes illisibles sont ignorées; avec strict, la première ligne invalide
+    (ou une fiche sans piste) lève DescriptorError.
+    """
+    descriptor_path = Path(descriptor_path)
+    text, encoding = read_descriptor_text(descriptor_path)
+    sheet = DescriptorSheet(descriptor_path, text.splitlines(), encoding)
+    if descriptor_path.suffix.lower() == ".gdi":
+        _parse_gdi(sheet, strict)
+    else:
+        _parse_cue(sheet, strict)
+    if strict and not sheet.tracks:
+        raise DescriptorError("aucune piste")
+    return sheet
+
+
+def parse_descriptor_tracks(descriptor_path: Path, strict: bool = False) -> List[DescriptorTrack]:
+    """Pistes d'un CUE ou d'un GDI, dans l'ordre du descripteur (voir parse_descriptor)."""
+    return parse_descriptor(descriptor_path, strict).tracks
+
+
+def resolve_track_file(folder: Path, name: str) -> Optional[Path]:
+    """Fichier d'une piste: nom exact, sinon sans tenir compte de la casse, sinon sa version .ecm."""
+    candidate = Path(folder) / name.replace("\\", "/")
+    for wanted in (candidate, candidate.with_name(f"{candidate.name}.ecm")):
+        if wanted.is_file():
+            return wanted
+        try:
+            lowered = wanted.name.lower()
+            for entry in wanted.parent.iterdir():
+                if entry.name.lower() == lowered and entry.is_file():
+                    return entry
+        except OSError:
+            continue
+    return None
+
+
+def read_descriptor(descriptor_path: Path, strict: bool = True) -> DescriptorSheet:
+    """Lit un CUE/GDI et retrouve ses fichiers de pistes.
+
+    Point d'entrée commun de la création de CHD, de la fusion, du découpage et du contrôle
+    des secteurs. Avec strict, lève DescriptorError pour une ligne invalide, un fichier
+    introuvable ou une piste qui commence au-delà de la fin de son fichier; sinon ces
+    défauts sont tolérés.
+    """
+    sheet = parse_descriptor(descriptor_path, strict)
+    for entry in sheet.file_entries:
+        entry.path = resolve_track_file(sheet.path.parent, entry.name)
+    sheet.files = list(dict.fromkeys(entry.path for entry in sheet.file_entries if entry.path))
+    sheet.size = sheet.path.stat().st_size + sum(file.stat().st_size for file in sheet.files)
+    if strict:
+        if sheet.missing:
+            raise DescriptorError(f"fichier introuvable: {', '.join(sheet.missing)}")
+        for track in sheet.tracks:
+            path = track.indexes[0].file.path
+            if not track.start or path.suffix.lower() == ".ecm":
+                continue
+            if track.start * track.sector_size >= path.stat().st_size:
+                raise DescriptorError(f"piste {track.number} au-delà de la fin de {path.name}")
+    return sheet
+
+
+class _BatchUnit:
+    """Une source du lot (fichier direct ou archive extraite) et ses fichiers à convertir."""
+    def __init__(self, index: int, source: Path, extract_type: Optional[str]):
+        self.index = index
+        self.source = source
+        self.extract_type = extract_type
+        self.folder: Optional[Path] = None  # Dossier d'extraction (archives uniquement)
+        self.inputs: List[Path] = []
+        self.size = 0  # Octets de la source (job_size), pour la progression du lot
+        self.remaining = 0
+        self.failed = False
+        self.holds_slot = False
+        self.identity: Optional[Tuple[str, int, int]] = None  # Identité de la source dans le journal
+        self.errors = 0
+        self.interrupted = False
+        self.skipped = False  # Déjà traitée d'après le journal
+
+
+class _OutputStaging:
+    """Sorties d'un job écrites dans un dossier de travail sur le même disque que la destination.
+
+    commit() les renomme (os.replace) vers la destination: une sortie présente dans la
+    destination est donc toujours complète. Le dossier de travail est supprimé à la sortie
+    du bloc with, qu'il y ait eu commit ou non.
+    """
+    def __init__(self, dest_path: Path):
+        self.dest_path = dest_path
+        self.path: Optional[Path] = None
+
+    def __enter__(self) -> "_OutputStaging":
+        root = self.dest_path / PARTIAL_DIR_NAME
+        while True:
+            root.mkdir(parents=True, exist_ok=True)
+            try:
+                self.path = Path(tempfile.mkdtemp(prefix=f"job_{os.getpid()}_", dir=str(root)))
+                return self
+            except FileNotFoundError:
+                continue  # .b2pc_part retiré entre-temps par la fin d'un autre job
+
+    def commit(self, names: Optional[List[str]] = None) -> List[Path]:
+        """Déplace les sorties (toutes, ou seulement names) vers la destination."""
+        if names is None:
+            entries = list(self.path.iterdir())
+        else:
+            entries = [self.path / name for name in names if (self.path / name).exists()]
+        # Descripteurs en dernier: un CUE/GDI n'apparaît qu'une fois ses pistes en place
+        entries.sort(key=lambda p: p.suffix.lower() in (".cue", ".gdi"))
+        committed = []
+        for entry in entries:
+            target = self.dest_path / entry.name
+            if entry.is_dir() and target.exists():
+                shutil.rmtree(target)
+            os.replace(entry, target)
+            committed.append(target)
+        return committed
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            try:
+                self.path.parent.rmdir()  # Retirer .b2pc_part s'il est vide
+            except OSError:
+                pass
+        return False
+
+
+class _BatchJob:
+    """Un fichier soumis à la conversion, tel qu'il sera inscrit au journal."""
+    def __init__(self, member: str, skipped: bool = False):
+        self.member = member  # Chemin dans l'archive ('' pour un fichier direct)
+        self.skipped = skipped
+        self.commands: List[list] = []  # Commandes lancées par run_tool pour ce fichier
+        self.settled = False  # Ignoré par le handler mais à retenir comme terminé (settle_job)
 
 
 class ConversionHandler:
     """Classe de base pour tous les handlers de conversion"""
+    # Famille de profils de compression du handler ("chd", "rvz", "squashfs"), None si sans objet
+    compression_family: Optional[str] = None
+
     def __init__(self, tools_path: Optional[str] = None, log_callback: Optional[Callable] = None, progress_callback: Optional[Callable] = None):
         # Toujours utiliser 'ressources' comme racine par défaut
         self.tools_path = Path(tools_path) if tools_path else Path("ressources")
@@ -18,37 +496,108 @@ class ConversionHandler:
         self.dest_folder = ""
         self.temp_extract_folder = None
         self.should_stop = False  # Flag pour arrêter la conversion
-        self.current_process = None  # Référence au processus en cours
         self.delete_source_after_conversion = False
+        # Parallélisme: nombre de fichiers traités simultanément et budget total de threads CPU
+        self.max_jobs = 1
+        self.thread_budget = os.cpu_count() or 1
+        self.archive_lookahead = 1  # Archives extraites d'avance pendant les conversions
+        self.archive_member_depth = 0  # Sous-dossiers d'archive explorés (0 = niveau racine)
+        self.compression_profile: CompressionProfile = BUILTIN_PROFILES[DEFAULT_PROFILE]
+        self._process_lock = threading.Lock()
+        self._running_processes = set()  # Processus outils en cours (un par job actif)
+        # Journal des éléments traités (dans la destination): reprise après arrêt, relance des échecs
+        self.use_journal = True
+        self.retry_failed_only = False
+        self.journal: Optional[JobJournal] = None
+        self._job_context = threading.local()
+        # Pool de processus des traitements natifs (décodage/encodage CHD), partagé par les jobs
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
     def validate_tools(self) -> bool:
-        """Valide que tous les outils requis sont présents (compatibilité PyInstaller)"""
-        from main import resource_path
+        """Valide que tous les outils requis sont présents (compatibilité PyInstaller).
+
+        Les outils sont préparés dans le cache partagé avec run_tool: un outil déjà préparé
+        dans ce processus n'est pas revérifié.
+        """
         required_tools = [
             "7za.exe", "chdman.exe", "dolphin-tool.exe",
             "xiso.exe", "gensquashfs.exe", "unsquashfs.exe"
         ]
         for tool in required_tools:
-            tool_path = resource_path(f"ressources/{tool}")
-            if not os.path.exists(tool_path):
+            if get_tool_cache().is_staged(tool):
+                continue
+            if not self._prepare_tool(tool, quiet_missing=True):
                 self.log(f"❌ Outil manquant : {tool}")
                 return False
         self.log("✅ Tous les outils sont présents")
         return True
     def stop_conversion(self):
-        """Arrête la conversion en cours"""
+        """Arrête la conversion en cours (tous les processus des jobs actifs)"""
         self.should_stop = True
         self.log("🛑 Arrêt de la conversion demandé...")
-        if self.current_process and self.current_process.poll() is None:
+        with self._process_lock:
+            processes = list(self._running_processes)
+        for process in processes:
+            if process.poll() is not None:
+                continue
             try:
-                self.current_process.terminate()
+                process.terminate()
                 self.log("🛑 Processus terminé")
             except Exception as e:
                 self.log(f"⚠️ Erreur lors de l'arrêt du processus: {str(e)}")
                 try:
-                    self.current_process.kill()
+                    process.kill()
                     self.log("🛑 Processus forcé à s'arrêter")
                 except Exception as e2:
                     self.log(f"❌ Impossible d'arrêter le processus: {str(e2)}")
+    def _register_process(self, process: subprocess.Popen):
+        with self._process_lock:
+            self._running_processes.add(process)
+    def _release_process(self, process: Optional[subprocess.Popen]):
+        if process is None:
+            return
+        with self._process_lock:
+            self._running_processes.discard(process)
+    def threads_per_job(self) -> int:
+        """Threads accordés à chaque outil pour que l'ensemble des jobs tienne dans thread_budget."""
+        return max(1, int(self.thread_budget) // max(1, int(self.max_jobs)))
+    def tool_thread_args(self, tool_name: str) -> List[str]:
+        return tool_thread_option(tool_name, self.threads_per_job())
+    def tool_compression_args(self, tool_name: str, target: str) -> List[str]:
+        """Options de compression et de threads d'un outil selon le profil (cible 'rvz', 'chd_cd'...).
+
+        Les threads fixés par le profil remplacent la part du budget (threads_per_job).
+        """
+        settings = self.compression_profile.settings(target)
+        return tool_compression_option(tool_name, settings) + tool_thread_option(
+            tool_name, settings.threads or self.threads_per_job()
+        )
+    def compression_report(self) -> dict:
+        """Profil de compression du lancement, tel qu'inscrit dans les résultats."""
+        return self.compression_profile.to_dict(self.compression_family)
+    def log_compression_profile(self):
+        details = "; ".join(
+            f"{target}: {', '.join(f'{k}={v}' for k, v in values.items()) or 'défaut'}"
+            for target, values in self.compression_report().items() if target != "name"
+        )
+        self.log(f"🗜️ Profil de compression : {self.compression_profile.name} ({details})")
+    def get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Pool de processus partagé par les jobs, dimensionné sur thread_budget (créé au premier besoin).
+
+        None si le budget ne permet pas plus d'un processus: le travail se fait alors sur place.
+        """
+        workers = max(1, int(self.thread_budget))
+        if workers < 2:
+            return None
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=workers)
+            return self._process_pool
+    def shutdown_process_pool(self):
+        with self._process_pool_lock:
+            pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
     def check_should_stop(self) -> bool:
         """Vérifie si la conversion doit être arrêtée"""
         if self.should_stop:
@@ -70,66 +619,54 @@ class ConversionHandler:
         Pour certains outils (gensquashfs/unsquashfs) on exécute directement dans le dossier
         ressources pour conserver les DLL adjacentes.
         """
-        import sys, shutil, tempfile
+        import sys
         if self.check_should_stop():
             return False
-        from main import resource_path
-        src_tool_path = resource_path(f"ressources/{tool_name}")
-        if not os.path.exists(src_tool_path):
-            self.log(f"❌ Outil introuvable: {tool_name}")
+        temp_tool_path = self._prepare_tool(tool_name)
+        if not temp_tool_path:
             return False
-        special_tools = {"gensquashfs.exe", "unsquashfs.exe"}
-        if tool_name in special_tools:
-            temp_tool_path = src_tool_path
-        else:
-            temp_dir = tempfile.gettempdir()
-            temp_tool_path = os.path.join(temp_dir, tool_name)
-            try:
-                shutil.copy2(src_tool_path, temp_tool_path)
-            except Exception as e:
-                self.log(f"❌ Impossible de préparer {tool_name}: {e}")
-                return False
         cmd = [temp_tool_path] + args
         self.log(f"🔧 Exécution : {' '.join(cmd)}")
+        job_commands = getattr(self._job_context, "commands", None)
+        if job_commands is not None:
+            job_commands.append([tool_name, *args])
         flags = 0
         if sys.platform == "win32":
             flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
         saw_not_wii_disc = False
+        # En parallèle, les pourcentages de plusieurs outils s'entremêleraient: progression par fichier uniquement
+        report_progress = self.max_jobs <= 1
+        process = None
         try:
             if show_output:
-                self.current_process = subprocess.Popen(
+                # Sortie binaire lue par blocs: les progressions redessinées avec \r arrivent sans délai
+                process = subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
                     cwd=cwd,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
                     creationflags=flags
                 )
-                if self.current_process.stdout:
-                    while True:
+                self._register_process(process)
+                parser = ToolOutputParser(tool_name)
+                last_percent = None
+                if process.stdout:
+                    for event in iter_tool_events(process.stdout, parser):
                         if self.check_should_stop():
-                            self.current_process.terminate()
+                            process.terminate()
                             return False
-                        line = self.current_process.stdout.readline()
-                        if line:
-                            line = line.strip()
-                            if line:
-                                line_lower = line.lower()
-                                if "not a wii disc" in line_lower:
-                                    saw_not_wii_disc = True
-
-                                progress_value = self._extract_progress(line, tool_name)
-                                if progress_value is not None:
-                                    self.progress(progress_value, f"{tool_name}: {progress_value:.1f}%")
-                                elif self._is_important_message(line, tool_name) or saw_not_wii_disc:
-                                    self.log(f"   {line}")
-                        elif self.current_process.poll() is not None:
-                            break
-                self.current_process.wait()
+                        if event.kind == ToolOutputEvent.PROGRESS:
+                            if report_progress and event.percent != last_percent:
+                                last_percent = event.percent
+                                self.progress(event.percent, f"{tool_name}: {event.percent:.1f}%")
+                            continue
+                        if not saw_not_wii_disc and _NOT_WII_DISC.search(event.text):
+                            saw_not_wii_disc = True
+                        if event.important or saw_not_wii_disc:
+                            self.log(f"   {event.text}")
+                process.wait()
             else:
-                self.current_process = subprocess.Popen(
+                process = subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
@@ -137,10 +674,11 @@ class ConversionHandler:
                     text=True,
                     creationflags=flags
                 )
-                stdout, stderr = self.current_process.communicate()
+                self._register_process(process)
+                stdout, stderr = process.communicate()
             if self.check_should_stop():
                 return False
-            if self.current_process.returncode == 0:
+            if process.returncode == 0:
                 return True
             else:
                 if not show_output:
@@ -148,69 +686,57 @@ class ConversionHandler:
                 else:
                     if tool_name == "wbfs_file.exe" and saw_not_wii_disc:
                         self.log("⚠️ Fichier ignore: ce n'est pas un ISO Wii (GameCube ou format non supporte)")
-                    self.log(f"❌ {tool_name} terminé avec erreur (code: {self.current_process.returncode})")
+                    self.log(f"❌ {tool_name} terminé avec erreur (code: {process.returncode})")
                 return False
         except Exception as e:
             self.log(f"❌ Exception lors de l'exécution de {tool_name}: {str(e)}")
             return False
         finally:
-            self.current_process = None
-    def _extract_progress(self, line: str, tool_name: str) -> Optional[float]:
-        import re
-        patterns = {
-            "chdman.exe": [
-                r"(\d+(?:\.\d+)?)%\s+complete",
-                r"Compression:\s*(\d+(?:\.\d+)?)%",
-                r"(\d+(?:\.\d+)?)%",
-            ],
-            "dolphin-tool.exe": [
-                r"(\d+(?:\.\d+)?)%",
-            ],
-            "7za.exe": [
-                r"(\d+(?:\.\d+)?)%",
-            ]
-        }
-        if tool_name in patterns:
-            for pattern in patterns[tool_name]:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    try:
-                        return float(match.group(1))
-                    except (ValueError, IndexError):
-                        continue
+            self._release_process(process)
+    def _prepare_tool(self, tool_name: str, quiet_missing: bool = False) -> Optional[str]:
+        """Chemin exécutable d'un outil, via le cache persistant des outils (voir tool_cache).
+
+        Pour certains outils (gensquashfs/unsquashfs) on exécute directement dans le dossier
+        ressources pour conserver les DLL adjacentes.
+        """
+        from appinfo import resource_path
+        try:
+            return str(get_tool_cache().stage(Path(resource_path(f"ressources/{tool_name}"))))
+        except FileNotFoundError:
+            if not quiet_missing:
+                self.log(f"❌ Outil introuvable: {tool_name}")
+        except Exception as e:
+            self.log(f"❌ Impossible de préparer {tool_name}: {e}")
         return None
-    def _is_important_message(self, line: str, tool_name: str) -> bool:
-        important_keywords = [
-            "complete", "completed", "finished", "done", "success",
-            "error", "failed", "warning", "exception",
-            "final ratio", "compression ratio", "total time",
-            "created", "extracted", "converted"
-        ]
-        tool_keywords = {
-            "chdman.exe": [
-                "compression complete", "final ratio", "created"
-            ],
-            "dolphin-tool.exe": [
-                "successfully converted", "conversion complete"
-            ],
-            "7za.exe": [
-                "everything is ok", "files", "folders"
-            ],
-            "wbfs_file.exe": [
-                "not a wii disc", "writing:", "done in"
-            ]
-        }
-        line_lower = line.lower()
-        if re.match(r"^\s*\d+%\s*$", line):
-            return False
-        for keyword in important_keywords:
-            if keyword in line_lower:
-                return True
-        if tool_name in tool_keywords:
-            for keyword in tool_keywords[tool_name]:
-                if keyword in line_lower:
-                    return True
-        return False
+    def capture_tool_output(self, tool_name: str, args: List[str]) -> Optional[str]:
+        """Exécute un outil et renvoie sa sortie standard (None en cas d'échec)."""
+        import sys
+        if self.check_should_stop():
+            return None
+        tool_path = self._prepare_tool(tool_name)
+        if not tool_path:
+            return None
+        flags = getattr(subprocess, "CREATE_NO_WINDOW", 0) if sys.platform == "win32" else 0
+        process = None
+        try:
+            process = subprocess.Popen(
+                [tool_path] + args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                creationflags=flags
+            )
+            self._register_process(process)
+            stdout, stderr = process.communicate()
+            if process.returncode != 0:
+                message = stderr.decode("utf-8", errors="replace").strip()
+                self.log(f"⚠️ {tool_name} terminé avec erreur (code: {process.returncode}) {message}")
+                return None
+            return stdout.decode("utf-8", errors="replace")
+        except Exception as e:
+            self.log(f"❌ Exception lors de l'exécution de {tool_name}: {str(e)}")
+            return None
+        finally:
+            self._release_process(process)
     def detect_archives(self, folder_path: Path) -> List[Path]:
         """Détecte seulement les archives situées au NIVEAU RACINE du dossier source (non récursif)."""
         archive_extensions = [".zip", ".rar", ".7z"]
@@ -220,21 +746,168 @@ class ConversionHandler:
             for archive in archives:
                 self.log(f"   📁 {archive.name}")
         return archives
+    def archive_member_extensions(self) -> Optional[Set[str]]:
+        """Extensions que le handler sait traiter dans une archive.
+
+        None (défaut) extrait l'archive entière; sinon seuls les fichiers concernés
+        (jusqu'à archive_member_depth sous-dossiers) et les pistes qu'un CUE/GDI retenu
+        référence sont extraits.
+        """
+        return None
+    def staged_outputs(self, dest_path: Optional[Path] = None) -> _OutputStaging:
+        """Dossier de travail d'un job (with ... as staging): écrire dans staging.path puis commit()."""
+        return _OutputStaging(Path(dest_path or self.dest_folder))
+    def cleanup_partial_outputs(self, dest_path: Optional[Path] = None):
+        """Supprime au démarrage les sorties partielles et dossiers temporaires d'un lancement interrompu.
+
+        Ceux d'un autre B2PC encore en cours sur la même destination sont laissés en place.
+        """
+        dest_path = Path(dest_path or self.dest_folder)
+        own_prefix = f"job_{os.getpid()}_"
+        leftovers: List[Path] = []
+        partial_root = dest_path / PARTIAL_DIR_NAME
+        if partial_root.is_dir():
+            leftovers += [p for p in partial_root.iterdir() if not p.name.startswith(own_prefix)]
+        temp_root = dest_path / "TEMP"
+        if temp_root.is_dir():
+            active = self.temp_extract_folder.resolve() if self.temp_extract_folder else None
+            leftovers += [
+                p for p in temp_root.iterdir()
+                if p.is_dir() and p.name.startswith(_STALE_TEMP_PREFIXES) and p.resolve() != active
+            ]
+        for leftover in leftovers:
+            if not _leftover_is_stale(leftover):
+                continue
+            try:
+                if leftover.is_dir():
+                    shutil.rmtree(leftover)
+                else:
+                    leftover.unlink()
+                self.log(f"🧹 Sortie partielle d'un lancement interrompu supprimée: {leftover.name}")
+            except OSError as e:
+                self.log(f"⚠️ Impossible de supprimer {leftover.name}: {e}")
+        for folder in (partial_root, temp_root):
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+    def job_outputs(self, input_file: Path) -> List[Path]:
+        """Sorties qu'une conversion de input_file produit dans la destination.
+
+        Le journal s'en sert pour mesurer un élément terminé et pour supprimer les sorties
+        tronquées d'un élément interrompu avant de le refaire. Liste vide par défaut.
+        """
+        return []
+    def job_size(self, source_path: Path) -> int:
+        """Octets qu'une source fait lire: le fichier, ou un CUE/GDI et toutes ses pistes (0 si inconnu).
+
+        run_batch pondère la progression et l'estimation du temps restant par ces tailles, et
+        lance les plus grosses sources en premier quand plusieurs conversions tournent en parallèle.
+        """
+        try:
+            if source_path.suffix.lower() in (".cue", ".gdi"):
+                return read_descriptor(source_path, strict=False).size
+            return source_path.stat().st_size
+        except (OSError, DescriptorError):
+            return 0
+    def job_group(self, source_path: Path) -> Optional[str]:
+        """Groupe d'une source (ex. disques d'un même jeu): run_batch lance ses membres ensemble.
+
+        None par défaut: source indépendante.
+        """
+        return None
+    def source_finished(self, source_path: Path, inputs: List[Path]):
+        """Appelé par la finalisation de run_batch quand tous les fichiers d'une source sont traités.
+
+        Réussie ou non: le handler vérifie lui-même ses sorties (job_outputs). inputs est vide si
+        la source a été ignorée d'après le journal ou n'a pas pu être extraite.
+        """
+    def journal_scope(self) -> str:
+        """Clé des lignes du journal: le handler et, s'il en a un, le sens de conversion."""
+        direction = getattr(self, "direction", "")
+        return f"{type(self).__name__}:{direction}" if direction else type(self).__name__
+    def list_archive(self, archive_path: Path) -> Optional[List[str]]:
+        """Liste les fichiers d'une archive sans l'extraire (None si la liste échoue)."""
+        output = self.capture_tool_output("7za.exe", ["l", "-slt", "-sccUTF-8", str(archive_path)])
+        if output is None:
+            return None
+        return parse_7z_listing(output)
+    def select_archive_members(self, members: List[str], extensions: Set[str]) -> List[str]:
+        wanted = {ext.lower() for ext in extensions}
+        selected = []
+        for member in members:
+            key = _archive_member_key(member)
+            if key.startswith("../") or key.count("/") > self.archive_member_depth:
+                continue
+            if posixpath.splitext(key)[1] in wanted:
+                selected.append(member)
+        return selected
     def extract_archive(self, archive_path: Path, extract_to: Path) -> bool:
         extract_to.mkdir(exist_ok=True)
+        extensions = self.archive_member_extensions()
+        members = self.list_archive(archive_path) if extensions else None
+        if members is None:
+            return self._extract_archive_members(archive_path, extract_to)
+
+        selected = self.select_archive_members(members, extensions)
+        if not selected:
+            self.log(f"⏭️ Aucun fichier exploitable dans {archive_path.name}, extraction ignorée")
+            return True
+        self.log(f"🎯 Extraction sélective: {len(selected)}/{len(members)} fichier(s) de {archive_path.name}")
+        if not self._extract_archive_members(archive_path, extract_to, selected):
+            return False
+
+        # Deuxième passe: pistes référencées par les CUE/GDI extraits
+        by_key = {_archive_member_key(m): m for m in members}
+        already = {_archive_member_key(m) for m in selected}
+        referenced = []
+        for member in selected:
+            key = _archive_member_key(member)
+            if posixpath.splitext(key)[1] not in (".cue", ".gdi"):
+                continue
+            for name in self._descriptor_references(extract_to / member.replace("\\", "/")):
+                ref_key = _archive_member_key(posixpath.join(posixpath.dirname(key), name))
+                if ref_key in already or f"{ref_key}.ecm" in already:
+                    continue
+                if ref_key not in by_key and f"{ref_key}.ecm" in by_key:
+                    ref_key = f"{ref_key}.ecm"  # Piste compressée en ECM
+                if ref_key in by_key:
+                    referenced.append(by_key[ref_key])
+                    already.add(ref_key)
+                else:
+                    self.log(f"⚠️ Piste référencée absente de l'archive: {name}")
+        if referenced:
+            self.log(f"🎯 {len(referenced)} piste(s) référencée(s) par CUE/GDI")
+            return self._extract_archive_members(archive_path, extract_to, referenced)
+        return True
+    def _extract_archive_members(self, archive_path: Path, extract_to: Path, members: Optional[List[str]] = None) -> bool:
+        """Extrait l'archive entière, ou seulement les fichiers listés (via un fichier liste UTF-8)."""
         args = [
             "x",
             str(archive_path),
             f"-o{extract_to}",
-            "-y"
+            "-y",
+            *self.tool_thread_args("7za.exe")
         ]
+        list_file = None
+        if members is not None:
+            # Fichier liste plutôt qu'arguments: pas de limite de longueur de ligne de commande
+            list_file = extract_to.parent / f"{extract_to.name}.members.txt"
+            list_file.write_text("\n".join(members) + "\n", encoding="utf-8")
+            args += ["-scsUTF-8", f"@{list_file}"]
         self.log(f"📂 Extraction: {archive_path.name} → {extract_to.name}")
-        if self.run_tool("7za.exe", args):
-            self.log(f"✅ Archive extraite: {archive_path.name}")
-            return True
-        else:
+        try:
+            if self.run_tool("7za.exe", args):
+                self.log(f"✅ Archive extraite: {archive_path.name}")
+                return True
             self.log(f"❌ Échec extraction: {archive_path.name}")
             return False
+        finally:
+            if list_file is not None:
+                try:
+                    list_file.unlink()
+                except OSError:
+                    pass
     def get_multiple_source_files(self, extensions: List[str]) -> List[tuple]:
         """Récupère tous les fichiers avec les extensions données + archives (détection unique)."""
         source_path = Path(self.source_folder)
@@ -292,6 +965,332 @@ class ConversionHandler:
             return archive_extract_folder
         else:
             raise Exception(f"Échec extraction de {archive_path.name}")
+    def run_batch(
+        self,
+        source_files: List[tuple],
+        archive_inputs: Callable[[Path], List[Path]],
+        convert_input: Callable[[Path, Optional[str]], Optional[bool]],
+        progress_label: str = "Traitement",
+    ) -> Tuple[int, int]:
+        """Traite les sources en pipeline: extraction des archives → conversion → finalisation.
+
+        - extraction: un thread extrait les archives à l'avance, au plus archive_lookahead
+          archives devant celles en conversion, pour borner l'espace temporaire;
+        - conversion: jusqu'à max_jobs fichiers en parallèle; convert_input(fichier, extract_type)
+          renvoie True (succès), False (erreur) ou None (ignoré);
+        - finalisation: suppression des sources converties, puis du dossier d'extraction dès
+          que tous les fichiers de l'archive sont traités.
+        Les étapes communiquent par des files bornées et seuls les résultats de la finalisation
+        alimentent les compteurs. Retourne (succès, erreurs).
+
+        Avec le journal (use_journal), les éléments terminés dont les sorties sont intactes
+        sont ignorés sans extraction, les éléments interrompus sont refaits après suppression
+        de leurs sorties, et retry_failed_only limite le lot aux éléments en échec.
+
+        La progression du lot suit les octets des sources terminées (job_size), avec une
+        estimation du temps restant; en parallèle, les plus grosses sources passent en premier.
+        Les sources d'un même groupe (job_group) sont lancées à la suite, donc ensemble.
+        """
+        total = len(source_files)
+        jobs = max(1, int(self.max_jobs))
+        sizes = [self.job_size(Path(source_item)) for source_item, _ in source_files]
+        groups = [self.job_group(Path(source_item)) for source_item, _ in source_files]
+        leaders, group_sizes = {}, {}
+        for index, group in enumerate(groups):
+            if group is not None:
+                leaders.setdefault(group, index)
+                group_sizes[group] = group_sizes.get(group, 0) + sizes[index]
+
+        def batch_position(index: int) -> tuple:
+            group = groups[index]
+            leader = leaders[group] if group is not None else index
+            # Une grosse source (ou un gros groupe) lancée en dernier laisserait les autres jobs inactifs
+            weight = group_sizes[group] if group is not None else sizes[index]
+            return (-weight if jobs > 1 else 0, leader, index)
+
+        order = sorted(range(total), key=batch_position)
+        total_bytes = sum(sizes) or 1
+        started_at = time.monotonic()
+        lookahead = max(0, int(self.archive_lookahead))
+        ready = queue.Queue(maxsize=lookahead + 1)
+        finished = queue.Queue()
+        # Archives présentes sur disque: celles en conversion + celles extraites d'avance
+        temp_slots = threading.Semaphore(jobs + lookahead)
+        counters = {"succeeded": 0, "errors": 0, "journal_skipped": 0,
+                    "started": 0, "done_bytes": 0, "skipped_bytes": 0}
+        if self.dest_folder:
+            self.cleanup_partial_outputs()
+        self._open_journal()
+
+        def extraction_stage():
+            try:
+                for index in order:
+                    source_item, extract_type = source_files[index]
+                    if self.should_stop:
+                        break
+                    unit = _BatchUnit(index, Path(source_item), extract_type)
+                    unit.size = sizes[index]
+                    if self._journal_skips_unit(unit):
+                        ready.put(unit)
+                        continue
+                    if extract_type is None:
+                        unit.inputs = [unit.source]
+                    elif extract_type == "archive":
+                        while not temp_slots.acquire(timeout=0.2):
+                            if self.should_stop:
+                                return
+                        unit.holds_slot = True
+                        self.log(f"📦 Extraction de l'archive: {unit.source.name}")
+                        try:
+                            unit.folder = self.extract_single_archive(unit.source)
+                            unit.inputs = archive_inputs(unit.folder)
+                            self.log(f"🗂️ Trouvé {len(unit.inputs)} fichiers exploitables dans l'archive")
+                        except Exception as e:
+                            self.log(f"❌ Échec extraction {unit.source.name}: {e}")
+                            unit.failed = True
+                    else:
+                        continue  # Type inconnu
+                    ready.put(unit)
+            except Exception as e:
+                self.log(f"❌ Erreur inattendue pendant l'extraction: {e}")
+            finally:
+                ready.put(None)
+
+        def finalize_stage():
+            while True:
+                event = finished.get()
+                if event is None:
+                    break
+                unit, input_file, result, job = event
+                try:
+                    if result is True:
+                        counters["succeeded"] += 1
+                        if unit.extract_type is None and input_file is not None:
+                            self.delete_source_after_success(input_file)
+                    elif result is False:
+                        counters["errors"] += 1
+                        unit.errors += 1
+                    if result is not True and self.should_stop:
+                        unit.interrupted = True
+                    if job is not None and job.skipped:
+                        counters["journal_skipped"] += 1
+                    elif job is not None:
+                        self._journal_finish_input(unit, input_file, result, job)
+                    if input_file is not None:
+                        unit.remaining -= 1
+                        if unit.remaining > 0:
+                            continue
+                    elif unit.skipped:
+                        counters["journal_skipped"] += 1
+                    self._journal_finish_unit(unit)
+                    self._release_batch_unit(unit, temp_slots)
+                    self.source_finished(unit.source, unit.inputs)
+                    counters["done_bytes"] += unit.size
+                    if unit.skipped or not unit.inputs:
+                        counters["skipped_bytes"] += unit.size
+                    else:
+                        report_progress()
+                except Exception as e:
+                    self.log(f"⚠️ Erreur de finalisation ({unit.source.name}): {e}")
+
+        def report_progress():
+            done = counters["done_bytes"]
+            label = f"{progress_label} {counters['started']}/{total}"
+            # Vitesse mesurée sur les seules sources converties (pas celles ignorées)
+            converted = done - counters["skipped_bytes"]
+            if converted > 0 and done < total_bytes:
+                remaining = (time.monotonic() - started_at) * (total_bytes - done) / converted
+                label += f" — reste ≈ {format_duration(remaining)}"
+            self.progress(done * 100 / total_bytes, label)
+
+        def run_job(input_file: Path, extract_type: Optional[str], job: Optional[_BatchJob]) -> Optional[bool]:
+            # Les commandes lancées par run_tool dans ce thread sont rattachées au fichier
+            self._job_context.commands = job.commands if job else None
+            self._job_context.job = job
+            try:
+                return convert_input(input_file, extract_type)
+            finally:
+                self._job_context.commands = None
+                self._job_context.job = None
+
+        def job_result(future) -> Optional[bool]:
+            try:
+                return future.result()
+            except Exception as e:
+                self.log(f"❌ Erreur inattendue pendant la conversion: {e}")
+                return False
+
+        if jobs > 1:
+            self.log(f"⚙️ {jobs} conversions simultanées, {self.threads_per_job()} thread(s) par outil")
+
+        extractor = threading.Thread(target=extraction_stage, name="B2PC_extract", daemon=True)
+        finalizer = threading.Thread(target=finalize_stage, name="B2PC_finalize", daemon=True)
+        finalizer.start()
+        extractor.start()
+        pending = set()
+        try:
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="B2PC_job") as executor:
+                # Lire jusqu'au marqueur de fin, même après un arrêt, pour ne pas bloquer l'extraction
+                while True:
+                    unit = ready.get()
+                    if unit is None:
+                        break
+                    if unit.failed or not unit.inputs or self.should_stop:
+                        finished.put((unit, None, False if unit.failed else None, None))
+                        continue
+                    counters["started"] += 1
+                    report_progress()
+                    if unit.extract_type is None:
+                        self.log(f"📄 Traitement direct: {unit.source.name}")
+                    unit.remaining = len(unit.inputs)
+                    for input_file in unit.inputs:
+                        # Pas plus de max_jobs conversions en cours
+                        while len(pending) >= jobs:
+                            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        if self.should_stop:
+                            finished.put((unit, input_file, None, None))
+                            continue
+                        job = self._journal_begin_input(unit, input_file)
+                        if job is not None and job.skipped:
+                            finished.put((unit, input_file, None, job))
+                            continue
+                        future = executor.submit(run_job, input_file, unit.extract_type, job)
+                        future.add_done_callback(
+                            lambda f, u=unit, p=input_file, j=job: finished.put((u, p, job_result(f), j))
+                        )
+                        pending.add(future)
+                wait(pending)
+        finally:
+            extractor.join()
+            finished.put(None)
+            finalizer.join()
+            self._close_journal()
+            self.shutdown_process_pool()
+
+        if counters["journal_skipped"]:
+            self.log(f"📒 {counters['journal_skipped']} élément(s) ignoré(s) d'après le journal")
+        return counters["succeeded"], counters["errors"]
+
+    def _open_journal(self):
+        self.journal = None
+        if not self.use_journal or not self.dest_folder:
+            return
+        try:
+            Path(self.dest_folder).mkdir(parents=True, exist_ok=True)
+            self.journal = JobJournal.open_in(self.dest_folder, self.journal_scope())
+        except Exception as e:
+            self.log(f"⚠️ Journal indisponible, reprise désactivée: {e}")
+            return
+        if self.retry_failed_only:
+            self.log("🔁 Relance des éléments en échec uniquement (journal)")
+
+    def _close_journal(self):
+        if self.journal is not None:
+            try:
+                self.journal.close()
+            except Exception:
+                pass
+            self.journal = None
+
+    def _journal_skips_unit(self, unit: "_BatchUnit") -> bool:
+        """Source ignorée sans extraction: déjà terminée (ou, en relance, jamais en échec)."""
+        if self.journal is None:
+            return False
+        try:
+            unit.identity = source_identity(unit.source)
+        except OSError:
+            return False
+        row = self.journal.lookup(unit.identity)
+        if row is None:
+            unit.skipped = self.retry_failed_only
+        elif row["state"] == STATE_DONE:
+            rows = [row] + (self.journal.members(unit.identity) if unit.extract_type else [])
+            unit.skipped = all(self.journal.outputs_intact(r) for r in rows if r["state"] == STATE_DONE)
+        if unit.skipped:
+            if not self.retry_failed_only:
+                self.log(f"⏭️ Déjà traité (journal) : {unit.source.name}")
+            return True
+        if unit.extract_type is not None:
+            self.journal.begin(unit.identity)
+        return False
+
+    def _journal_begin_input(self, unit: "_BatchUnit", input_file: Path) -> Optional[_BatchJob]:
+        """Inscrit un fichier au journal avant sa conversion (None si pas de journal)."""
+        if self.journal is None or unit.identity is None:
+            return None
+        member = ""
+        if unit.folder is not None:
+            try:
+                member = input_file.relative_to(unit.folder).as_posix()
+            except ValueError:
+                member = input_file.name
+        row = self.journal.lookup(unit.identity, member)
+        if row is not None:
+            if row["state"] == STATE_DONE and self.journal.outputs_intact(row):
+                self.log(f"⏭️ Déjà traité (journal) : {input_file.name}")
+                return _BatchJob(member, skipped=True)
+            if row["state"] in (STATE_RUNNING, STATE_INTERRUPTED):
+                # Interrompu pendant la conversion: on repart de zéro
+                for removed in remove_outputs(self.job_outputs(input_file)):
+                    self.log(f"♻️ Sortie incomplète supprimée: {removed.name}")
+            elif row["state"] == STATE_DONE:
+                # Sortie modifiée depuis (par l'utilisateur: une sortie tronquée ne porte jamais son
+                # nom final): conservée, le handler l'ignore comme toute sortie déjà existante
+                self.log(f"ℹ️ Sortie modifiée depuis la conversion, conservée : {input_file.name}")
+        self.journal.begin(unit.identity, member)
+        return _BatchJob(member)
+
+    def settle_job(self):
+        """Appelé par convert_input avant de renvoyer None pour un fichier qui n'a rien à refaire
+        tant qu'il ne change pas: le journal l'inscrit comme terminé (sans sortie) et les
+        lancements suivants l'ignorent au lieu de le retraiter."""
+        job = getattr(self._job_context, "job", None)
+        if job is not None:
+            job.settled = True
+
+    def _journal_finish_input(self, unit: "_BatchUnit", input_file: Path, result: Optional[bool], job: _BatchJob):
+        if self.journal is None or unit.identity is None:
+            return
+        try:
+            if result is None and not job.settled:
+                # Ignoré par le handler (ou arrêt avant le début): rien à retenir
+                self.journal.forget(unit.identity, job.member)
+                return
+            if result is True or result is None:
+                state = STATE_DONE
+            else:
+                state = STATE_INTERRUPTED if self.should_stop else STATE_FAILED
+            self.journal.finish(unit.identity, job.member, state, job.commands, self.job_outputs(input_file))
+        except Exception as e:
+            self.log(f"⚠️ Écriture du journal impossible ({input_file.name}): {e}")
+
+    def _journal_finish_unit(self, unit: "_BatchUnit"):
+        """État d'ensemble d'une archive, une fois tous ses fichiers traités."""
+        if self.journal is None or unit.identity is None or unit.extract_type is None or unit.skipped:
+            return
+        if unit.failed or unit.errors:
+            state = STATE_FAILED
+        elif unit.interrupted:
+            state = STATE_INTERRUPTED
+        else:
+            state = STATE_DONE
+        try:
+            self.journal.finish(unit.identity, "", state)
+        except Exception as e:
+            self.log(f"⚠️ Écriture du journal impossible ({unit.source.name}): {e}")
+
+    def _release_batch_unit(self, unit: "_BatchUnit", temp_slots: threading.Semaphore):
+        """Fin d'une source du lot: supprime son dossier d'extraction et libère sa place."""
+        if unit.folder and unit.folder.exists():
+            try:
+                shutil.rmtree(unit.folder)
+                self.log(f"🧹 Dossier d'extraction supprimé: {unit.folder.name}")
+            except Exception as e:
+                self.log(f"⚠️ Erreur nettoyage dossier temporaire: {e}")
+        if unit.holds_slot:
+            unit.holds_slot = False
+            temp_slots.release()
+
     def prepare_source_folder(self) -> str:
         source_path = Path(self.source_folder)
         archives = self.detect_archives(source_path)
@@ -361,38 +1360,35 @@ class ConversionHandler:
             self.log(f"⚠️ Impossible de supprimer {source_path.name}: {e}")
             return False
 
-    def _delete_cue_bundle(self, cue_path: Path) -> bool:
-        targets = [cue_path]
+    def _descriptor_references(self, descriptor_path: Path) -> List[str]:
+        """Noms des fichiers de pistes référencés par un CUE ou un GDI."""
         try:
-            content = cue_path.read_text(encoding='utf-8', errors='ignore').splitlines()
-            for line in content:
-                match = re.search(r'FILE\s+"([^"]+)"', line, re.IGNORECASE)
-                if not match:
-                    match = re.search(r"FILE\s+([^\s]+)", line, re.IGNORECASE)
-                if match:
-                    referenced = (cue_path.parent / match.group(1).strip('"')).resolve()
-                    if referenced.exists() and referenced not in targets:
-                        targets.append(referenced)
+            return list(dict.fromkeys(track.name for track in parse_descriptor_tracks(descriptor_path)))
         except Exception as e:
-            self.log(f"⚠️ Lecture CUE incomplète ({cue_path.name}): {e}")
-
-        return self._delete_files(targets, cue_path.name)
+            label = "GDI" if descriptor_path.suffix.lower() == ".gdi" else "CUE"
+            self.log(f"⚠️ Lecture {label} incomplète ({descriptor_path.name}): {e}")
+            return []
 
-    def _delete_gdi_bundle(self, gdi_path: Path) -> bool:
-        targets = [gdi_path]
+    def _delete_descriptor_bundle(self, descriptor_path: Path) -> bool:
+        targets = [descriptor_path]
         try:
-            lines = gdi_path.read_text(encoding='utf-8', errors='ignore').splitlines()
-            for line in lines[1:]:
-                tokens = re.findall(r'"[^"]*"|\S+', line)
-                if len(tokens) >= 5:
-                    filename = tokens[4].strip('"')
-                    referenced = (gdi_path.parent / filename).resolve()
-                    if referenced.exists() and referenced not in targets:
-                        targets.append(referenced)
+            # Même lecture que la conversion: noms sans tenir compte de la casse, pistes .ecm
+            referenced = read_descriptor(descriptor_path, strict=False).files
         except Exception as e:
-            self.log(f"⚠️ Lecture GDI incomplète ({gdi_path.name}): {e}")
+            label = "GDI" if descriptor_path.suffix.lower() == ".gdi" else "CUE"
+            self.log(f"⚠️ Lecture {label} incomplète ({descriptor_path.name}): {e}")
+            referenced = []
+        for path in referenced:
+            path = path.resolve()
+            if path not in targets:
+                targets.append(path)
+        return self._delete_files(targets, descriptor_path.name)
 
-        return self._delete_files(targets, gdi_path.name)
+    def _delete_cue_bundle(self, cue_path: Path) -> bool:
+        return self._delete_descriptor_bundle(cue_path)
+
+    def _delete_gdi_bundle(self, gdi_path: Path) -> bool:
+        return self._delete_descriptor_bundle(gdi_path)
 
     def _delete_files(self, targets: List[Path], label: str) -> bool:
         deleted_any = False
@@ -0,0 +1,110 @@
+from typing import Dict, List, Tuple
+
+# Secteurs CD bruts (2352 octets): synchronisation, en-tête, données, EDC et ECC (codes P et Q).
+# Correspond à cdrom.cpp de MAME, utilisé par les codecs CD des CHD pour reconstruire l'ECC.
+
+FRAME_SIZE = 2448          # Secteur brut + sous-code, tel que stocké dans un CHD
+SECTOR_SIZE = 2352
+SUBCODE_SIZE = 96
+FRAMES_PER_SECOND = 75
+SYNC_HEADER = b"\x00" + b"\xff" * 10 + b"\x00"
+MODE_OFFSET = 15
+ECC_P_OFFSET = 0x81C
+ECC_P_SIZE = 172
+ECC_Q_OFFSET = 0x8C8
+ECC_Q_SIZE = 104
+
+# Types de piste (métadonnées CHT2) -> octets de données par secteur
+TRACK_DATA_SIZES: Dict[str, int] = {
+    "MODE1": 2048,
+    "MODE1_RAW": 2352,
+    "MODE2": 2336,
+    "MODE2_FORM1": 2048,
+    "MODE2_FORM2": 2324,
+    "MODE2_FORM_MIX": 2336,
+    "MODE2_RAW": 2352,
+    "AUDIO": 2352,
+}
+SUBCODE_SIZES: Dict[str, int] = {"NONE": 0, "RW": 96, "RW_RAW": 96}
+
+# Multiplication par 2 dans GF(2^8) et son inverse pour la dernière étape
+_ECC_F = bytes(((i << 1) ^ (0x11D if i & 0x80 else 0)) & 0xFF for i in range(256))
+_ECC_B_TABLE = bytearray(256)
+for _i in range(256):
+    _ECC_B_TABLE[_i ^ _ECC_F[_i]] = _i
+_ECC_B = bytes(_ECC_B_TABLE)
+
+# Lignes des codes P (86 vecteurs de 24 octets) et Q (52 vecteurs de 43 octets): pour chaque
+# rang, les octets de tous les vecteurs. Q est calculé sur deux moitiés (vecteurs pairs puis
+# impairs), chacune étant une tranche de pas 86 d'un tampon doublé (le parcours boucle).
+_P_ROWS: List[Tuple[int, int]] = [(86 * minor, 86 * minor + 86) for minor in range(24)]
+_Q_ROWS: List[int] = [(88 * minor) % 2236 for minor in range(43)]
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def _ecc_block(rows: List[bytes]) -> Tuple[bytes, bytes]:
+    """Calcule les deux moitiés d'un code (P ou Q) pour tous les vecteurs à la fois."""
+    size = len(rows[0])
+    ecc_a = bytes(size)
+    ecc_b = 0
+    for row in rows:
+        ecc_a = _xor(ecc_a, row).translate(_ECC_F)
+        ecc_b ^= int.from_bytes(row, "little")
+    ecc_b_bytes = ecc_b.to_bytes(size, "little")
+    ecc_a = _xor(ecc_a.translate(_ECC_F), ecc_b_bytes).translate(_ECC_B)
+    return ecc_a, _xor(ecc_a, ecc_b_bytes)
+
+
+def _ecc_source(sector) -> bytes:
+    # En mode 2, les 4 octets d'adresse sont comptés comme nuls (comme MAME)
+    if sector[MODE_OFFSET] == 2:
+        return bytes(4) + bytes(sector[16:ECC_P_OFFSET])
+    return bytes(sector[12:ECC_P_OFFSET])
+
+
+def ecc_generate_many(sectors: List[bytearray]) -> None:
+    """Régénère les codes ECC P et Q de secteurs bruts (modifiés sur place).
+
+    Les vecteurs de tous les secteurs sont traités ensemble: quelques opérations sur de
+    longues chaînes d'octets au lieu d'une boucle par octet.
+    """
+    count = len(sectors)
+    if not count:
+        return
+    sources = [_ecc_source(sector) for sector in sectors]
+    p_low, p_high = _ecc_block([b"".join(src[start:end] for src in sources) for start, end in _P_ROWS])
+    p_codes = [p_low[i * 86:i * 86 + 86] + p_high[i * 86:i * 86 + 86] for i in range(count)]
+
+    doubled = [(src + p) * 2 for src, p in zip(sources, p_codes)]
+    q_low, q_high = _ecc_block([
+        b"".join([buf[s:s + 2151:86] + buf[s + 1:s + 2152:86] for buf in doubled]) for s in _Q_ROWS
+    ])
+
+    q = bytearray(ECC_Q_SIZE)
+    for index, sector in enumerate(sectors):
+        sector[ECC_P_OFFSET:ECC_P_OFFSET + ECC_P_SIZE] = p_codes[index]
+        low, high = q_low[index * 52:index * 52 + 52], q_high[index * 52:index * 52 + 52]
+        q[0:52:2], q[1:52:2] = low[:26], low[26:]
+        q[52::2], q[53::2] = high[:26], high[26:]
+        sector[ECC_Q_OFFSET:ECC_Q_OFFSET + ECC_Q_SIZE] = q
+
+
+def ecc_generate(sector: bytearray) -> None:
+    """Régénère les codes ECC P et Q d'un secteur brut (modifié sur place)."""
+    ecc_generate_many([sector])
+
+
+def swap_16(data) -> bytes:
+    """Échantillons audio: le CHD les stocke en gros-boutiste, le BIN en petit-boutiste."""
+    swapped = bytearray(len(data))
+    swapped[0::2] = data[1::2]
+    swapped[1::2] = data[0::2]
+    return bytes(swapped)
+
+
+def msf(frames: int) -> str:
+    """Position en trames -> 'MM:SS:FF' (fiches CUE)."""
+    return f"{frames // (60 * FRAMES_PER_SECOND):02d}:{(frames // FRAMES_PER_SECOND) % 60:02d}:{frames % FRAMES_PER_SECOND:02d}"
@@ -0,0 +1,705 @@
+import binascii
+import lzma
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .cdrom import FRAME_SIZE, SECTOR_SIZE, SUBCODE_SIZE, SYNC_HEADER, ecc_generate_many
+
+try:
+    import zstandard
+except ImportError:  # Optionnel: sans lui, les CHD zstd passent par chdman
+    zstandard = None
+
+# Lecture native des en-têtes CHD (format MAME, versions 3 à 5): quelques petites lectures
+# par fichier au lieu d'un `chdman info` par CHD.
+
+CHD_MAGIC = b"MComprHD"
+_HEADER_SIZES = {3: 120, 4: 108, 5: 124}
+_MAX_METADATA_ENTRIES = 4096
+
+# Tags de métadonnées (chd.h / cdrom.h de MAME)
+CDROM_TRACK_METADATA2_TAG = "CHT2"
+CDROM_TRACK_METADATA_TAG = "CHTR"
+CDROM_OLD_METADATA_TAG = "CHCD"
+GDROM_TRACK_METADATA_TAG = "CHGD"
+GDROM_OLD_METADATA_TAG = "CHGT"
+DVD_METADATA_TAG = "DVD "
+HARD_DISK_METADATA_TAG = "GDDD"
+AV_METADATA_TAG = "AVAV"
+
+# Métadonnées dont on lit le contenu (les autres: tag et taille seulement)
+_PARSED_TAGS = {
+    CDROM_TRACK_METADATA2_TAG, CDROM_TRACK_METADATA_TAG, CDROM_OLD_METADATA_TAG,
+    GDROM_TRACK_METADATA_TAG, GDROM_OLD_METADATA_TAG, HARD_DISK_METADATA_TAG,
+}
+
+CODEC_NAMES = {
+    "zlib": "Deflate", "zstd": "Zstandard", "lzma": "LZMA", "huff": "Huffman", "flac": "FLAC",
+    "cdzl": "CD Deflate", "cdzs": "CD Zstandard", "cdlz": "CD LZMA", "cdfl": "CD FLAC",
+    "avhu": "A/V Huffman",
+}
+# Versions 3 et 4: un seul algorithme, codé par un entier
+_LEGACY_CODECS = {0: "", 1: "zlib", 2: "zlib", 3: "avhu"}
+
+# Seuil de l'ancienne heuristique chdman info quand aucune métadonnée ne donne le type
+_DVD_SIZE_THRESHOLD = 1_500 * 1024 * 1024
+
+
+class ChdFormatError(ValueError):
+    """Fichier illisible ou qui n'est pas un CHD."""
+
+
+class ChdMetadata:
+    __slots__ = ("tag", "flags", "length", "data")
+
+    def __init__(self, tag: str, flags: int, length: int, data: Optional[bytes]):
+        self.tag = tag
+        self.flags = flags
+        self.length = length
+        self.data = data  # None pour les tags non lus
+
+
+class ChdInfo:
+    """En-tête et métadonnées d'un CHD (équivalent de `chdman info`)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = 0
+        self.file_size = 0
+        self.logical_size = 0
+        self.hunk_bytes = 0
+        self.unit_bytes = 0
+        self.compressors: List[str] = []
+        self.map_offset = 0
+        self.meta_offset = 0
+        self.sha1: Optional[str] = None
+        self.raw_sha1: Optional[str] = None
+        self.parent_sha1: Optional[str] = None
+        self.metadata: List[ChdMetadata] = []
+        self.tracks: List[Dict[str, Union[int, str]]] = []
+
+    @property
+    def tags(self) -> List[str]:
+        return [m.tag for m in self.metadata]
+
+    @property
+    def kind(self) -> str:
+        """Type de média: DVD, CD, GD-ROM, HDD, AV ou '?'."""
+        tags = set(self.tags)
+        if DVD_METADATA_TAG in tags:
+            return "DVD"
+        if tags & {GDROM_TRACK_METADATA_TAG, GDROM_OLD_METADATA_TAG}:
+            return "GD-ROM"
+        if tags & {CDROM_TRACK_METADATA2_TAG, CDROM_TRACK_METADATA_TAG, CDROM_OLD_METADATA_TAG}:
+            return "CD"
+        if HARD_DISK_METADATA_TAG in tags:
+            return "HDD"
+        if AV_METADATA_TAG in tags:
+            return "AV"
+        return "?"
+
+    @property
+    def disc_type(self) -> str:
+        """'DVD' ou 'CD' pour choisir extractdvd / extractcd (GD-ROM s'extrait comme un CD)."""
+        kind = self.kind
+        if kind == "DVD":
+            return "DVD"
+        if kind in ("CD", "GD-ROM"):
+            return "CD"
+        return "DVD" if self.logical_size > _DVD_SIZE_THRESHOLD else "CD"
+
+    @property
+    def hunk_count(self) -> int:
+        return (self.logical_size + self.hunk_bytes - 1) // self.hunk_bytes if self.hunk_bytes else 0
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Taille du fichier / taille logique (comme la ligne Ratio de chdman info)."""
+        return self.file_size / self.logical_size if self.logical_size else None
+
+    @property
+    def has_parent(self) -> bool:
+        return bool(self.parent_sha1) and self.parent_sha1.strip("0") != ""
+
+    def compressor_names(self) -> List[str]:
+        return [CODEC_NAMES.get(c, c) for c in self.compressors]
+
+    def to_dict(self) -> dict:
+        return {
+            "file": str(self.path),
+            "version": self.version,
+            "type": self.kind,
+            "logical_size": self.logical_size,
+            "file_size": self.file_size,
+            "ratio": round(self.ratio, 4) if self.ratio is not None else None,
+            "hunk_bytes": self.hunk_bytes,
+            "unit_bytes": self.unit_bytes,
+            "compressors": self.compressors,
+            "sha1": self.sha1,
+            "raw_sha1": self.raw_sha1,
+            "parent_sha1": self.parent_sha1 if self.has_parent else None,
+            "tracks": self.tracks,
+            "metadata_tags": self.tags,
+        }
+
+
+def _hex(raw: bytes) -> str:
+    return raw.hex()
+
+
+def _parse_track_text(data: bytes) -> Dict[str, Union[int, str]]:
+    """'TRACK:1 TYPE:MODE2_RAW SUBTYPE:NONE FRAMES:1234 ...' -> dict (valeurs numériques en int)."""
+    track: Dict[str, Union[int, str]] = {}
+    for token in data.rstrip(b"\0").decode("ascii", errors="replace").split():
+        key, sep, value = token.partition(":")
+        if not sep:
+            continue
+        track[key.lower()] = int(value) if value.isdigit() else value
+    return track
+
+
+def _parse_old_cd_metadata(data: bytes) -> List[Dict[str, Union[int, str]]]:
+    """CHCD binaire: nombre de pistes puis 6 entiers par piste."""
+    if len(data) < 4:
+        return []
+    count = struct.unpack_from(">I", data, 0)[0]
+    tracks = []
+    for index in range(min(count, (len(data) - 4) // 24)):
+        track_type, subtype, data_size, sub_size, frames, extra = struct.unpack_from(">6I", data, 4 + index * 24)
+        tracks.append({"track": index + 1, "type": track_type, "subtype": subtype, "frames": frames})
+    return tracks
+
+
+def _read_header(info: ChdInfo, f) -> None:
+    head = f.read(16)
+    if len(head) < 16 or head[:8] != CHD_MAGIC:
+        raise ChdFormatError(f"{info.path.name}: signature CHD absente")
+    length, version = struct.unpack(">II", head[8:16])
+    expected = _HEADER_SIZES.get(version)
+    if expected is None:
+        raise ChdFormatError(f"{info.path.name}: version CHD {version} non supportée")
+    if length < expected:
+        raise ChdFormatError(f"{info.path.name}: en-tête CHD tronqué")
+    body = f.read(expected - 16)
+    if len(body) < expected - 16:
+        raise ChdFormatError(f"{info.path.name}: en-tête CHD tronqué")
+    header = head + body
+    info.version = version
+    if version == 5:
+        codecs = struct.unpack_from(">4I", header, 16)
+        info.compressors = [c.to_bytes(4, "big").decode("ascii", errors="replace") for c in codecs if c]
+        info.logical_size, info.map_offset, info.meta_offset = struct.unpack_from(">QQQ", header, 32)
+        info.hunk_bytes, info.unit_bytes = struct.unpack_from(">II", header, 56)
+        info.raw_sha1 = _hex(header[64:84])
+        info.sha1 = _hex(header[84:104])
+        info.parent_sha1 = _hex(header[104:124])
+        return
+    compression = struct.unpack_from(">I", header, 20)[0]
+    codec = _LEGACY_CODECS.get(compression, str(compression))
+    info.compressors = [codec] if codec else []
+    info.logical_size, info.meta_offset = struct.unpack_from(">QQ", header, 28)
+    info.map_offset = expected
+    if version == 4:
+        info.hunk_bytes = struct.unpack_from(">I", header, 44)[0]
+        info.sha1 = _hex(header[48:68])
+        info.parent_sha1 = _hex(header[68:88])
+        info.raw_sha1 = _hex(header[88:108])
+    else:
+        info.hunk_bytes = struct.unpack_from(">I", header, 76)[0]
+        info.sha1 = _hex(header[80:100])
+        info.parent_sha1 = _hex(header[100:120])
+    info.unit_bytes = info.hunk_bytes
+
+
+def _read_metadata(info: ChdInfo, f) -> None:
+    offset = info.meta_offset
+    seen = set()
+    while offset and len(info.metadata) < _MAX_METADATA_ENTRIES:
+        if offset in seen or offset + 16 > info.file_size:
+            raise ChdFormatError(f"{info.path.name}: chaîne de métadonnées invalide")
+        seen.add(offset)
+        f.seek(offset)
+        entry = f.read(16)
+        if len(entry) < 16:
+            raise ChdFormatError(f"{info.path.name}: métadonnées tronquées")
+        raw_tag, flags_length, next_offset = struct.unpack(">4sIQ", entry)
+        tag = raw_tag.decode("ascii", errors="replace")
+        flags, length = flags_length >> 24, flags_length & 0xFFFFFF
+        data = f.read(length) if tag in _PARSED_TAGS else None
+        info.metadata.append(ChdMetadata(tag, flags, length, data))
+        if data is not None:
+            if tag == CDROM_OLD_METADATA_TAG:
+                info.tracks.extend(_parse_old_cd_metadata(data))
+            elif tag != HARD_DISK_METADATA_TAG:
+                info.tracks.append(_parse_track_text(data))
+        offset = next_offset
+
+
+def read_chd_info(path: Union[str, Path]) -> ChdInfo:
+    """Lit l'en-tête et la chaîne de métadonnées d'un CHD. Lève ChdFormatError ou OSError."""
+    info = ChdInfo(Path(path))
+    with open(info.path, "rb") as f:
+        info.file_size = os.fstat(f.fileno()).st_size
+        _read_header(info, f)
+        _read_metadata(info, f)
+    return info
+
+
+def scan_chd_folder(folder: Union[str, Path], recursive: bool = False) -> List[Tuple[Path, Optional[ChdInfo], Optional[str]]]:
+    """Inventaire des CHD d'un dossier: (chemin, infos ou None, erreur ou None) triés par nom."""
+    folder = Path(folder)
+    pattern = "**/*" if recursive else "*"
+    results = []
+    for path in sorted(folder.glob(pattern), key=lambda p: str(p).lower()):
+        if not path.is_file() or path.suffix.lower() != ".chd":
+            continue
+        try:
+            results.append((path, read_chd_info(path), None))
+        except (OSError, ChdFormatError) as e:
+            results.append((path, None, str(e)))
+    return results
+
+
+# --- Lecture des hunks (CHD v5) ------------------------------------------------------------
+# Carte des hunks compressée (chd.cpp: decompress_v5_map) et codecs (chdcodec.cpp) de MAME.
+# Chaque hunk décodé est vérifié par son CRC16: au moindre écart, l'appelant se replie sur chdman.
+
+COMPRESSION_TYPE_0 = 0  # Codecs 0 à 3 de l'en-tête
+COMPRESSION_NONE = 4
+COMPRESSION_SELF = 5
+COMPRESSION_PARENT = 6
+_COMPRESSION_RLE_SMALL = 7
+_COMPRESSION_RLE_LARGE = 8
+_COMPRESSION_SELF_0 = 9
+_COMPRESSION_SELF_1 = 10
+_COMPRESSION_PARENT_SELF = 11
+_COMPRESSION_PARENT_0 = 12
+_COMPRESSION_PARENT_1 = 13
+
+class ChdUnsupportedError(ChdFormatError):
+    """CHD valide mais que le lecteur natif ne sait pas décoder (codec, version, parent)."""
+
+
+def crc16(data) -> int:
+    """CRC16 CCITT des cartes et hunks CHD (util::crc16_creator de MAME)."""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+class _BitReader:
+    """Lecture de bits, poids fort d'abord (bitstream_in de MAME); des zéros au-delà de la fin."""
+
+    __slots__ = ("data", "offset", "acc", "bits")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+        self.acc = 0
+        self.bits = 0
+
+    def peek(self, count: int) -> int:
+        if self.bits < count:
+            chunk = self.data[self.offset:self.offset + 8]
+            self.acc = (self.acc << 64) | int.from_bytes(chunk.ljust(8, b"\0"), "big")
+            self.offset += 8
+            self.bits += 64
+        return (self.acc >> (self.bits - count)) & ((1 << count) - 1)
+
+    def skip(self, count: int) -> None:
+        self.bits -= count
+        self.acc &= (1 << self.bits) - 1
+
+    def read(self, count: int) -> int:
+        if not count:
+            return 0
+        value = self.peek(count)
+        self.skip(count)
+        return value
+
+    @property
+    def overflowed(self) -> bool:
+        return self.offset - self.bits // 8 > len(self.data)
+
+
+def huffman_codes(lengths: List[int], max_bits: int) -> List[Tuple[int, int]]:
+    """(code, longueur) de chaque symbole, numérotation canonique de MAME (assign_canonical_codes)."""
+    histogram = [0] * 33
+    for length in lengths:
+        if length > max_bits:
+            raise ChdFormatError("arbre de Huffman invalide")
+        histogram[length] += 1
+    current_start = 0
+    for length in range(32, 0, -1):
+        next_start = (current_start + histogram[length]) >> 1
+        if length != 1 and next_start * 2 != current_start + histogram[length]:
+            raise ChdFormatError("arbre de Huffman incohérent")
+        histogram[length] = current_start
+        current_start = next_start
+    codes = []
+    for length in lengths:
+        codes.append((histogram[length], length) if length else (0, 0))
+        if length:
+            histogram[length] += 1
+    return codes
+
+
+class _HuffmanDecoder:
+    """Décodeur de Huffman canonique au sens de MAME (huffman.cpp): les codes les plus longs
+    sont numérotés en premier. Table de correspondance sur max_bits: (valeur << 5) | longueur."""
+
+    def __init__(self, num_codes: int, max_bits: int):
+        self.num_codes = num_codes
+        self.max_bits = max_bits
+        self.lengths = [0] * num_codes
+        self.lookup: List[int] = []
+
+    def import_tree_rle(self, reader: _BitReader) -> None:
+        numbits = 5 if self.max_bits >= 16 else 4 if self.max_bits >= 8 else 3
+        lengths = self.lengths
+        current = 0
+        while current < self.num_codes:
+            nodebits = reader.read(numbits)
+            if nodebits != 1:
+                lengths[current] = nodebits
+                current += 1
+                continue
+            nodebits = reader.read(numbits)
+            if nodebits == 1:
+                lengths[current] = nodebits
+                current += 1
+                continue
+            repcount = reader.read(numbits) + 3
+            if current + repcount > self.num_codes:
+                raise ChdFormatError("arbre de Huffman invalide")
+            lengths[current:current + repcount] = [nodebits] * repcount
+            current += repcount
+        self._build(reader)
+
+    def import_tree_huffman(self, reader: _BitReader) -> None:
+        small = _HuffmanDecoder(24, 6)
+        small.lengths[0] = reader.read(3)
+        start = reader.read(3) + 1
+        count = 0
+        for index in range(1, 24):
+            if index < start or count == 7:
+                small.lengths[index] = 0
+            else:
+                count = reader.read(3)
+                small.lengths[index] = 0 if count == 7 else count
+        small._build(reader)
+
+        rlefullbits = (self.num_codes - 9).bit_length()
+        lengths = self.lengths
+        last = 0
+        current = 0
+        while current < self.num_codes:
+            value = small.decode_one(reader)
+            if value:
+                last = value - 1
+                lengths[current] = last
+                current += 1
+                continue
+            count = reader.read(3) + 2
+            if count == 7 + 2:
+                count += reader.read(rlefullbits)
+            count = min(count, self.num_codes - current)
+            lengths[current:current + count] = [last] * count
+            current += count
+        self._build(reader)
+
+    def _build(self, reader: _BitReader) -> None:
+        lookup = [0] * (1 << self.max_bits)
+        for value, (code, length) in enumerate(huffman_codes(self.lengths, self.max_bits)):
+            if length:
+                shift = self.max_bits - length
+                lookup[code << shift:(code + 1) << shift] = [(value << 5) | length] * (1 << shift)
+        self.lookup = lookup
+        if reader.overflowed:
+            raise ChdFormatError("données Huffman tronquées")
+
+    def decode_one(self, reader: _BitReader) -> int:
+        entry = self.lookup[reader.peek(self.max_bits)]
+        reader.skip(entry & 31)
+        return entry >> 5
+
+
+def lzma_dict_size(size: int) -> int:
+    """Taille de dictionnaire de MAME (niveau 9, réduit à la taille du hunk)."""
+    for shift in range(11, 31):
+        if size <= 2 << shift:
+            return 2 << shift
+        if size <= 3 << shift:
+            return 3 << shift
+    return 1 << 26
+
+
+def _zlib_decompress(data: bytes, size: int) -> bytes:
+    return zlib.decompress(data, -15, size)
+
+
+def _lzma_decompress(data: bytes, size: int) -> bytes:
+    filters = [{"id": lzma.FILTER_LZMA1, "dict_size": lzma_dict_size(size), "lc": 3, "lp": 0, "pb": 2}]
+    return lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=filters).decompress(data, size)
+
+
+def _zstd_decompress(data: bytes, size: int) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+
+
+def _huff_decompress(data: bytes, size: int) -> bytes:
+    reader = _BitReader(data)
+    decoder = _HuffmanDecoder(256, 16)
+    decoder.import_tree_huffman(reader)
+    lookup, peek, skip = decoder.lookup, reader.peek, reader.skip
+    out = bytearray(size)
+    for index in range(size):
+        entry = lookup[peek(16)]
+        skip(entry & 31)
+        out[index] = entry >> 5
+    return bytes(out)
+
+
+def _cd_decompressor(base: Callable[[bytes, int], bytes], subcode: Callable[[bytes, int], bytes]):
+    """Codec CD (chd_cd_decompressor): secteurs et sous-codes compressés séparément,
+    synchronisation et ECC retirées des secteurs qui les avaient intactes."""
+    def decompress(data: bytes, size: int) -> bytes:
+        frames = size // FRAME_SIZE
+        ecc_bytes = (frames + 7) // 8
+        header_bytes = ecc_bytes + (2 if size < 65536 else 3)
+        base_length = int.from_bytes(data[ecc_bytes:header_bytes], "big")
+        sectors = base(data[header_bytes:header_bytes + base_length], frames * SECTOR_SIZE)
+        subcodes = subcode(data[header_bytes + base_length:], frames * SUBCODE_SIZE)
+        out = bytearray(size)
+        view = memoryview(out)
+        restored = []
+        for frame in range(frames):
+            position = frame * FRAME_SIZE
+            out[position:position + SECTOR_SIZE] = sectors[frame * SECTOR_SIZE:(frame + 1) * SECTOR_SIZE]
+            out[position + SECTOR_SIZE:position + FRAME_SIZE] = subcodes[frame * SUBCODE_SIZE:(frame + 1) * SUBCODE_SIZE]
+            if data[frame >> 3] & (1 << (frame & 7)):
+                out[position:position + len(SYNC_HEADER)] = SYNC_HEADER
+                restored.append(view[position:position + SECTOR_SIZE])
+        ecc_generate_many(restored)
+        return bytes(out)
+
+    return decompress
+
+
+# Codecs décodables nativement (zstd seulement si le module zstandard est installé).
+# FLAC (flac, cdfl) n'y est pas: un décodeur en Python pur serait plus lent que chdman.
+HUNK_DECOMPRESSORS: Dict[str, Callable[[bytes, int], bytes]] = {
+    "zlib": _zlib_decompress,
+    "lzma": _lzma_decompress,
+    "huff": _huff_decompress,
+    "cdzl": _cd_decompressor(_zlib_decompress, _zlib_decompress),
+    "cdlz": _cd_decompressor(_lzma_decompress, _zlib_decompress),
+}
+if zstandard is not None:
+    HUNK_DECOMPRESSORS["zstd"] = _zstd_decompress
+    HUNK_DECOMPRESSORS["cdzs"] = _cd_decompressor(_zstd_decompress, _zstd_decompress)
+
+
+class ChdHunkMap:
+    """Carte des hunks décodée: type de compression, longueur, offset et CRC16 par hunk.
+
+    Les références SELF pointent vers le numéro du hunk à recopier, PARENT vers une unité
+    du CHD parent. verify_crc est faux pour les CHD non compressés (pas de CRC stocké).
+    """
+
+    def __init__(self, count: int):
+        self.types = bytearray(count)
+        self.lengths = array("I", bytes(4 * count))
+        self.offsets = array("Q", bytes(8 * count))
+        self.crcs = array("H", bytes(2 * count))
+        self.verify_crc = True
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def entry(self, hunk: int) -> Tuple[int, int, int, int]:
+        return self.types[hunk], self.lengths[hunk], self.offsets[hunk], self.crcs[hunk]
+
+    def resolve(self, hunk: int) -> Tuple[int, int, int, int]:
+        """Entrée effective d'un hunk (références SELF suivies jusqu'aux données)."""
+        seen = 0
+        entry = self.entry(hunk)
+        while entry[0] == COMPRESSION_SELF:
+            target = entry[2]
+            seen += 1
+            if target >= len(self.types) or seen > len(self.types):
+                raise ChdFormatError("référence SELF invalide")
+            entry = self.entry(target)
+        return entry
+
+
+def _read_v5_map(info: ChdInfo, f) -> ChdHunkMap:
+    count = info.hunk_count
+    hunk_map = ChdHunkMap(count)
+    f.seek(info.map_offset)
+    if not info.compressors:
+        # CHD non compressé: offset / hunk_bytes sur 32 bits, 0 = hunk absent (zéros ou parent)
+        raw = f.read(4 * count)
+        if len(raw) < 4 * count:
+            raise ChdFormatError(f"{info.path.name}: carte des hunks tronquée")
+        hunk_map.verify_crc = False
+        for hunk, (block,) in enumerate(struct.iter_unpack(">I", raw)):
+            if block:
+                hunk_map.types[hunk] = COMPRESSION_NONE
+                hunk_map.lengths[hunk] = info.hunk_bytes
+                hunk_map.offsets[hunk] = block * info.hunk_bytes
+            elif info.has_parent:
+                hunk_map.types[hunk] = COMPRESSION_PARENT
+                hunk_map.offsets[hunk] = hunk * info.hunk_bytes // info.unit_bytes
+            else:
+                hunk_map.types[hunk] = COMPRESSION_NONE  # longueur 0: hunk de zéros
+        return hunk_map
+
+    header = f.read(16)
+    if len(header) < 16:
+        raise ChdFormatError(f"{info.path.name}: carte des hunks tronquée")
+    map_bytes = struct.unpack_from(">I", header, 0)[0]
+    current_offset = int.from_bytes(header[4:10], "big")
+    map_crc = struct.unpack_from(">H", header, 10)[0]
+    length_bits, self_bits, parent_bits = header[12], header[13], header[14]
+    compressed = f.read(map_bytes)
+    if len(compressed) < map_bytes:
+        raise ChdFormatError(f"{info.path.name}: carte des hunks tronquée")
+    reader = _BitReader(compressed)
+    decoder = _HuffmanDecoder(16, 8)
+    decoder.import_tree_rle(reader)
+
+    # Types de compression, avec répétitions codées en RLE
+    types = hunk_map.types
+    last = 0
+    hunk = 0
+    while hunk < count:
+        value = decoder.decode_one(reader)
+        if value == _COMPRESSION_RLE_SMALL:
+            repeat = 3 + decoder.decode_one(reader)
+        elif value == _COMPRESSION_RLE_LARGE:
+            repeat = 3 + 16 + (decoder.decode_one(reader) << 4)
+            repeat += decoder.decode_one(reader)
+        else:
+            last = value
+            repeat = 1
+        repeat = min(repeat, count - hunk)
+        types[hunk:hunk + repeat] = bytes([last]) * repeat
+        hunk += repeat
+
+    # Longueurs, offsets et CRC; la carte brute (12 octets par hunk) sert à vérifier le CRC global
+    raw_map = bytearray(12 * count)
+    lengths, offsets, crcs = hunk_map.lengths, hunk_map.offsets, hunk_map.crcs
+    read = reader.read
+    hunk_bytes = info.hunk_bytes
+    units_per_hunk = hunk_bytes // info.unit_bytes if info.unit_bytes else 0
+    last_self = 0
+    last_parent = 0
+    for hunk in range(count):
+        kind = types[hunk]
+        offset = current_offset
+        length = 0
+        crc = 0
+        if kind < COMPRESSION_NONE:
+            length = read(length_bits)
+            current_offset += length
+            crc = read(16)
+        elif kind == COMPRESSION_NONE:
+            length = hunk_bytes
+            current_offset += length
+            crc = read(16)
+        elif kind == COMPRESSION_SELF:
+            offset = last_self = read(self_bits)
+        elif kind == COMPRESSION_PARENT:
+            offset = last_parent = read(parent_bits)
+        elif kind in (_COMPRESSION_SELF_0, _COMPRESSION_SELF_1):
+            if kind == _COMPRESSION_SELF_1:
+                last_self += 1
+            kind = COMPRESSION_SELF
+            offset = last_self
+        elif kind == _COMPRESSION_PARENT_SELF:
+            kind = COMPRESSION_PARENT
+            offset = last_parent = hunk * units_per_hunk
+        elif kind in (_COMPRESSION_PARENT_0, _COMPRESSION_PARENT_1):
+            if kind == _COMPRESSION_PARENT_1:
+                last_parent += units_per_hunk
+            kind = COMPRESSION_PARENT
+            offset = last_parent
+        else:
+            raise ChdFormatError(f"{info.path.name}: type de hunk inconnu ({kind})")
+        types[hunk] = kind
+        lengths[hunk] = length
+        offsets[hunk] = offset
+        crcs[hunk] = crc
+        struct.pack_into(">BBHHIH", raw_map, hunk * 12, kind, length >> 16, length & 0xFFFF,
+                         offset >> 32, offset & 0xFFFFFFFF, crc)
+    if reader.overflowed or crc16(raw_map) != map_crc:
+        raise ChdFormatError(f"{info.path.name}: carte des hunks corrompue (CRC)")
+    return hunk_map
+
+
+def decode_hunk(f, codecs: List[str], hunk_bytes: int, entry: Tuple[int, int, int, int], verify_crc: bool = True) -> bytes:
+    """Décode un hunk à partir de son entrée de carte déjà résolue (pas de SELF ni de PARENT)."""
+    kind, length, offset, crc = entry
+    if kind == COMPRESSION_NONE:
+        if not length:
+            return bytes(hunk_bytes)
+        f.seek(offset)
+        data = f.read(hunk_bytes)
+    elif kind < COMPRESSION_NONE:
+        f.seek(offset)
+        compressed = f.read(length)
+        try:
+            decompress = HUNK_DECOMPRESSORS[codecs[kind]]
+        except (IndexError, KeyError):
+            raise ChdUnsupportedError(f"codec non géré: {codecs[kind] if kind < len(codecs) else kind}")
+        try:
+            data = decompress(compressed, hunk_bytes)
+        except Exception as e:  # zlib.error, lzma.LZMAError, zstandard.ZstdError...
+            raise ChdFormatError(f"hunk illisible à l'offset {offset}: {e}")
+    else:
+        raise ChdUnsupportedError("hunk du CHD parent")
+    if len(data) != hunk_bytes or (verify_crc and crc16(data) != crc):
+        raise ChdFormatError(f"hunk corrompu à l'offset {offset} (CRC)")
+    return data
+
+
+def decode_hunks(path: str, codecs: List[str], hunk_bytes: int, entries: List[Tuple[int, int, int, int]],
+                 verify_crc: bool = True) -> bytes:
+    """Décode une suite de hunks (tâche d'un processus de décodage: arguments simples, picklables)."""
+    with open(path, "rb") as f:
+        return b"".join(decode_hunk(f, codecs, hunk_bytes, entry, verify_crc) for entry in entries)
+
+
+class ChdReader:
+    """En-tête, métadonnées et carte des hunks d'un CHD v5, prêts pour un décodage parallèle."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.info = read_chd_info(path)
+        if self.info.version != 5:
+            raise ChdUnsupportedError(f"CHD v{self.info.version}")
+        if not self.info.hunk_bytes or (self.info.compressors and not self.info.unit_bytes):
+            raise ChdFormatError(f"{self.info.path.name}: en-tête CHD incohérent")
+        with open(self.info.path, "rb") as f:
+            self.map = _read_v5_map(self.info, f)
+
+    def unsupported_reason(self) -> Optional[str]:
+        """Raison pour laquelle le décodage natif est impossible, ou None."""
+        used = set(self.map.types)
+        if COMPRESSION_PARENT in used:
+            return "hunks du CHD parent"
+        for kind in sorted(used):
+            if kind < COMPRESSION_NONE:
+                codec = self.info.compressors[kind] if kind < len(self.info.compressors) else str(kind)
+                if codec not in HUNK_DECOMPRESSORS:
+                    return f"codec {CODEC_NAMES.get(codec, codec)}"
+        return None
+
+    def entries(self, start: int, count: int) -> List[Tuple[int, int, int, int]]:
+        return [self.map.resolve(hunk) for hunk in range(start, min(start + count, len(self.map)))]
+
+    def read_hunks(self, start: int, count: int) -> bytes:
+        return decode_hunks(str(self.info.path), self.info.compressors, self.info.hunk_bytes,
+                            self.entries(start, count), self.map.verify_crc)
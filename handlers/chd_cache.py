@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .chd import ChdFormatError, read_chd_info
+
+# Version du format des lignes: l'incrémenter invalide les caches existants
+_CACHE_VERSION = 1
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def summarize_chd(path: Path) -> dict:
+    """Ligne du tableau Infos CHD, lue depuis l'en-tête (error renseigné si illisible)."""
+    try:
+        info = read_chd_info(path)
+    except (OSError, ChdFormatError) as e:
+        return {"version": None, "type": None, "logical_size": None, "file_size": None, "error": str(e)}
+    return {
+        "version": info.version,
+        # Type issu des métadonnées; sans métadonnées, même heuristique de taille que chdman info
+        "type": info.kind if info.kind != "?" else info.disc_type,
+        "logical_size": info.logical_size,
+        "file_size": info.file_size,
+        "error": None,
+    }
+
+
+class ChdInfoCache:
+    """Infos CHD déjà lues, conservées sur disque et indexées par (chemin, taille, mtime).
+
+    Un fichier modifié ou remplacé change de taille ou de mtime: sa ligne est simplement relue.
+    Le cache est réécrit atomiquement (plusieurs instances de B2PC peuvent le partager).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            base = os.getenv('LOCALAPPDATA') or os.getenv('APPDATA') or str(Path.home())
+            path = Path(base) / 'B2PC' / 'chd_info_cache.json'
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, dict]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._entries = data["entries"] if data.get("version") == _CACHE_VERSION else {}
+            except (OSError, ValueError, KeyError, AttributeError):
+                self._entries = {}
+        return self._entries
+
+    def lookup(self, path: Path) -> Optional[dict]:
+        """Ligne en cache si le fichier n'a pas changé depuis sa lecture, sinon None."""
+        try:
+            size, mtime_ns = _file_signature(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(str(path))
+        if entry and entry.get("size") == size and entry.get("mtime_ns") == mtime_ns:
+            return entry["row"]
+        return None
+
+    def store(self, path: Path, row: dict):
+        try:
+            size, mtime_ns = _file_signature(path)
+        except OSError:
+            return
+        with self._lock:
+            self._load()[str(path)] = {"size": size, "mtime_ns": mtime_ns, "row": row}
+            self._dirty = True
+
+    def get(self, path: Path) -> dict:
+        """Ligne du fichier, lue depuis le cache ou depuis son en-tête (puis mise en cache)."""
+        row = self.lookup(path)
+        if row is None:
+            row = summarize_chd(path)
+            self.store(path, row)
+        return row
+
+    def forget_missing(self, folder: Path):
+        """Retire les fichiers disparus d'un dossier (le cache ne grossit pas indéfiniment)."""
+        folder = str(Path(folder))
+        with self._lock:
+            entries = self._load()
+            missing = [key for key in entries if str(Path(key).parent) == folder and not os.path.exists(key)]
+            for key in missing:
+                del entries[key]
+            self._dirty = self._dirty or bool(missing)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_name(f"{self.path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps({"version": _CACHE_VERSION, "entries": self._entries}), encoding="utf-8")
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError:
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
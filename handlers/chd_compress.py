@@ -0,0 +1,569 @@
+import hashlib
+import heapq
+import lzma
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .base import DescriptorError, DescriptorSheet, read_descriptor
+from .cdrom import ECC_P_OFFSET, FRAME_SIZE, SECTOR_SIZE, SYNC_HEADER, ecc_generate_many, swap_16
+from .chd import (
+    CDROM_TRACK_METADATA2_TAG, CHD_MAGIC, COMPRESSION_NONE, COMPRESSION_SELF, DVD_METADATA_TAG,
+    _COMPRESSION_RLE_LARGE, _COMPRESSION_RLE_SMALL, _COMPRESSION_SELF_0, _COMPRESSION_SELF_1,
+    ChdHunkMap, ChdReader, ChdUnsupportedError, crc16, huffman_codes, lzma_dict_size, zstandard,
+)
+
+# Création native des CHD v5 (équivalent de chdman createdvd / createcd pour les CUE/BIN):
+# les hunks sont compressés par lots dans un pool de processus avec chaque codec de l'en-tête
+# (le plus petit résultat est gardé, comme chd_compressor_group::find_best_compressor), puis
+# écrits dans l'ordre; la carte des hunks et les SHA1 sont calculés à la fin, comme chez chdman.
+
+_TASK_BYTES = 4 * 1024 * 1024  # Données brutes par tâche envoyée au pool
+_HEADER_SIZE = 124
+_METADATA_CHECKSUM = 0x01  # CHD_MDFLAGS_CHECKSUM: métadonnée comptée dans le SHA1 global
+
+DVD_SECTOR_SIZE = 2048
+DVD_HUNK_BYTES = 2 * DVD_SECTOR_SIZE
+CD_FRAMES_PER_HUNK = 8
+_TRACK_PADDING = 4  # Chaque piste est complétée à un multiple de 4 trames
+
+# Codecs par défaut: ceux de chdman sans FLAC (non encodé ici). zstd est disponible sur demande:
+# les CHD zstd ne sont lus que par les émulateurs récents.
+DEFAULT_DVD_CODECS = ("lzma", "zlib")
+DEFAULT_CD_CODECS = ("cdlz", "cdzl")
+
+# Types de piste des fiches CUE (chdcd.cpp) -> type CHT2 et octets par secteur dans le BIN
+_CUE_TRACK_TYPES: Dict[str, Tuple[str, int]] = {
+    "MODE1/2048": ("MODE1", 2048),
+    "MODE1/2352": ("MODE1_RAW", 2352),
+    "MODE2/2048": ("MODE2_FORM1", 2048),
+    "MODE2/2324": ("MODE2_FORM2", 2324),
+    "MODE2/2336": ("MODE2", 2336),
+    "MODE2/2352": ("MODE2_RAW", 2352),
+    "AUDIO": ("AUDIO", 2352),
+}
+_CUE_IGNORED = {"CATALOG", "CDTEXTFILE", "FLAGS", "ISRC", "PERFORMER", "SONGWRITER", "TITLE"}
+
+
+class CompressionStopped(Exception):
+    """Arrêt demandé pendant une compression native."""
+
+
+# --- Codecs ----------------------------------------------------------------------------------
+
+_zstd_local = threading.local()
+
+
+def _zlib_compress(data: bytes, size: int) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15, 8)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _lzma_compress(data: bytes, size: int) -> bytes:
+    # Réglages de chd_lzma_compressor (niveau 9, dictionnaire réduit à la taille du bloc)
+    filters = [{"id": lzma.FILTER_LZMA1, "preset": 9, "dict_size": lzma_dict_size(size),
+                "lc": 3, "lp": 0, "pb": 2, "nice_len": 64}]
+    return lzma.compress(data, format=lzma.FORMAT_RAW, filters=filters)
+
+
+def _zstd_compress(data: bytes, size: int) -> bytes:
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=zstandard.MAX_COMPRESSION_LEVEL)
+    return compressor.compress(data)
+
+
+_CLEARED_SYNC = bytes(len(SYNC_HEADER))
+_CLEARED_ECC = bytes(SECTOR_SIZE - ECC_P_OFFSET)
+
+
+def _cd_split(hunk: bytes) -> Tuple[bytes, bytes, bytes]:
+    """Prépare un hunk CD (chd_cd_compressor): drapeaux ECC, secteurs et sous-codes séparés.
+
+    Les secteurs dont la synchronisation et l'ECC sont intactes sont marqués et perdent ces
+    octets, que le décodeur régénère.
+    """
+    frames = len(hunk) // FRAME_SIZE
+    flags = bytearray((frames + 7) // 8)
+    sectors = [hunk[i * FRAME_SIZE:i * FRAME_SIZE + SECTOR_SIZE] for i in range(frames)]
+    subcodes = b"".join(hunk[i * FRAME_SIZE + SECTOR_SIZE:(i + 1) * FRAME_SIZE] for i in range(frames))
+    candidates = [i for i, sector in enumerate(sectors) if sector[:len(SYNC_HEADER)] == SYNC_HEADER]
+    if candidates:
+        regenerated = [bytearray(sectors[i]) for i in candidates]
+        ecc_generate_many(regenerated)
+        for i, sector in zip(candidates, regenerated):
+            if sector[ECC_P_OFFSET:] == sectors[i][ECC_P_OFFSET:]:
+                flags[i >> 3] |= 1 << (i & 7)
+                sectors[i] = _CLEARED_SYNC + sectors[i][len(SYNC_HEADER):ECC_P_OFFSET] + _CLEARED_ECC
+    return bytes(flags), b"".join(sectors), subcodes
+
+
+def _cd_compressor(base: Callable[[bytes, int], bytes], subcode: Callable[[bytes, int], bytes]):
+    def compress(parts: Tuple[bytes, bytes, bytes], size: int) -> Optional[bytes]:
+        flags, sectors, subcodes = parts
+        length_bytes = 2 if size < 65536 else 3
+        compressed = base(sectors, len(sectors))
+        if len(compressed) >= 1 << (8 * length_bytes - 1):
+            return None  # Longueur non représentable: codec écarté pour ce hunk, comme chez MAME
+        return flags + len(compressed).to_bytes(length_bytes, "big") + compressed + subcode(subcodes, len(subcodes))
+
+    return compress
+
+
+# Codecs encodables nativement (zstd seulement si le module zstandard est installé).
+# FLAC et Huffman restent réservés à chdman.
+HUNK_COMPRESSORS: Dict[str, Callable[[bytes, int], bytes]] = {
+    "zlib": _zlib_compress,
+    "lzma": _lzma_compress,
+}
+CD_HUNK_COMPRESSORS = {
+    "cdzl": _cd_compressor(_zlib_compress, _zlib_compress),
+    "cdlz": _cd_compressor(_lzma_compress, _zlib_compress),
+}
+if zstandard is not None:
+    HUNK_COMPRESSORS["zstd"] = _zstd_compress
+    CD_HUNK_COMPRESSORS["cdzs"] = _cd_compressor(_zstd_compress, _zstd_compress)
+
+
+def compress_hunks(codecs: List[str], hunk_bytes: int, hunks: List[bytes]) -> List[Tuple[int, Optional[bytes], int]]:
+    """(codec, données compressées, CRC16) de chaque hunk; codec -1 (None) si rien n'est plus petit.
+
+    Tâche du pool de processus: ne reçoit et ne renvoie que des objets simples.
+    """
+    results = []
+    for hunk in hunks:
+        best, payload, best_length = -1, None, hunk_bytes
+        cd_parts = None
+        for index, codec in enumerate(codecs):
+            if codec in CD_HUNK_COMPRESSORS:
+                if cd_parts is None:
+                    cd_parts = _cd_split(hunk)
+                compressed = CD_HUNK_COMPRESSORS[codec](cd_parts, hunk_bytes)
+            else:
+                compressed = HUNK_COMPRESSORS[codec](hunk, hunk_bytes)
+            if compressed is not None and len(compressed) < best_length:
+                best, payload, best_length = index, compressed, len(compressed)
+        results.append((best, payload, crc16(hunk)))
+    return results
+
+
+# --- Carte des hunks (chd.cpp: compress_v5_map) ----------------------------------------------
+
+class _BitWriter:
+    def __init__(self):
+        self.data = bytearray()
+        self._accumulator = 0
+        self._bits = 0
+
+    def write(self, value: int, count: int) -> None:
+        self._accumulator = (self._accumulator << count) | (value & ((1 << count) - 1))
+        self._bits += count
+        while self._bits >= 8:
+            self._bits -= 8
+            self.data.append((self._accumulator >> self._bits) & 0xFF)
+        self._accumulator &= (1 << self._bits) - 1
+
+    def flush(self) -> bytes:
+        if self._bits:
+            self.data.append((self._accumulator << (8 - self._bits)) & 0xFF)
+            self._accumulator = self._bits = 0
+        return bytes(self.data)
+
+
+def _huffman_lengths(counts: List[int], max_bits: int) -> List[int]:
+    """Longueurs de codes de Huffman limitées à max_bits (code complet, accepté par MAME)."""
+    counts = list(counts)
+    while True:
+        lengths = [0] * len(counts)
+        heap = [(count, symbol, [symbol]) for symbol, count in enumerate(counts) if count]
+        if len(heap) == 1:
+            lengths[heap[0][1]] = 1
+            return lengths
+        heapq.heapify(heap)
+        while len(heap) > 1:
+            weight_a, tie_a, symbols_a = heapq.heappop(heap)
+            weight_b, tie_b, symbols_b = heapq.heappop(heap)
+            for symbol in symbols_a + symbols_b:
+                lengths[symbol] += 1
+            heapq.heappush(heap, (weight_a + weight_b, min(tie_a, tie_b), symbols_a + symbols_b))
+        if max(lengths) <= max_bits:
+            return lengths
+        # Arbre trop profond: on aplatit l'histogramme (les poids non nuls restent >= 1)
+        counts = [(count + 1) // 2 for count in counts]
+
+
+def encode_v5_map(hunk_map: ChdHunkMap, first_offset: int) -> bytes:
+    """Carte compressée d'un CHD v5 (en-tête de 16 octets + données), à partir de la carte brute.
+
+    Les hunks COMPRESSION_NONE et 0 à 3 doivent se suivre dans le fichier à partir de first_offset.
+    """
+    count = len(hunk_map)
+    types, lengths, offsets, crcs = hunk_map.types, hunk_map.lengths, hunk_map.offsets, hunk_map.crcs
+    raw_map = bytearray(12 * count)
+    coded = bytearray(count)
+    max_length = max_self = 0
+    last_self = 0
+    for hunk in range(count):
+        kind, length, offset, crc = types[hunk], lengths[hunk], offsets[hunk], crcs[hunk]
+        struct.pack_into(">BBHHIH", raw_map, hunk * 12, kind, length >> 16, length & 0xFFFF,
+                         offset >> 32, offset & 0xFFFFFFFF, crc)
+        if kind == COMPRESSION_SELF:
+            if offset == last_self:
+                kind = _COMPRESSION_SELF_0
+            elif offset == last_self + 1:
+                kind = _COMPRESSION_SELF_1
+            else:
+                max_self = max(max_self, offset)
+            last_self = offset
+        elif kind < COMPRESSION_NONE:
+            max_length = max(max_length, length)
+        coded[hunk] = kind
+
+    # Types en RLE: une valeur explicite puis ses répétitions (3 à 18, ou 19 à 274 par bloc)
+    symbols = []
+    hunk = 0
+    while hunk < count:
+        kind = coded[hunk]
+        run = 1
+        while hunk + run < count and coded[hunk + run] == kind:
+            run += 1
+        hunk += run
+        symbols.append(kind)
+        run -= 1
+        while run >= 3:
+            if run >= 19:
+                repeat = min(run, 19 + 255)
+                symbols += [_COMPRESSION_RLE_LARGE, (repeat - 19) >> 4, (repeat - 19) & 15]
+            else:
+                repeat = run
+                symbols += [_COMPRESSION_RLE_SMALL, repeat - 3]
+            run -= repeat
+        symbols += [kind] * run
+
+    histogram = [0] * 16
+    for symbol in symbols:
+        histogram[symbol] += 1
+    code_lengths = _huffman_lengths(histogram, 8)
+    codes = huffman_codes(code_lengths, 8)
+    writer = _BitWriter()
+    write = writer.write
+    for length in code_lengths:
+        # import_tree_rle: la valeur 1 annonce une répétition, une longueur 1 s'écrit donc 1, 1
+        write(length, 4)
+        if length == 1:
+            write(1, 4)
+    for symbol in symbols:
+        write(*codes[symbol])
+
+    length_bits, self_bits = max_length.bit_length(), max_self.bit_length()
+    for hunk in range(count):
+        kind = coded[hunk]
+        if kind < COMPRESSION_NONE:
+            write(lengths[hunk], length_bits)
+            write(crcs[hunk], 16)
+        elif kind == COMPRESSION_NONE:
+            write(crcs[hunk], 16)
+        elif kind == COMPRESSION_SELF:
+            write(offsets[hunk], self_bits)
+    data = writer.flush()
+    header = (struct.pack(">I", len(data)) + first_offset.to_bytes(6, "big")
+              + struct.pack(">HBBBB", crc16(raw_map), length_bits, self_bits, 0, 0))
+    return header + data
+
+
+def _metadata_chain(metadata: List[Tuple[str, bytes]], offset: int) -> bytes:
+    """Entrées de métadonnées chaînées (tag, drapeaux/longueur, suivante, données)."""
+    chain = bytearray()
+    for index, (tag, data) in enumerate(metadata):
+        next_offset = offset + len(chain) + 16 + len(data) if index + 1 < len(metadata) else 0
+        chain += tag.encode("ascii") + struct.pack(">IQ", (_METADATA_CHECKSUM << 24) | len(data), next_offset) + data
+    return bytes(chain)
+
+
+def _overall_sha1(raw_sha1: bytes, metadata: List[Tuple[str, bytes]]) -> bytes:
+    """SHA1 global (compute_overall_sha1): données brutes puis métadonnées checksummées, triées."""
+    hashes = sorted(tag.encode("ascii") + hashlib.sha1(data).digest() for tag, data in metadata)
+    return hashlib.sha1(raw_sha1 + b"".join(hashes)).digest()
+
+
+# --- Fiches CUE (chdcd.cpp: parse_cue) -------------------------------------------------------
+
+class _CueTrack:
+    __slots__ = ("number", "type", "data_size", "file", "index0", "index1", "pregap", "pregap_in_file",
+                 "postgap", "frames", "offset")
+
+    def __init__(self, number: int, track_type: str, data_size: int, file: Path):
+        self.number = number
+        self.type = track_type
+        self.data_size = data_size
+        self.file = file
+        self.index0 = -1
+        self.index1 = -1
+        self.pregap = 0
+        self.pregap_in_file = False
+        self.postgap = 0
+        self.frames = 0
+        self.offset = 0  # Octets dans le fichier de la piste
+
+    def metadata(self) -> bytes:
+        """Ligne CHT2 de chdman createcd (PGTYPE préfixé de V si le pregap est dans le fichier)."""
+        pregap_type = f"V{self.type}" if self.pregap_in_file else "MODE1"
+        text = (f"TRACK:{self.number} TYPE:{self.type} SUBTYPE:NONE FRAMES:{self.frames} "
+                f"PREGAP:{self.pregap} PGTYPE:{pregap_type} PGSUB:RW POSTGAP:{self.postgap}")
+        return text.encode("ascii") + b"\0"
+
+
+def read_cue_tracks(cue_path: Path, sheet: Optional[DescriptorSheet] = None) -> List[_CueTrack]:
+    """Pistes d'une fiche CUE/BIN, longueurs et offsets calculés comme chdman createcd.
+
+    sheet: la fiche déjà lue par read_descriptor (sinon elle est lue ici). Lève
+    ChdUnsupportedError pour ce que le compresseur natif ne couvre pas (WAVE, GD-ROM, fiche
+    illisible...): l'appelant se replie alors sur chdman.
+    """
+    if sheet is None:
+        try:
+            sheet = read_descriptor(cue_path)
+        except (OSError, DescriptorError) as e:
+            raise ChdUnsupportedError(f"fiche CUE illisible: {e}") from e
+    unknown = set(sheet.commands) - {"FILE", "TRACK", "INDEX", "PREGAP", "POSTGAP", "REM"} - _CUE_IGNORED
+    if unknown:
+        raise ChdUnsupportedError(f"commande CUE {min(unknown)}")
+    if any("AREA" in sheet.lines[line].upper() for line in sheet.commands.get("REM", ())):
+        raise ChdUnsupportedError("fiche CUE GD-ROM")
+    for entry in sheet.file_entries:
+        if entry.type != "BINARY":
+            raise ChdUnsupportedError(f"fichier {entry.type or entry.name}")
+        if entry.path is None or entry.path.suffix.lower() == ".ecm":
+            raise ChdUnsupportedError(f"fichier de piste introuvable: {entry.name}")
+
+    tracks: List[_CueTrack] = []
+    for source in sheet.tracks:
+        track_type = _CUE_TRACK_TYPES.get(source.mode)
+        if track_type is None:
+            raise ChdUnsupportedError(f"type de piste {source.mode}")
+        if any(index.file is not source.file for index in source.indexes):
+            raise ChdUnsupportedError(f"piste {source.number} répartie sur deux fichiers")
+        track = _CueTrack(source.number, track_type[0], track_type[1], source.path)
+        track.pregap = source.pregap
+        track.postgap = source.postgap
+        for index in source.indexes:
+            if index.number == 0:
+                track.index0 = index.frames
+            elif index.number == 1:
+                track.index1 = index.frames
+                if track.pregap == 0 and track.index0 != -1:
+                    track.pregap = track.index1 - track.index0
+                    track.pregap_in_file = True
+                else:
+                    track.index0 = track.index1  # Longueurs toujours calculées depuis l'index 0
+        tracks.append(track)
+
+    if not tracks or [t.number for t in tracks] != list(range(1, len(tracks) + 1)):
+        raise ChdUnsupportedError("numérotation des pistes inattendue")
+    for index, track in enumerate(tracks):
+        if track.index1 == -1:
+            raise ChdUnsupportedError(f"piste {track.number} sans INDEX 01")
+        previous = tracks[index - 1] if index else None
+        shares_previous = previous is not None and previous.file == track.file
+        if shares_previous:
+            track.offset = previous.offset + previous.frames * previous.data_size
+        if index + 1 < len(tracks) and tracks[index + 1].file == track.file:
+            track.frames = tracks[index + 1].index0 - track.index0
+        else:
+            try:
+                file_size = track.file.stat().st_size
+            except OSError as e:
+                raise ChdUnsupportedError(f"fichier de piste illisible: {e}") from e
+            track.frames = (file_size - track.offset) // track.data_size
+        if track.frames <= 0:
+            raise ChdUnsupportedError(f"piste {track.number} vide")
+    return tracks
+
+
+# --- Écriture --------------------------------------------------------------------------------
+
+class ChdCompressor:
+    """Création d'un CHD v5 sans chdman, sans parent.
+
+    Lève ChdUnsupportedError pour les entrées hors de portée (GDI, WAVE, ISO de taille
+    inattendue...): l'appelant se replie alors sur chdman.
+    """
+
+    def __init__(self, should_stop: Callable[[], bool] = lambda: False,
+                 progress: Optional[Callable[[float], None]] = None):
+        self.should_stop = should_stop
+        self.progress = progress
+
+    def compress_iso(self, iso_path: Path, chd_path: Path, executor: Optional[Executor] = None,
+                     tasks_in_flight: int = 1, codecs: Optional[List[str]] = None) -> None:
+        """Équivalent de chdman createdvd."""
+        size = iso_path.stat().st_size
+        if not size or size % DVD_SECTOR_SIZE:
+            raise ChdUnsupportedError("taille d'ISO non multiple de 2048 octets")
+
+        def chunks() -> Iterator[bytes]:
+            per_task = max(1, _TASK_BYTES // DVD_HUNK_BYTES) * DVD_HUNK_BYTES
+            with open(iso_path, "rb") as f:
+                while True:
+                    data = f.read(per_task)
+                    if not data:
+                        return
+                    if len(data) % DVD_HUNK_BYTES:
+                        data += bytes(DVD_HUNK_BYTES - len(data) % DVD_HUNK_BYTES)
+                    yield data
+
+        self._write(chd_path, chunks(), size, DVD_HUNK_BYTES, DVD_SECTOR_SIZE,
+                    list(codecs or DEFAULT_DVD_CODECS), [(DVD_METADATA_TAG, b"\0")], executor, tasks_in_flight)
+
+    def compress_cue(self, cue_path: Path, chd_path: Path, executor: Optional[Executor] = None,
+                     tasks_in_flight: int = 1, codecs: Optional[List[str]] = None,
+                     sheet: Optional[DescriptorSheet] = None) -> None:
+        """Équivalent de chdman createcd pour une fiche CUE et ses BIN (sheet: fiche déjà lue)."""
+        tracks = read_cue_tracks(cue_path, sheet)
+        hunk_bytes = CD_FRAMES_PER_HUNK * FRAME_SIZE
+        padded = [-(-track.frames // _TRACK_PADDING) * _TRACK_PADDING for track in tracks]
+        logical_bytes = sum(padded) * FRAME_SIZE
+
+        def chunks() -> Iterator[bytes]:
+            per_task = max(1, _TASK_BYTES // hunk_bytes) * hunk_bytes
+            frames_per_read = per_task // FRAME_SIZE
+            pending = bytearray()
+            for track, padded_frames in zip(tracks, padded):
+                pad = bytes(FRAME_SIZE - track.data_size)
+                with open(track.file, "rb") as f:
+                    f.seek(track.offset)
+                    remaining = track.frames
+                    while remaining:
+                        count = min(remaining, frames_per_read)
+                        data = f.read(count * track.data_size)
+                        if len(data) < count * track.data_size:
+                            raise ChdUnsupportedError(f"fichier de piste trop court: {track.file.name}")
+                        if track.type == "AUDIO":
+                            data = swap_16(data)
+                        view = memoryview(data)
+                        parts = [pad] * (2 * count)
+                        parts[0::2] = [view[i * track.data_size:(i + 1) * track.data_size] for i in range(count)]
+                        pending += b"".join(parts)
+                        remaining -= count
+                        while len(pending) >= per_task:
+                            yield bytes(pending[:per_task])
+                            del pending[:per_task]
+                pending += bytes((padded_frames - track.frames) * FRAME_SIZE)
+            if pending:
+                pending += bytes(-len(pending) % hunk_bytes)
+                yield bytes(pending)
+
+        metadata = [(CDROM_TRACK_METADATA2_TAG, track.metadata()) for track in tracks]
+        self._write(chd_path, chunks(), logical_bytes, hunk_bytes, FRAME_SIZE,
+                    list(codecs or DEFAULT_CD_CODECS), metadata, executor, tasks_in_flight)
+
+    def _write(self, chd_path: Path, chunks: Iterator[bytes], logical_bytes: int, hunk_bytes: int,
+               unit_bytes: int, codecs: List[str], metadata: List[Tuple[str, bytes]],
+               executor: Optional[Executor], tasks_in_flight: int) -> None:
+        for codec in codecs:
+            if codec not in HUNK_COMPRESSORS and codec not in CD_HUNK_COMPRESSORS:
+                raise ChdUnsupportedError(f"codec {codec}")
+        if not 1 <= len(codecs) <= 4:
+            raise ChdUnsupportedError("1 à 4 codecs par CHD")
+        hunk_count = -(-logical_bytes // hunk_bytes)
+        hunk_map = ChdHunkMap(hunk_count)
+        seen: Dict[bytes, int] = {}  # SHA1 d'un hunk -> premier hunk identique (références SELF)
+        raw_sha1 = hashlib.sha1()
+        state = {"hunk": 0, "logical": logical_bytes}
+
+        with open(chd_path, "wb") as out:
+            out.write(bytes(_HEADER_SIZE))
+            meta_offset = out.tell() if metadata else 0
+            out.write(_metadata_chain(metadata, meta_offset))
+            first_offset = out.tell()
+
+            def plan(chunk: bytes) -> Tuple[int, List[Optional[int]], List[bytes]]:
+                """Premier hunk du lot, hunk de référence des doublons et hunks à compresser."""
+                raw_sha1.update(chunk[:state["logical"]])
+                state["logical"] -= min(len(chunk), state["logical"])
+                start = state["hunk"]
+                references: List[Optional[int]] = []
+                unique: List[bytes] = []
+                for index in range(len(chunk) // hunk_bytes):
+                    hunk = chunk[index * hunk_bytes:(index + 1) * hunk_bytes]
+                    key = hashlib.sha1(hunk).digest()
+                    reference = seen.get(key)
+                    if reference is None:
+                        seen[key] = start + index
+                        unique.append(hunk)
+                    references.append(reference)
+                state["hunk"] = start + len(references)
+                return start, references, unique
+
+            def store(start: int, references: List[Optional[int]], unique: List[bytes], results) -> None:
+                position = out.tell()
+                compressed = iter(zip(unique, results))
+                for index, reference in enumerate(references):
+                    hunk = start + index
+                    if reference is not None:
+                        hunk_map.types[hunk] = COMPRESSION_SELF
+                        hunk_map.offsets[hunk] = reference
+                        continue
+                    data, (codec, payload, crc) = next(compressed)
+                    if codec < 0:
+                        hunk_map.types[hunk] = COMPRESSION_NONE
+                        payload = data
+                    else:
+                        hunk_map.types[hunk] = codec
+                    hunk_map.lengths[hunk] = len(payload)
+                    hunk_map.offsets[hunk] = position
+                    hunk_map.crcs[hunk] = crc
+                    out.write(payload)
+                    position += len(payload)
+                self._report(state["hunk"], hunk_count)
+
+            if executor is None:
+                for chunk in chunks:
+                    if self.should_stop():
+                        raise CompressionStopped()
+                    start, references, unique = plan(chunk)
+                    store(start, references, unique, compress_hunks(codecs, hunk_bytes, unique))
+            else:
+                pending = deque()
+                try:
+                    for chunk in chunks:
+                        if self.should_stop():
+                            raise CompressionStopped()
+                        start, references, unique = plan(chunk)
+                        pending.append((start, references, unique,
+                                        executor.submit(compress_hunks, codecs, hunk_bytes, unique)))
+                        if len(pending) >= max(1, tasks_in_flight):
+                            start, references, unique, future = pending.popleft()
+                            store(start, references, unique, future.result())
+                    while pending:
+                        if self.should_stop():
+                            raise CompressionStopped()
+                        start, references, unique, future = pending.popleft()
+                        store(start, references, unique, future.result())
+                finally:
+                    for *_, future in pending:
+                        future.cancel()
+            if state["hunk"] != hunk_count:
+                raise ChdUnsupportedError("taille des données incohérente")
+
+            map_offset = out.tell()
+            out.write(encode_v5_map(hunk_map, first_offset))
+            raw_digest = raw_sha1.digest()
+            compressors = [int.from_bytes(codec.encode("ascii"), "big") for codec in codecs]
+            compressors += [0] * (4 - len(compressors))
+            header = (CHD_MAGIC + struct.pack(">II", _HEADER_SIZE, 5) + struct.pack(">4I", *compressors)
+                      + struct.pack(">QQQII", logical_bytes, map_offset, meta_offset, hunk_bytes, unit_bytes)
+                      + raw_digest + _overall_sha1(raw_digest, metadata) + bytes(20))
+            out.seek(0)
+            out.write(header)
+
+        # Relecture de l'en-tête, des métadonnées et de la carte (CRC compris)
+        ChdReader(chd_path)
+
+    def _report(self, done: int, total: int):
+        if self.progress:
+            self.progress(100.0 * done / max(1, total))
@@ -0,0 +1,194 @@
+from collections import deque
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .cdrom import FRAME_SIZE, TRACK_DATA_SIZES, msf, swap_16
+from .chd import (
+    CDROM_TRACK_METADATA2_TAG, CDROM_TRACK_METADATA_TAG, DVD_METADATA_TAG, GDROM_TRACK_METADATA_TAG,
+    ChdReader, ChdUnsupportedError, decode_hunks,
+)
+
+# Extraction native des CHD (équivalent de chdman extractdvd / extractcd en sortie CUE):
+# la carte des hunks est décodée une fois, puis les hunks sont décompressés par lots dans un
+# pool de processus et écrits dans l'ordre, par gros blocs séquentiels.
+
+_TASK_BYTES = 4 * 1024 * 1024  # Données décodées par tâche envoyée au pool
+_CD_TRACK_TAGS = (CDROM_TRACK_METADATA2_TAG, CDROM_TRACK_METADATA_TAG, GDROM_TRACK_METADATA_TAG)
+_TRACK_PADDING = 4  # Les pistes d'un CHD CD commencent sur un multiple de 4 trames
+
+
+class ExtractionStopped(Exception):
+    """Arrêt demandé pendant une extraction native."""
+
+
+class _CdTrack:
+    __slots__ = ("number", "type", "data_size", "frames", "pad_frames", "pregap", "pregap_in_file",
+                 "postgap", "chd_start")
+
+    def __init__(self, fields: dict, chd_start: int):
+        self.number = int(fields.get("track", 0))
+        self.type = str(fields.get("type", ""))
+        if self.type not in TRACK_DATA_SIZES:
+            raise ChdUnsupportedError(f"type de piste {self.type or '?'}")
+        self.data_size = TRACK_DATA_SIZES[self.type]
+        self.frames = int(fields.get("frames", 0))
+        self.pad_frames = int(fields.get("pad", 0))
+        self.pregap = int(fields.get("pregap", 0))
+        self.pregap_in_file = str(fields.get("pgtype", "")).startswith("V")
+        self.postgap = int(fields.get("postgap", 0))
+        self.chd_start = chd_start
+
+    @property
+    def output_frames(self) -> int:
+        return self.frames - self.pad_frames
+
+    def cue_lines(self, bin_name: str, frame_offset: int) -> List[str]:
+        """Lignes CUE de la piste, au format de chdman extractcd."""
+        lines = [f'FILE "{bin_name}" BINARY'] if self.number == 1 else []
+        if self.type.startswith("MODE1"):
+            mode = f"MODE1/{self.data_size:04d}"
+        elif self.type.startswith("MODE2"):
+            mode = f"MODE2/{self.data_size:04d}"
+        else:
+            mode = "AUDIO"
+        lines.append(f"  TRACK {self.number:02d} {mode}")
+        if self.pregap and not self.pregap_in_file:
+            lines.append(f"    PREGAP {msf(self.pregap)}")
+            lines.append(f"    INDEX 01 {msf(frame_offset)}")
+        elif self.pregap:
+            lines.append(f"    INDEX 00 {msf(frame_offset)}")
+            lines.append(f"    INDEX 01 {msf(frame_offset + self.pregap)}")
+        else:
+            lines.append(f"    INDEX 01 {msf(frame_offset)}")
+        if self.postgap:
+            lines.append(f"    POSTGAP {msf(self.postgap)}")
+        return lines
+
+
+class ChdExtractor:
+    """Extraction d'un CHD v5 sans chdman.
+
+    Lève ChdUnsupportedError (codec FLAC, CHD parent, ancienne version...) ou ChdFormatError
+    dès l'ouverture ou pendant le décodage: l'appelant se replie alors sur chdman.
+    """
+
+    def __init__(self, chd_path: Path, should_stop: Callable[[], bool] = lambda: False,
+                 progress: Optional[Callable[[float], None]] = None):
+        self.reader = ChdReader(chd_path)
+        reason = self.reader.unsupported_reason()
+        if reason:
+            raise ChdUnsupportedError(reason)
+        self.info = self.reader.info
+        self.should_stop = should_stop
+        self.progress = progress
+
+    def _decoded_chunks(self, hunk_count: int, executor: Optional[Executor],
+                        tasks_in_flight: int) -> Iterator[Tuple[int, bytes]]:
+        """(premier hunk, données) des lots de hunks décodés, dans l'ordre du fichier.
+
+        Avec un pool, au plus tasks_in_flight lots sont en cours de décodage à la fois.
+        """
+        reader = self.reader
+        per_task = max(1, _TASK_BYTES // self.info.hunk_bytes)
+        starts = range(0, hunk_count, per_task)
+        if executor is None or len(starts) < 2:
+            for index, start in enumerate(starts):
+                if self.should_stop():
+                    raise ExtractionStopped()
+                yield start, reader.read_hunks(start, min(per_task, hunk_count - start))
+                self._report(index + 1, len(starts))
+            return
+
+        path, codecs = str(self.info.path), self.info.compressors
+        pending = deque()
+        done = 0
+        try:
+            for start in starts:
+                pending.append((start, executor.submit(
+                    decode_hunks, path, codecs, self.info.hunk_bytes,
+                    reader.entries(start, min(per_task, hunk_count - start)), reader.map.verify_crc,
+                )))
+                if len(pending) < max(1, tasks_in_flight):
+                    continue
+                start, future = pending.popleft()
+                yield start, future.result()
+                done += 1
+                self._report(done, len(starts))
+                if self.should_stop():
+                    raise ExtractionStopped()
+            while pending:
+                start, future = pending.popleft()
+                yield start, future.result()
+                done += 1
+                self._report(done, len(starts))
+                if self.should_stop():
+                    raise ExtractionStopped()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _report(self, done: int, total: int):
+        if self.progress:
+            self.progress(100.0 * done / total)
+
+    def extract_iso(self, iso_path: Path, executor: Optional[Executor] = None, tasks_in_flight: int = 1) -> None:
+        """Équivalent de chdman extractdvd: les données logiques du CHD, telles quelles."""
+        if self.info.kind not in ("DVD", "?"):
+            raise ChdUnsupportedError(f"CHD {self.info.kind} vers ISO")
+        remaining = self.info.logical_size
+        with open(iso_path, "wb") as out:
+            for _, data in self._decoded_chunks(self.info.hunk_count, executor, tasks_in_flight):
+                out.write(data[:remaining] if len(data) > remaining else data)
+                remaining -= min(len(data), remaining)
+
+    def cd_tracks(self) -> List[_CdTrack]:
+        tags = [m.tag for m in self.info.metadata]
+        if DVD_METADATA_TAG in tags or not any(tag in _CD_TRACK_TAGS for tag in tags):
+            raise ChdUnsupportedError("métadonnées de pistes CD absentes")
+        if self.info.unit_bytes != FRAME_SIZE or self.info.hunk_bytes % FRAME_SIZE:
+            raise ChdUnsupportedError("géométrie CD inattendue")
+        tracks = []
+        chd_frame = 0
+        for fields in self.info.tracks:
+            track = _CdTrack(fields, chd_frame)
+            tracks.append(track)
+            chd_frame += (track.frames + _TRACK_PADDING - 1) // _TRACK_PADDING * _TRACK_PADDING
+        if not tracks or [t.number for t in tracks] != list(range(1, len(tracks) + 1)):
+            raise ChdUnsupportedError("numérotation des pistes inattendue")
+        return tracks
+
+    def extract_cue(self, cue_path: Path, executor: Optional[Executor] = None, tasks_in_flight: int = 1) -> Path:
+        """Équivalent de chdman extractcd: un BIN unique et sa fiche CUE. Renvoie le BIN."""
+        tracks = self.cd_tracks()
+        bin_path = cue_path.with_suffix(".bin")
+        frames_per_hunk = self.info.hunk_bytes // FRAME_SIZE
+        last = tracks[-1]
+        hunk_count = min(self.info.hunk_count, -(-(last.chd_start + last.output_frames) // frames_per_hunk))
+
+        cue_lines = []
+        frame_offset = 0
+        for track in tracks:
+            cue_lines.extend(track.cue_lines(bin_path.name, frame_offset))
+            frame_offset += track.frames  # Les trames de bourrage GD-ROM comptent, comme chez chdman
+
+        segments = [t for t in tracks if t.output_frames > 0]
+        with open(bin_path, "wb") as out:
+            for start, data in self._decoded_chunks(hunk_count, executor, tasks_in_flight):
+                first = start * frames_per_hunk
+                end = first + len(data) // FRAME_SIZE
+                view = memoryview(data)
+                for track in segments:
+                    lo = max(first, track.chd_start)
+                    hi = min(end, track.chd_start + track.output_frames)
+                    if lo >= hi:
+                        continue
+                    size = track.data_size
+                    chunk = b"".join([
+                        view[(frame - first) * FRAME_SIZE:(frame - first) * FRAME_SIZE + size]
+                        for frame in range(lo, hi)
+                    ])
+                    out.write(swap_16(chunk) if track.type == "AUDIO" else chunk)
+        with open(cue_path, "w", encoding="utf-8", newline="\n") as cue:
+            cue.write("\n".join(cue_lines) + "\n")
+        return bin_path
@@ -1,96 +1,481 @@
-from .base import ConversionHandler
+from .base import ConversionHandler, DescriptorError, DescriptorSheet, read_descriptor
+from .chd import ChdFormatError, ChdUnsupportedError, read_chd_info
+from .naming import disc_number, disc_set_name, is_revision, title_key
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import os
+import shutil
+
+# Type de disque d'une source, pour ne grouper que des CHD compatibles (parent et enfants)
+_SOURCE_KINDS = {".iso": "DVD", ".cue": "CD", ".gdi": "CD", ".ecm": "CD"}
+_SOURCE_EXTENSIONS = [".iso", ".cue", ".gdi", ".ecm"]
+
+
+def chd_stem(input_file: Path) -> str:
+    """Nom du CHD d'une source, sans extension ('Jeu.bin.ecm' -> 'Jeu')."""
+    input_file = Path(input_file)
+    if input_file.suffix.lower() == ".ecm":
+        return Path(input_file.stem).stem
+    return input_file.stem
+
+
+class _DiscSet:
+    """Disques d'un même jeu dans le lot: sources encore en cours et CHD obtenus (playlist M3U)."""
+    __slots__ = ("name", "pending", "chds", "incomplete")
+
+    def __init__(self, name: str):
+        self.name = name                 # Nom du jeu sans étiquette de disque = nom du .m3u
+        self.pending: Set[Path] = set()
+        self.chds: List[Path] = []
+        self.incomplete = False
+
 
 class ChdV5Handler(ConversionHandler):
     """Handler unifié ISO/CUE/GDI > CHD :
     - .cue  => createcd
     - .iso  => createdvd
     - .gdi  => createcd
-    Détection automatique selon l'extension, un seul bouton dans l'UI."""
+    - .ecm  => décodé (handlers/ecm.py) puis createcd
+    Détection automatique selon l'extension, un seul bouton dans l'UI.
+
+    Les pistes ECM (Jeu.bin.ecm), seules ou référencées par un CUE/GDI sous leur nom décodé,
+    sont décodées dans un dossier temporaire du job, supprimé dès que le CHD est créé.
+
+    Avec chd_backend = "native", les ISO et CUE/BIN sont compressés sans chdman (hunks
+    compressés en parallèle dans le pool de processus); chdman reste le repli (GDI, WAVE...).
+
+    Avec sector_check = "report" ou "exclude", les secteurs des pistes de données d'un CUE/GDI
+    (sync, en-tête, MSF, EDC, ECC) sont contrôlés avant la création (handlers/sector_check.py);
+    les erreurs par piste sont rendues dans les résultats, et "exclude" écarte les disques fautifs.
+
+    Les disques d'un même jeu ('(Disc 1)', '(Disc 2)'...) sont regroupés à la découverte et
+    lancés ensemble; la playlist .m3u du jeu est écrite dans la destination dès que son dernier
+    disque est terminé, sans attendre la fin du lot.
+
+    Codecs et taille de hunk viennent du profil de compression (cibles chd_cd et chd_dvd,
+    handlers/profiles.py); sans réglage, ce sont ceux de chdman.
+
+    Avec parent_chds, les révisions et variantes régionales d'un même disque (même titre
+    normalisé) sont créées comme CHD enfants d'un parent du groupe (chdman --outputparent):
+    les parents d'abord, puis les enfants en parallèle."""
+    compression_family = "chd"
+
+    def __init__(self, tools_path=None, log_callback=None, progress_callback=None):
+        super().__init__(tools_path, log_callback, progress_callback)
+        self.chd_backend = "chdman"
+        self.parent_chds = False
+        self.sector_check = "off"  # "off" | "report" | "exclude"
+        self._sector_reports: Dict[str, dict] = {}  # disque -> pistes en erreur
+        self._checked_discs: List[str] = []
+        self._chd_parents: Dict[Tuple[str, Tuple[str, int]], Path] = {}  # (type, titre) -> CHD parent
+        self._disc_sets: Dict[Path, _DiscSet] = {}  # source -> jeu multi-disques
+        self._playlists: List[str] = []
+
+    def archive_member_extensions(self) -> Set[str]:
+        return set(_SOURCE_EXTENSIONS)
+
+    def job_outputs(self, input_file: Path) -> List[Path]:
+        return [Path(self.dest_folder) / f"{chd_stem(input_file)}.chd"]
+
+    def _archive_inputs(self, extracted_folder: Path) -> List[Path]:
+        # Non récursif: uniquement fichiers directement extraits au premier niveau
+        return self._without_ecm_tracks([
+            item for item in extracted_folder.iterdir()
+            if item.is_file() and item.suffix.lower() in _SOURCE_EXTENSIONS
+        ])
+
+    def _without_ecm_tracks(self, files: List[Path]) -> List[Path]:
+        """Retire les .ecm déjà référencés par un CUE/GDI du même dossier (décodés avec lui)."""
+        tracks = set()
+        for item in files:
+            if item.suffix.lower() in (".cue", ".gdi"):
+                try:
+                    sheet = read_descriptor(item, strict=False)
+                except (OSError, DescriptorError):
+                    continue
+                tracks.update(path.resolve() for path in sheet.files if path.suffix.lower() == ".ecm")
+        return [item for item in files if item.suffix.lower() != ".ecm" or item.resolve() not in tracks]
+
+    def _ecm_tracks(self, sheet: DescriptorSheet) -> List[Tuple[str, Path]]:
+        """Pistes d'un CUE/GDI absentes sous leur nom mais présentes en .ecm: [(nom, fichier ECM)]."""
+        tracks = {}
+        for track in sheet.tracks:
+            if track.path.suffix.lower() == ".ecm" and not track.name.lower().endswith(".ecm"):
+                tracks.setdefault(track.name, track.path)
+        return list(tracks.items())
+
+    def _decode_ecm(self, ecm_file: Path, target: Path) -> bool:
+        from .ecm import EcmFormatError, EcmStopped, decode_ecm
+
+        report_progress = self.max_jobs <= 1
+        self.log(f"🧩 Décodage ECM : {ecm_file.name} → {target.name}")
+        try:
+            decode_ecm(
+                ecm_file, target,
+                should_stop=lambda: self.should_stop,
+                progress=(lambda p: self.progress(p, f"ECM {ecm_file.name}: {p:.1f}%")) if report_progress else None,
+            )
+            return True
+        except EcmStopped:
+            return False
+        except (OSError, EcmFormatError) as e:
+            self.log(f"❌ Décodage ECM impossible ({ecm_file.name}) : {e}")
+            return False
+
+    def _link_track(self, track: Path, target: Path):
+        """Piste non compressée placée à côté des pistes décodées (lien, sinon copie)."""
+        try:
+            os.link(track, target)
+        except OSError:
+            shutil.copyfile(track, target)
+
+    def _prepare_ecm_input(self, input_file: Path, workspace: Path, sheet: Optional[DescriptorSheet]) -> Optional[Path]:
+        """Décode les pistes ECM d'une source dans workspace; renvoie le fichier à convertir."""
+        try:
+            from .ecm import ecm_target_name
+        except ImportError as e:  # numpy absent
+            self.log(f"❌ Décodage ECM indisponible (module {e.name} manquant) : {input_file.name}")
+            return None
+        from .cdrom import SYNC_HEADER
+
+        if sheet is not None:
+            decoded = dict(self._ecm_tracks(sheet))
+            for track in sheet.tracks:
+                target = workspace / track.name
+                if target.exists():
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if track.name in decoded:
+                    if not self._decode_ecm(decoded[track.name], target):
+                        return None
+                else:
+                    self._link_track(track.path, target)
+            shutil.copyfile(input_file, workspace / input_file.name)
+            return workspace / input_file.name
+
+        target = workspace / ecm_target_name(input_file)
+        if not self._decode_ecm(input_file, target):
+            return None
+        if target.suffix.lower() == ".iso":
+            return target
+        # Piste seule sans fiche: type déduit de l'en-tête du premier secteur
+        with open(target, "rb") as decoded_file:
+            header = decoded_file.read(16)
+        if len(header) < 16 or header[:12] != SYNC_HEADER or header[15] not in (1, 2):
+            self.log(f"❌ Type de piste indéterminé (pas d'en-tête de secteur) : {target.name}")
+            return None
+        cue_file = workspace / f"{chd_stem(input_file)}.cue"
+        cue_file.write_text(
+            f'FILE "{target.name}" BINARY\n  TRACK 01 MODE{header[15]}/2352\n    INDEX 01 00:00:00\n',
+            encoding="utf-8",
+        )
+        return cue_file
+
+    def _remove_ecm_workspace(self, workspace: Path):
+        try:
+            shutil.rmtree(workspace)
+            self.log(f"🧹 Pistes ECM décodées supprimées: {workspace.name}")
+            if workspace.parent.name == "TEMP":
+                workspace.parent.rmdir()
+        except OSError:
+            pass
+
+    def _check_sectors(self, input_file: Path, tool_input: Path) -> bool:
+        """Contrôle des secteurs avant création; False si le disque est écarté du lot."""
+        if self.sector_check not in ("report", "exclude") or tool_input.suffix.lower() not in (".cue", ".gdi"):
+            return True
+        try:
+            from .sector_check import SectorCheckStopped, check_descriptor
+        except ImportError as e:  # numpy absent
+            self.log(f"⚠️ Contrôle des secteurs indisponible (module {e.name} manquant)")
+            return True
+
+        report_progress = self.max_jobs <= 1
+        self.log(f"🔍 Contrôle des secteurs : {input_file.name}")
+        try:
+            reports = check_descriptor(
+                tool_input,
+                should_stop=lambda: self.should_stop,
+                progress=(lambda p: self.progress(p, f"Contrôle {input_file.name}: {p:.1f}%")) if report_progress else None,
+            )
+        except SectorCheckStopped:
+            return False
+        except (OSError, ValueError) as e:
+            self.log(f"⚠️ Contrôle des secteurs impossible ({input_file.name}) : {e}")
+            return self.sector_check != "exclude"
+        self._checked_discs.append(input_file.name)
+        failing = [report for report in reports if not report.ok]
+        if not failing:
+            self.log(f"✅ Secteurs valides ({sum(r.sectors for r in reports)}) : {input_file.name}")
+            return True
+        self._sector_reports[input_file.name] = {str(report.number): report.to_dict() for report in failing}
+        for report in failing:
+            details = ", ".join(f"{kind} {count}" for kind, count in report.errors.items())
+            self.log(f"⚠️ Piste {report.number} ({report.name}) : {report.bad_sectors} secteur(s) en erreur ({details})")
+        if self.sector_check == "exclude":
+            self.log(f"❌ Disque exclu du lot (secteurs en erreur) : {input_file.name}")
+            return False
+        return True
+
+    def _create_native(self, input_file: Path, chd_file: Path, cmd: str, parent_chd: Optional[Path] = None,
+                       sheet: Optional[DescriptorSheet] = None) -> Optional[bool]:
+        """Création sans chdman: True/False, ou None pour laisser la main à chdman.
+
+        sheet: fiche CUE déjà lue par _convert_input (relue si absente, ex. pistes ECM décodées).
+        """
+        if self.chd_backend != "native" or input_file.suffix.lower() not in (".iso", ".cue"):
+            return None
+        if parent_chd is not None:
+            self.log(f"ℹ️ CHD enfant : création par chdman ({input_file.name})")
+            return None
+        settings = self.compression_profile.settings("chd_dvd" if cmd == "createdvd" else "chd_cd")
+        if settings.block_size:
+            self.log(f"ℹ️ Taille de hunk du profil : création par chdman ({input_file.name})")
+            return None
+        codecs = settings.codec.split(",") if settings.codec else None
+        from .chd_compress import ChdCompressor, CompressionStopped
+
+        report_progress = self.max_jobs <= 1
+        compressor = ChdCompressor(
+            should_stop=lambda: self.should_stop,
+            progress=(lambda p: self.progress(p, f"{input_file.name}: {p:.1f}%")) if report_progress else None,
+        )
+        job_commands = getattr(self._job_context, "commands", None)
+        if job_commands is not None:
+            job_commands.append(["b2pc", cmd, "-i", str(input_file), "-o", str(chd_file),
+                                 *(["-c", settings.codec] if codecs else [])])
+        pool = self.get_process_pool()
+        tasks_in_flight = 2 * self.threads_per_job()
+        self.log(f"⚡ Compression native ({cmd}, {self.threads_per_job() if pool else 1} processus) : {input_file.name}")
+        try:
+            if cmd == "createdvd":
+                compressor.compress_iso(input_file, chd_file, pool, tasks_in_flight, codecs)
+            else:
+                compressor.compress_cue(input_file, chd_file, pool, tasks_in_flight, codecs, sheet)
+            return True
+        except CompressionStopped:
+            return False
+        except (ChdFormatError, BrokenProcessPool) as e:
+            if isinstance(e, BrokenProcessPool):
+                self.shutdown_process_pool()
+            if isinstance(e, ChdUnsupportedError):
+                self.log(f"ℹ️ Compression native non disponible ({e}), utilisation de chdman")
+            else:
+                self.log(f"⚠️ Compression native interrompue ({input_file.name}), nouvelle tentative avec chdman : {e}")
+            if chd_file.exists():
+                chd_file.unlink()
+            return None
+        except OSError as e:
+            self.log(f"❌ Erreur de compression native ({input_file.name}) : {e}")
+            return False
+
+    def _convert_input(self, input_file: Path, extract_type: Optional[str], parent_chd: Optional[Path] = None) -> Optional[bool]:
+        if self.should_stop:
+            return None
+        dest_path = Path(self.dest_folder)
+        ext = input_file.suffix.lower()
+        chd_file = dest_path / f"{chd_stem(input_file)}.chd"
+        if chd_file.exists():
+            self.log(f"⏭️ Déjà converti : {chd_file.name}")
+            return None
+        if ext not in _SOURCE_EXTENSIONS:
+            self.log(f"⚠️ Extension ignorée: {input_file.name}")
+            return None
+
+        sheet = None
+        if ext in (".cue", ".gdi"):
+            # Fiche vérifiée avant tout outil: lignes, pistes et fichiers référencés
+            try:
+                sheet = read_descriptor(input_file)
+            except (OSError, DescriptorError) as e:
+                self.log(f"❌ Fiche {ext[1:].upper()} invalide ({input_file.name}) : {e}")
+                return False
+
+        if ext == ".ecm" or (sheet is not None and self._ecm_tracks(sheet)):
+            workspace = self._create_temp_workspace("B2PC_ecm_")
+            try:
+                tool_input = self._prepare_ecm_input(input_file, workspace, sheet)
+                if tool_input is None:
+                    self.log(f"❌ Échec : {input_file.name}")
+                    return False
+                return self._create_chd(input_file, tool_input, chd_file, parent_chd)
+            finally:
+                self._remove_ecm_workspace(workspace)
+        return self._create_chd(input_file, input_file, chd_file, parent_chd, sheet)
+
+    def _create_chd(self, input_file: Path, tool_input: Path, chd_file: Path, parent_chd: Optional[Path],
+                    sheet: Optional[DescriptorSheet] = None) -> bool:
+        """Crée chd_file à partir de tool_input (la source, ou sa version décodée) et de sa fiche lue."""
+        if not self._check_sectors(input_file, tool_input):
+            return False
+        cmd = "createdvd" if tool_input.suffix.lower() == ".iso" else "createcd"
+        with self.staged_outputs() as staging:
+            created = self._create_native(tool_input, staging.path / chd_file.name, cmd, parent_chd, sheet)
+            if created is None:
+                if parent_chd is not None:
+                    self.log(f"🔗 chdman {cmd} → {chd_file.name} (parent : {parent_chd.name})")
+                else:
+                    self.log(f"🔧 chdman {cmd} → {chd_file.name}")
+                args = [
+                    cmd,
+                    "-i", str(tool_input),
+                    "-o", str(staging.path / chd_file.name),
+                    *(["-op", str(parent_chd)] if parent_chd is not None else []),
+                    *self.tool_compression_args("chdman.exe", "chd_dvd" if cmd == "createdvd" else "chd_cd")
+                ]
+                created = self.run_tool("chdman.exe", args, show_output=True)
+            if created:
+                staging.commit()
+                self.log(f"✅ OK : {input_file.name} → {chd_file.name}")
+                return True
+        self.log(f"❌ Échec : {input_file.name}")
+        return False
+
+    def _parent_key(self, name: str, kind: Optional[str]) -> Tuple[str, Tuple[str, int]]:
+        return kind or "?", title_key(name)
+
+    def _plan_disc_sets(self, source_files: List[tuple]) -> Dict[Path, _DiscSet]:
+        """Regroupe les sources '(Disc N)' d'un même jeu; seuls les jeux d'au moins deux disques comptent."""
+        sets: Dict[str, _DiscSet] = {}
+        for source_item, _ in source_files:
+            path = Path(source_item)
+            name = disc_set_name(chd_stem(path))
+            if name is not None:
+                sets.setdefault(name.casefold(), _DiscSet(name)).pending.add(path)
+        by_source = {}
+        for disc_set in sets.values():
+            if len({disc_number(path.name) for path in disc_set.pending}) > 1:
+                by_source.update(dict.fromkeys(disc_set.pending, disc_set))
+        return by_source
+
+    def job_group(self, source_path: Path) -> Optional[str]:
+        disc_set = self._disc_sets.get(Path(source_path))
+        return disc_set.name.casefold() if disc_set else None
+
+    def source_finished(self, source_path: Path, inputs: List[Path]):
+        disc_set = self._disc_sets.get(Path(source_path))
+        if disc_set is None or source_path not in disc_set.pending:
+            return
+        disc_set.pending.discard(source_path)
+        outputs = [output for item in (inputs or [source_path]) for output in self.job_outputs(item)]
+        if outputs and all(output.exists() for output in outputs):
+            disc_set.chds.extend(outputs)
+        else:
+            disc_set.incomplete = True
+        if disc_set.pending:
+            return
+        if disc_set.incomplete:
+            self.log(f"⚠️ Playlist M3U non créée, disque manquant : {disc_set.name}")
+        else:
+            self._write_playlist(disc_set)
+
+    def _write_playlist(self, disc_set: _DiscSet):
+        """Écrit <jeu>.m3u (un CHD par ligne, par numéro de disque) via un fichier temporaire."""
+        playlist = Path(self.dest_folder) / f"{disc_set.name}.m3u"
+        chds = sorted(set(disc_set.chds), key=lambda chd: (disc_number(chd.name) or 0, chd.name.lower()))
+        temp = playlist.with_name(f".{playlist.name}.tmp")
+        try:
+            temp.write_text("".join(f"{chd.name}\n" for chd in chds), encoding="utf-8")
+            os.replace(temp, playlist)
+        except OSError as e:
+            self.log(f"⚠️ Écriture de la playlist impossible ({playlist.name}) : {e}")
+            temp.unlink(missing_ok=True)
+            return
+        self._playlists.append(playlist.name)
+        self.log(f"🎵 Playlist M3U créée : {playlist.name} ({len(chds)} disques)")
+
+    def _plan_parent_groups(self, source_files: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+        """Sépare les sources en (parents et sources isolées, enfants).
+
+        Le parent d'un groupe est la première variante sans révision, par ordre de nom.
+        """
+        groups: Dict[Tuple[str, Tuple[str, int]], List[tuple]] = {}
+        for source_item, extract_type in source_files:
+            path = Path(source_item)
+            kind = _SOURCE_KINDS.get(path.suffix.lower()) if extract_type is None else None
+            groups.setdefault(self._parent_key(chd_stem(path), kind), []).append((source_item, extract_type))
+        first, children = [], []
+        for key, members in groups.items():
+            members.sort(key=lambda item: (is_revision(chd_stem(item[0])), Path(item[0]).name.lower()))
+            first.append(members[0])
+            children.extend(members[1:])
+            parent_path, parent_type = Path(members[0][0]), members[0][1]
+            if len(members) > 1 and parent_type is None:
+                # Parent déjà converti lors d'un lancement précédent (le journal peut l'ignorer)
+                existing = Path(self.dest_folder) / f"{chd_stem(parent_path)}.chd"
+                if existing.exists():
+                    self._chd_parents[key] = existing
+        return first, children
+
+    def _convert_parent(self, input_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        result = self._convert_input(input_file, extract_type)
+        chd_file = Path(self.dest_folder) / f"{chd_stem(input_file)}.chd"
+        if result is not False and chd_file.exists():
+            kind = _SOURCE_KINDS.get(input_file.suffix.lower())
+            self._chd_parents.setdefault(self._parent_key(chd_stem(input_file), kind), chd_file)
+        return result
+
+    def _convert_child(self, input_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        kind = _SOURCE_KINDS.get(input_file.suffix.lower())
+        parent = self._chd_parents.get(self._parent_key(chd_stem(input_file), kind))
+        if parent is not None:
+            try:
+                parent_kind = read_chd_info(parent).disc_type
+            except (OSError, ChdFormatError) as e:
+                self.log(f"⚠️ CHD parent illisible ({parent.name}) : {e}")
+                parent = None
+            else:
+                if parent_kind != kind:
+                    parent = None
+        if parent is None:
+            self.log(f"ℹ️ Pas de CHD parent disponible pour {input_file.name}, CHD autonome")
+        return self._convert_input(input_file, extract_type, parent)
 
     def convert(self) -> dict:
         dest_path = Path(self.dest_folder)
         dest_path.mkdir(exist_ok=True)
         try:
             # Récupérer sources mixtes (ISO + CUE + GDI) + archives (détection unique)
-            source_files = self.get_multiple_source_files([".iso", ".cue", ".gdi"])
-            self.log(f"📁 Sources détectées : {len(source_files)} (.iso / .cue / .gdi / archives)")
-
-            converted = 0
-            errors = 0
-
-            for i, (source_item, extract_type) in enumerate(source_files):
-                if self.check_should_stop():
-                    break
-                self.progress((i / max(1, len(source_files))) * 100, f"Traitement {i+1}/{len(source_files)}")
-
-                # Déterminer les fichiers à traiter (direct ou après extraction)
-                if extract_type is None:
-                    input_files = [source_item]
-                    self.log(f"📄 Fichier: {source_item.name}")
-                elif extract_type == "archive":
-                    self.log(f"📦 Extraction archive: {source_item.name}")
-                    try:
-                        extracted_folder = self.extract_single_archive(source_item)
-                        # Non récursif: uniquement fichiers directement extraits au premier niveau
-                        input_files = []
-                        for item in extracted_folder.iterdir():
-                            if item.is_file() and item.suffix.lower() in (".iso", ".cue", ".gdi"):
-                                input_files.append(item)
-                        self.log(f"🗂️ Trouvé {len(input_files)} fichiers exploitables dans l'archive")
-                    except Exception as e:
-                        self.log(f"❌ Échec extraction {source_item.name}: {e}")
-                        errors += 1
-                        continue
-                else:
-                    continue  # Type inconnu
-
-                # Parcourir chaque fichier trouvé
-                for input_file in input_files:
-                    if self.check_should_stop():
-                        break
-                    ext = input_file.suffix.lower()
-                    chd_file = dest_path / f"{input_file.stem}.chd"
-                    if chd_file.exists():
-                        self.log(f"⏭️ Déjà converti : {chd_file.name}")
-                        continue
-
-                    if ext == ".cue":
-                        cmd = "createcd"
-                    elif ext == ".iso":
-                        cmd = "createdvd"
-                    elif ext == ".gdi":
-                        cmd = "createcd"
-                    else:
-                        self.log(f"⚠️ Extension ignorée: {input_file.name}")
-                        continue
-
-                    args = [
-                        cmd,
-                        "-i", str(input_file),
-                        "-o", str(chd_file)
-                    ]
-                    self.log(f"🔧 chdman {cmd} → {chd_file.name}")
-                    if self.run_tool("chdman.exe", args, show_output=True):
-                        converted += 1
-                        self.log(f"✅ OK : {input_file.name} → {chd_file.name}")
-                        if extract_type is None:
-                            self.delete_source_after_success(input_file)
-                    else:
-                        errors += 1
-                        self.log(f"❌ Échec : {input_file.name}")
-
-                if self.check_should_stop():
-                    break
+            source_files = self.get_multiple_source_files(_SOURCE_EXTENSIONS)
+            direct = self._without_ecm_tracks([Path(item) for item, extract_type in source_files if extract_type is None])
+            source_files = [item for item in source_files if item[1] is not None or Path(item[0]) in direct]
+            self.log(f"📁 Sources détectées : {len(source_files)} (.iso / .cue / .gdi / .ecm / archives)")
+            self._sector_reports, self._checked_discs = {}, []
+            self._disc_sets, self._playlists = self._plan_disc_sets(source_files), []
+            self.log_compression_profile()
+            if self._disc_sets:
+                games = len({id(disc_set) for disc_set in self._disc_sets.values()})
+                self.log(f"💿 {games} jeu(x) multi-disques : playlist M3U écrite à la fin de chaque jeu")
+
+            if self.parent_chds:
+                self._chd_parents = {}
+                first, children = self._plan_parent_groups(source_files)
+                self.log(f"🔗 CHD parent/enfant : {len(source_files) - len(children)} parent(s) ou isolé(s), {len(children)} enfant(s)")
+                converted, errors = self.run_batch(first, self._archive_inputs, self._convert_parent)
+                if children and not self.should_stop:
+                    self.log("⚠️ Les CHD enfants ne sont lisibles qu'avec leur CHD parent : gardez-les ensemble")
+                    done, failed = self.run_batch(children, self._archive_inputs, self._convert_child)
+                    converted, errors = converted + done, errors + failed
+            else:
+                converted, errors = self.run_batch(source_files, self._archive_inputs, self._convert_input)
 
             if self.should_stop:
                 self.log("🛑 Conversion arrêtée par l'utilisateur")
 
-            return {
+            results = {
                 "converted_games": converted,
                 "error_count": errors,
                 "total_files": len(source_files),
-                "stopped": self.should_stop
+                "stopped": self.should_stop,
+                "playlists": list(self._playlists),
+                "compression_profile": self.compression_report(),
             }
+            if self.sector_check in ("report", "exclude"):
+                if self._sector_reports:
+                    self.log(f"⚠️ Secteurs en erreur sur {len(self._sector_reports)} disque(s) / {len(self._checked_discs)} contrôlé(s)")
+                results["checked_discs"] = len(self._checked_discs)
+                results["sector_errors"] = dict(self._sector_reports)
+            return results
         finally:
             self.cleanup_temp_folder()
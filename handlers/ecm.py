@@ -0,0 +1,186 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cdrom import SECTOR_SIZE, SYNC_HEADER
+from .sectors import ecc_generate_batch, edc_many, edc_shift, edc_shift_many, edc_update, store_edc
+
+# Décodage natif des fichiers ECM (format de Neill Corlett, `ecm`/`unecm`): l'ECM retire des
+# secteurs bruts tout ce qui se recalcule (synchronisation, EDC, ECC, en-tête Mode 2 répété).
+# Le fichier est une suite d'enregistrements (type, nombre):
+#   0: octets bruts copiés tels quels
+#   1: secteurs Mode 1 (adresse + 2048 octets)          -> secteur complet de 2352 octets
+#   2: secteurs Mode 2 Form 1 (sous-en-tête + 2048)     -> 2336 octets (sans sync ni en-tête)
+#   3: secteurs Mode 2 Form 2 (sous-en-tête + 2324)     -> 2336 octets
+# En Mode 2, la synchronisation et l'en-tête restent en octets bruts: un enregistrement de
+# 16 octets puis un secteur, en alternance. Les secteurs sont donc regroupés par lots, tous
+# enregistrements confondus, et reconstruits ensemble (handlers/sectors.py).
+
+ECM_MAGIC = b"ECM\x00"
+_END_OF_RECORDS = 0xFFFFFFFF
+_RECORD_SIZES: Dict[int, int] = {1: 0x803, 2: 0x804, 3: 0x918}
+_BATCH_SECTORS = 1024
+_RAW_CHUNK = 4 * 1024 * 1024
+_READ_BUFFER = 4 * 1024 * 1024
+
+
+class EcmFormatError(ValueError):
+    """Fichier ECM illisible, tronqué ou dont la somme de contrôle ne correspond pas."""
+
+
+class EcmStopped(Exception):
+    """Arrêt demandé pendant un décodage ECM."""
+
+
+def ecm_target_name(ecm_path: Path) -> str:
+    """Nom du fichier décodé: 'Jeu.bin.ecm' -> 'Jeu.bin'."""
+    name = Path(ecm_path).name
+    return name[:-4] if name.lower().endswith(".ecm") else f"{name}.bin"
+
+
+def _read_exact(src, size: int) -> bytes:
+    data = src.read(size)
+    if len(data) != size:
+        raise EcmFormatError("fichier ECM tronqué")
+    return data
+
+
+def _read_record_header(src) -> Tuple[int, int]:
+    """(type, nombre) du prochain enregistrement; nombre 0 pour la fin des enregistrements."""
+    c = _read_exact(src, 1)[0]
+    kind = c & 3
+    count = (c >> 2) & 0x1F
+    bits = 5
+    while c & 0x80:
+        if bits > 32:
+            raise EcmFormatError("en-tête d'enregistrement ECM invalide")
+        c = _read_exact(src, 1)[0]
+        count |= (c & 0x7F) << bits
+        bits += 7
+    if count == _END_OF_RECORDS:
+        return kind, 0
+    count += 1
+    if count >= 0x80000000:
+        raise EcmFormatError("en-tête d'enregistrement ECM invalide")
+    return kind, count
+
+
+def _rebuild_sectors(kind: int, payload: bytes, count: int) -> Tuple[np.ndarray, List[int]]:
+    """Secteurs reconstruits (tels qu'écrits dans le BIN) et EDC de chacun, pour la somme finale."""
+    data = np.frombuffer(payload, dtype=np.uint8).reshape(count, _RECORD_SIZES[kind])
+    sectors = np.zeros((count, SECTOR_SIZE), dtype=np.uint8)
+    sectors[:, :12] = np.frombuffer(SYNC_HEADER, dtype=np.uint8)
+    if kind == 1:
+        sectors[:, 12:15] = data[:, :3]
+        sectors[:, 15] = 1
+        sectors[:, 16:0x810] = data[:, 3:]
+        edcs = store_edc(sectors, 0, 0x810)
+        ecc_generate_batch(sectors)
+        output, edc_end = sectors, 0x810
+    else:
+        # Mode 2: sous-en-tête présent deux fois, adresse comptée nulle dans l'ECC
+        sectors[:, 15] = 2
+        sectors[:, 0x14:0x14 + data.shape[1]] = data
+        sectors[:, 0x10:0x14] = data[:, :4]
+        edc_end = 0x818 if kind == 2 else 0x92C
+        edcs = store_edc(sectors, 0x10, edc_end)
+        if kind == 2:
+            ecc_generate_batch(sectors)
+        output = sectors[:, 0x10:]
+    # EDC de chaque secteur écrit = EDC déjà calculé prolongé par les octets qui le suivent
+    row_edcs = edc_shift_many(edcs, SECTOR_SIZE - edc_end) ^ edc_many(sectors[:, edc_end:])
+    return np.ascontiguousarray(output), row_edcs.tolist()
+
+
+class _EcmBatch:
+    """Morceaux décodés en attente d'écriture, dans l'ordre du fichier."""
+
+    def __init__(self):
+        self.pieces: List[tuple] = []  # (0, octets) | (type, charge utile, nombre)
+        self.sectors = 0
+        self.raw_bytes = 0
+
+    def add(self, kind: int, payload: bytes, count: int = 0):
+        self.pieces.append((kind, payload, count))
+        if kind:
+            self.sectors += count
+        else:
+            self.raw_bytes += len(payload)
+
+    def full(self) -> bool:
+        return self.sectors >= _BATCH_SECTORS or self.raw_bytes >= _RAW_CHUNK
+
+    def write(self, out, edc: int) -> Tuple[int, int]:
+        """Reconstruit les secteurs par type, écrit le lot; renvoie (EDC courant, octets écrits)."""
+        rebuilt: Dict[int, Tuple[memoryview, List[int], int]] = {}
+        for kind in {piece[0] for piece in self.pieces if piece[0]}:
+            pieces = [piece for piece in self.pieces if piece[0] == kind]
+            count = sum(piece[2] for piece in pieces)
+            sectors, row_edcs = _rebuild_sectors(kind, b"".join(piece[1] for piece in pieces), count)
+            rebuilt[kind] = (memoryview(sectors).cast("B"), row_edcs, sectors.shape[1])
+        positions = dict.fromkeys(rebuilt, 0)
+        chunks = []
+        for kind, payload, count in self.pieces:
+            if not kind:
+                chunks.append(payload)
+                edc = edc_update(edc, payload)
+                continue
+            view, row_edcs, size = rebuilt[kind]
+            first = positions[kind]
+            positions[kind] = first + count
+            chunks.append(view[first * size:(first + count) * size])
+            for row_edc in row_edcs[first:first + count]:
+                edc = edc_shift(edc, size) ^ row_edc
+        data = b"".join(chunks)
+        out.write(data)
+        self.pieces, self.sectors, self.raw_bytes = [], 0, 0
+        return edc, len(data)
+
+
+def decode_ecm(
+    source: Path,
+    target: Path,
+    should_stop: Optional[Callable[[], bool]] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> int:
+    """Décode source (.ecm) vers target, en flux; renvoie la taille écrite.
+
+    Lève EcmFormatError si le fichier est invalide ou si la somme de contrôle finale (EDC de
+    toute la sortie) ne correspond pas, EcmStopped si should_stop() devient vrai.
+    """
+    total = max(1, Path(source).stat().st_size)
+    edc = 0
+    written = 0
+    batch = _EcmBatch()
+    with open(source, "rb", buffering=_READ_BUFFER) as src, open(target, "wb") as out:
+        if src.read(4) != ECM_MAGIC:
+            raise EcmFormatError("signature ECM absente")
+
+        def flush():
+            nonlocal edc, written
+            if should_stop and should_stop():
+                raise EcmStopped()
+            edc, size = batch.write(out, edc)
+            written += size
+            if progress:
+                progress(src.tell() * 100 / total)
+
+        while True:
+            kind, count = _read_record_header(src)
+            if not count:
+                break
+            while count:
+                if kind:
+                    step = min(count, _BATCH_SECTORS - batch.sectors)
+                    batch.add(kind, _read_exact(src, step * _RECORD_SIZES[kind]), step)
+                else:
+                    step = min(count, _RAW_CHUNK)
+                    batch.add(0, _read_exact(src, step))
+                count -= step
+                if batch.full():
+                    flush()
+        flush()
+        if int.from_bytes(_read_exact(src, 4), "little") != edc:
+            raise EcmFormatError("somme de contrôle ECM incorrecte")
+    return written
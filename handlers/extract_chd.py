@@ -1,11 +1,111 @@
 from .base import ConversionHandler
+from .chd import ChdFormatError, ChdUnsupportedError, read_chd_info, scan_chd_folder
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import subprocess
 import re
+import threading
+from typing import Dict, List, Optional, Set
 
 class ExtractChdHandler(ConversionHandler):
     """Handler pour extraction CHD vers BIN/CUE"""
+    def __init__(self, tools_path=None, log_callback=None, progress_callback=None):
+        super().__init__(tools_path, log_callback, progress_callback)
+        # Extraction native (hunks décompressés en parallèle); chdman reste le repli
+        self.native_extraction = True
+        # CHD des dossiers consultés, par SHA1, pour retrouver le parent des CHD enfants
+        self._parent_index: Dict[Path, Dict[str, Path]] = {}
+        self._parent_index_lock = threading.Lock()
+
+    def _chds_by_sha1(self, folder: Path) -> Dict[str, Path]:
+        with self._parent_index_lock:
+            index = self._parent_index.get(folder)
+            if index is None:
+                index = {info.sha1: path for path, info, _ in scan_chd_folder(folder) if info is not None and info.sha1}
+                self._parent_index[folder] = index
+            return index
+
+    def _parent_args(self, chd_file: Path) -> Optional[List[str]]:
+        """Options chdman du CHD parent (--inputparent): [] sans parent, None si introuvable.
+
+        Le parent est cherché par SHA1 à côté du CHD, puis dans les dossiers source et destination.
+        """
+        try:
+            info = read_chd_info(chd_file)
+        except (OSError, ChdFormatError):
+            return []  # En-tête illisible: chdman tranchera
+        if not info.has_parent:
+            return []
+        folders = [chd_file.parent]
+        for folder in (self.source_folder, self.dest_folder):
+            if folder and Path(folder).is_dir() and Path(folder).resolve() not in [f.resolve() for f in folders]:
+                folders.append(Path(folder))
+        for folder in folders:
+            parent = self._chds_by_sha1(folder.resolve()).get(info.parent_sha1)
+            if parent is not None and parent.resolve() != chd_file.resolve():
+                self.log(f"🔗 CHD parent de {chd_file.name} : {parent.name}")
+                return ["-ip", str(parent)]
+        return None
+
+    def _extract_native(self, chd_file: Path, output: Path, chd_type: str) -> Optional[bool]:
+        """Extraction sans chdman: True/False, ou None pour laisser la main à chdman."""
+        if not self.native_extraction:
+            return None
+        from .chd_extract import ChdExtractor, ExtractionStopped
+
+        report_progress = self.max_jobs <= 1
+        try:
+            extractor = ChdExtractor(
+                chd_file,
+                should_stop=lambda: self.should_stop,
+                progress=(lambda p: self.progress(p, f"{chd_file.name}: {p:.1f}%")) if report_progress else None,
+            )
+        except ChdUnsupportedError as e:
+            self.log(f"ℹ️ Extraction native non disponible ({e}), utilisation de chdman")
+            return None
+        except (OSError, ChdFormatError) as e:
+            self.log(f"⚠️ Lecture native impossible ({chd_file.name}), utilisation de chdman : {e}")
+            return None
+
+        mode = "extractdvd" if chd_type == 'DVD' else "extractcd"
+        job_commands = getattr(self._job_context, "commands", None)
+        if job_commands is not None:
+            job_commands.append(["b2pc", mode, "-i", str(chd_file), "-o", str(output)])
+        pool = self.get_process_pool()
+        tasks_in_flight = 2 * self.threads_per_job()
+        self.log(f"⚡ Extraction native ({mode}, {self.threads_per_job() if pool else 1} processus) : {chd_file.name}")
+        try:
+            if chd_type == 'DVD':
+                extractor.extract_iso(output, pool, tasks_in_flight)
+            else:
+                extractor.extract_cue(output, pool, tasks_in_flight)
+            return True
+        except ExtractionStopped:
+            return False
+        except (ChdFormatError, BrokenProcessPool) as e:
+            if isinstance(e, BrokenProcessPool):
+                self.shutdown_process_pool()
+            self.log(f"⚠️ Extraction native interrompue ({chd_file.name}), nouvelle tentative avec chdman : {e}")
+            for partial in (output, output.with_suffix(".bin")):
+                if partial.exists():
+                    partial.unlink()
+            return None
+        except OSError as e:
+            self.log(f"❌ Erreur d'écriture ({chd_file.name}) : {e}")
+            return False
+
     def _detect_chd_type(self, chd_path: Path) -> str:
+        """Détecte le type du CHD (CD ou DVD) en lisant directement son en-tête et ses métadonnées.
+
+        Repli sur 'chdman info' si le fichier n'est pas lisible nativement.
+        """
+        try:
+            return read_chd_info(chd_path).disc_type
+        except (OSError, ChdFormatError) as e:
+            self.log(f"⚠️ Lecture native impossible ({chd_path.name}), repli sur chdman info : {e}")
+        return self._detect_chd_type_with_chdman(chd_path)
+
+    def _detect_chd_type_with_chdman(self, chd_path: Path) -> str:
         """Détecte le type du CHD (CD ou DVD) via 'chdman info'.
 
         Retourne 'CD' ou 'DVD'. Si indéterminé, retourne 'CD' par défaut.
@@ -45,77 +145,84 @@ class ExtractChdHandler(ConversionHandler):
                 is_dvd = True
         return 'DVD' if is_dvd else 'CD'
 
+    def archive_member_extensions(self) -> Set[str]:
+        return {".chd"}
+
+    def job_outputs(self, chd_file: Path) -> List[Path]:
+        dest_path = Path(self.dest_folder)
+        return [dest_path / f"{chd_file.stem}{ext}" for ext in (".iso", ".cue", ".bin")]
+
+    def _archive_inputs(self, extracted_folder: Path) -> List[Path]:
+        return [p for p in extracted_folder.iterdir() if p.is_file() and p.suffix.lower() == ".chd"]
+
+    def _convert_input(self, chd_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        if self.should_stop:
+            return None
+        dest_path = Path(self.dest_folder)
+        base_name = chd_file.stem
+        chd_type = self._detect_chd_type(chd_file)
+        if chd_type == 'DVD':
+            iso_file = dest_path / f"{base_name}.iso"
+            if iso_file.exists():
+                self.log(f"⏭️ Déjà extrait (DVD) : {iso_file.name}")
+                return None
+            self.log(f"🔍 Type détecté DVD pour {chd_file.name}")
+            parent_args = self._parent_args(chd_file)
+            if parent_args is None:
+                self.log(f"❌ CHD parent introuvable pour {chd_file.name} (à placer dans le même dossier)")
+                return False
+            with self.staged_outputs() as staging:
+                args = [
+                    "extractdvd",
+                    "-i", str(chd_file),
+                    "-o", str(staging.path / iso_file.name),
+                    *parent_args
+                ]
+                extracted = self._extract_native(chd_file, staging.path / iso_file.name, chd_type)
+                if extracted is None:
+                    extracted = self.run_tool("chdman.exe", args, show_output=True)
+                if extracted:
+                    staging.commit()
+                    self.log(f"✅ Extrait : {chd_file.name} → {iso_file.name}")
+                    return True
+            self.log(f"❌ Échec extraction DVD : {chd_file.name}")
+            return False
+
+        cue_file = dest_path / f"{base_name}.cue"
+        bin_file = dest_path / f"{base_name}.bin"
+        if bin_file.exists() and cue_file.exists():
+            self.log(f"⏭️ Déjà extrait (CD) : {bin_file.name} / {cue_file.name}")
+            return None
+        self.log(f"🔍 Type détecté CD pour {chd_file.name}")
+        parent_args = self._parent_args(chd_file)
+        if parent_args is None:
+            self.log(f"❌ CHD parent introuvable pour {chd_file.name} (à placer dans le même dossier)")
+            return False
+        with self.staged_outputs() as staging:
+            # Le BIN est créé à côté du CUE, sous le même nom de base
+            args = [
+                "extractcd",
+                "-i", str(chd_file),
+                "-o", str(staging.path / cue_file.name),
+                *parent_args
+            ]
+            extracted = self._extract_native(chd_file, staging.path / cue_file.name, chd_type)
+            if extracted is None:
+                extracted = self.run_tool("chdman.exe", args, show_output=True)
+            if extracted:
+                staging.commit()
+                self.log(f"✅ Extrait : {chd_file.name} → {bin_file.name} / {cue_file.name}")
+                return True
+        self.log(f"❌ Échec extraction CD : {chd_file.name}")
+        return False
+
     def convert(self) -> dict:
-        """Extrait les fichiers CHD en BIN/CUE avec chdman.exe"""
+        """Extrait les fichiers CHD en BIN/CUE (ISO pour les DVD), nativement ou avec chdman.exe"""
         dest_path = Path(self.dest_folder)
         dest_path.mkdir(exist_ok=True)
         source_files = self.get_all_source_files(".chd")
         self.log(f"📁 Trouvé {len(source_files)} CHD à extraire")
-        extracted = 0
-        errors = 0
-        for i, (source_item, extract_type) in enumerate(source_files):
-            if self.check_should_stop():
-                break
-            self.progress((i / len(source_files)) * 100, f"Traitement {i+1}/{len(source_files)}")
-            if extract_type is None:
-                chd_files = [source_item]
-                self.log(f"📄 Traitement direct: {source_item.name}")
-            elif extract_type == "archive":
-                self.log(f"📦 Extraction de l'archive: {source_item.name}")
-                try:
-                    extracted_folder = self.extract_single_archive(source_item)
-                    chd_files = [p for p in extracted_folder.iterdir() if p.is_file() and p.suffix.lower()==".chd"]
-                    self.log(f"📁 Trouvé {len(chd_files)} CHD dans l'archive")
-                except Exception as e:
-                    self.log(f"❌ Échec extraction {source_item.name}: {str(e)}")
-                    errors += 1
-                    continue
-            for chd_file in chd_files:
-                if self.check_should_stop():
-                    break
-                base_name = chd_file.stem
-                chd_type = self._detect_chd_type(chd_file)
-                if chd_type == 'DVD':
-                    iso_file = dest_path / f"{base_name}.iso"
-                    if iso_file.exists():
-                        self.log(f"⏭️ Déjà extrait (DVD) : {iso_file.name}")
-                        continue
-                    self.log(f"🔍 Type détecté DVD pour {chd_file.name}")
-                    args = [
-                        "extractdvd",
-                        "-i", str(chd_file),
-                        "-o", str(iso_file)
-                    ]
-                    if self.run_tool("chdman.exe", args, show_output=True):
-                        extracted += 1
-                        self.log(f"✅ Extrait : {chd_file.name} → {iso_file.name}")
-                        if extract_type is None:
-                            self.delete_source_after_success(chd_file)
-                    else:
-                        errors += 1
-                        self.log(f"❌ Échec extraction DVD : {chd_file.name}")
-                else:
-                    cue_file = dest_path / f"{base_name}.cue"
-                    bin_file = dest_path / f"{base_name}.bin"
-                    if bin_file.exists() and cue_file.exists():
-                        self.log(f"⏭️ Déjà extrait (CD) : {bin_file.name} / {cue_file.name}")
-                        continue
-                    self.log(f"🔍 Type détecté CD pour {chd_file.name}")
-                    args = [
-                        "extractcd",
-                        "-i", str(chd_file),
-                        "-o", str(cue_file)
-                    ]
-                    if self.run_tool("chdman.exe", args, show_output=True):
-                        extracted += 1
-                        self.log(f"✅ Extrait : {chd_file.name} → {bin_file.name} / {cue_file.name}")
-                        if extract_type is None:
-                            self.delete_source_after_success(chd_file)
-                    else:
-                        errors += 1
-                        self.log(f"❌ Échec extraction CD : {chd_file.name}")
-            if self.check_should_stop():
-                break
+        extracted, errors = self.run_batch(source_files, self._archive_inputs, self._convert_input)
         if self.should_stop:
             self.log("🛑 Extraction arrêtée par l'utilisateur")
         return {
@@ -1,19 +1,128 @@
-from .chdv5 import ChdV5Handler
-from .rvz import RvzHandler
-from .xbox_patch import XboxPatchHandler
-from .squashfs import SquashFSHandler
-from .ps3 import Ps3DecryptHandler
-from .wbfs_iso import WbfsIsoHandler
+from typing import Callable, Dict, Tuple, Type
 
-def create_handler(handler_type: str, tools_path, log_callback, progress_callback):
-    handlers = {
-        "chd_v5": ChdV5Handler,
-        "rvz": RvzHandler,
-        "xbox_patch": XboxPatchHandler,
-        "squashfs": SquashFSHandler,
-        "ps3_decrypt": Ps3DecryptHandler,
-        "wbfs_iso": WbfsIsoHandler,
-    }
-    if handler_type not in handlers:
+# Les modules de handlers sont importés à la demande (démarrage rapide de l'interface).
+# Imports statiques dans des fonctions: PyInstaller les détecte, contrairement à importlib.
+
+
+def _chd_v5():
+    from .chdv5 import ChdV5Handler
+    return ChdV5Handler
+
+
+def _extract_chd():
+    from .extract_chd import ExtractChdHandler
+    return ExtractChdHandler
+
+
+def _recompress_chd():
+    from .recompress_chd import RecompressChdHandler
+    return RecompressChdHandler
+
+
+def _merge_bin_cue():
+    from .merge_bin_cue import MergeBinCueHandler
+    return MergeBinCueHandler
+
+
+def _split_bin_cue():
+    from .split_bin_cue import SplitBinCueHandler
+    return SplitBinCueHandler
+
+
+def _rvz():
+    from .rvz import RvzHandler
+    return RvzHandler
+
+
+def _xbox_patch():
+    from .xbox_patch import XboxPatchHandler
+    return XboxPatchHandler
+
+
+def _squashfs():
+    from .squashfs import SquashFSHandler
+    return SquashFSHandler
+
+
+def _ps3_decrypt():
+    from .ps3 import Ps3DecryptHandler
+    return Ps3DecryptHandler
+
+
+def _wbfs_iso():
+    from .wbfs_iso import WbfsIsoHandler
+    return WbfsIsoHandler
+
+
+HANDLER_REGISTRY: Dict[str, Callable[[], Type]] = {
+    "chd_v5": _chd_v5,
+    "extract_chd": _extract_chd,
+    "recompress_chd": _recompress_chd,
+    "merge_bin_cue": _merge_bin_cue,
+    "split_bin_cue": _split_bin_cue,
+    "rvz": _rvz,
+    "xbox_patch": _xbox_patch,
+    "squashfs": _squashfs,
+    "ps3_decrypt": _ps3_decrypt,
+    "wbfs_iso": _wbfs_iso,
+}
+
+# Opération affichée dans l'interface -> (type de handler, méthode à appeler, attributs à régler)
+OPERATIONS: Dict[str, Tuple[str, str, dict]] = {
+    "Conversion ISO/CUE/GDI > CHD": ("chd_v5", "convert", {}),
+    "Extraire CHD": ("extract_chd", "convert", {}),
+    "Extract CHD": ("extract_chd", "convert", {}),
+    "Optimiser CHD": ("recompress_chd", "convert", {}),
+    "Merge BIN/CUE": ("merge_bin_cue", "convert", {}),
+    "Split BIN/CUE": ("split_bin_cue", "convert", {}),
+    "Conversion ISO vers RVZ": ("rvz", "convert", {"direction": "iso_to_rvz"}),
+    "[GC/WII] RVZ > ISO": ("rvz", "convert", {"direction": "rvz_to_iso"}),
+    "wSquashFS Compression": ("squashfs", "compress", {}),
+    "wSquashFS Extraction": ("squashfs", "extract", {}),
+    "[XBOX] Patch ISO": ("xbox_patch", "convert", {}),
+    "[PS3] Decrypt ISO & Convert": ("ps3_decrypt", "convert", {}),
+    "[WII] ISO > WBFS": ("wbfs_iso", "convert", {"direction": "iso_to_wbfs"}),
+    "[WII] WBFS > ISO": ("wbfs_iso", "convert", {"direction": "wbfs_to_iso"}),
+    "[WII] WBFS > RVZ": ("wbfs_iso", "convert", {"direction": "wbfs_to_rvz"}),
+    "[WII] WBFS <> ISO": ("wbfs_iso", "convert", {}),
+}
+
+# Identifiants courts de la ligne de commande (b2pc.py) -> opération de l'interface
+OPERATION_IDS: Dict[str, str] = {
+    "chd": "Conversion ISO/CUE/GDI > CHD",
+    "extract-chd": "Extraire CHD",
+    "recompress-chd": "Optimiser CHD",
+    "merge-bincue": "Merge BIN/CUE",
+    "split-bincue": "Split BIN/CUE",
+    "iso-to-rvz": "Conversion ISO vers RVZ",
+    "rvz-to-iso": "[GC/WII] RVZ > ISO",
+    "squashfs-compress": "wSquashFS Compression",
+    "squashfs-extract": "wSquashFS Extraction",
+    "xbox-patch": "[XBOX] Patch ISO",
+    "ps3-decrypt": "[PS3] Decrypt ISO & Convert",
+    "iso-to-wbfs": "[WII] ISO > WBFS",
+    "wbfs-to-iso": "[WII] WBFS > ISO",
+    "wbfs-to-rvz": "[WII] WBFS > RVZ",
+}
+
+
+def get_handler_class(handler_type: str) -> Type:
+    loader = HANDLER_REGISTRY.get(handler_type)
+    if loader is None:
         raise ValueError(f"Handler type '{handler_type}' not supported")
-    return handlers[handler_type](tools_path, log_callback, progress_callback)
+    return loader()
+
+
+def create_handler(handler_type: str, tools_path, log_callback, progress_callback):
+    return get_handler_class(handler_type)(tools_path, log_callback, progress_callback)
+
+
+def create_operation_handler(operation: str, tools_path, log_callback, progress_callback):
+    """Instancie le handler d'une opération de l'interface; renvoie (handler, méthode)."""
+    if operation not in OPERATIONS:
+        raise ValueError(f"Handler non disponible pour: {operation}")
+    handler_type, method, attributes = OPERATIONS[operation]
+    handler = create_handler(handler_type, tools_path, log_callback, progress_callback)
+    for name, value in attributes.items():
+        setattr(handler, name, value)
+    return handler, method
@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# États d'un élément du journal
+STATE_RUNNING = "running"          # Commencé: si on le retrouve au lancement suivant, le run a été interrompu
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_INTERRUPTED = "interrupted"  # Arrêt demandé pendant la conversion
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    scope TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    member TEXT NOT NULL DEFAULT '',
+    source_size INTEGER NOT NULL,
+    source_mtime_ns INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    commands TEXT NOT NULL DEFAULT '[]',
+    outputs TEXT NOT NULL DEFAULT '[]',
+    output_size INTEGER,
+    started REAL,
+    duration REAL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (scope, source_path, member)
+)
+"""
+
+
+def source_identity(path: Path) -> Tuple[str, int, int]:
+    """(chemin absolu, taille, mtime_ns) d'une source: une source modifiée est un nouvel élément."""
+    stat = path.stat()
+    return str(path.resolve()), stat.st_size, stat.st_mtime_ns
+
+
+def path_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
+
+
+class JobJournal:
+    """Journal SQLite des éléments d'un lot, stocké dans le dossier destination.
+
+    Une ligne par source (member vide) et, pour les archives, une par fichier converti
+    (member = chemin dans l'archive). On y garde l'identité de la source, les commandes
+    lancées, l'état, la durée et les sorties produites avec leur taille totale.
+    Les lignes d'un scope (handler + sens de conversion) sont chargées une fois à
+    l'ouverture: chaque recherche est ensuite une lecture de dictionnaire.
+    """
+
+    FILENAME = ".b2pc_journal.sqlite"
+
+    def __init__(self, db_path: Path, scope: str):
+        self.db_path = Path(db_path)
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        # Index en mémoire: chemin source -> {member: ligne}
+        self._rows: Dict[str, Dict[str, dict]] = {}
+        cursor = self._conn.execute(
+            "SELECT source_path, member, source_size, source_mtime_ns, state, commands, outputs,"
+            " output_size, started, duration FROM jobs WHERE scope = ?",
+            (scope,),
+        )
+        for row in cursor:
+            self._rows.setdefault(row[0], {})[row[1]] = {
+                "source_size": row[2], "source_mtime_ns": row[3], "state": row[4],
+                "commands": json.loads(row[5] or "[]"), "outputs": json.loads(row[6] or "[]"),
+                "output_size": row[7], "started": row[8], "duration": row[9],
+            }
+
+    @classmethod
+    def open_in(cls, dest_folder, scope: str) -> "JobJournal":
+        return cls(Path(dest_folder) / cls.FILENAME, scope)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, identity: Tuple[str, int, int], member: str = "") -> Optional[dict]:
+        """Ligne de l'élément, ou None s'il est inconnu ou si la source a changé depuis."""
+        path, size, mtime_ns = identity
+        row = self._rows.get(path, {}).get(member)
+        if row is None or row["source_size"] != size or row["source_mtime_ns"] != mtime_ns:
+            return None
+        return row
+
+    def members(self, identity: Tuple[str, int, int]) -> List[dict]:
+        """Lignes des fichiers d'une archive (hors ligne de l'archive elle-même)."""
+        path, size, mtime_ns = identity
+        return [
+            row for member, row in self._rows.get(path, {}).items()
+            if member and row["source_size"] == size and row["source_mtime_ns"] == mtime_ns
+        ]
+
+    def outputs_intact(self, row: dict) -> bool:
+        """Les sorties d'un élément terminé sont toujours là, avec la taille enregistrée."""
+        outputs = [Path(p) for p in row["outputs"]]
+        try:
+            return all(p.exists() for p in outputs) and sum(path_size(p) for p in outputs) == (row["output_size"] or 0)
+        except OSError:
+            return False
+
+    def begin(self, identity: Tuple[str, int, int], member: str = ""):
+        self._write(identity, member, STATE_RUNNING, started=time.time())
+
+    def finish(self, identity: Tuple[str, int, int], member: str, state: str,
+               commands: Optional[list] = None, outputs: Optional[List[Path]] = None):
+        existing = [Path(p) for p in (outputs or []) if Path(p).exists()]
+        try:
+            output_size = sum(path_size(p) for p in existing)
+        except OSError:
+            output_size = None
+        row = self._rows.get(identity[0], {}).get(member) or {}
+        started = row.get("started")
+        self._write(
+            identity, member, state,
+            commands=commands if commands is not None else row.get("commands", []),
+            outputs=[str(p) for p in existing],
+            output_size=output_size,
+            started=started,
+            duration=(time.time() - started) if started else None,
+        )
+
+    def forget(self, identity: Tuple[str, int, int], member: str = ""):
+        with self._lock:
+            self._rows.get(identity[0], {}).pop(member, None)
+            self._conn.execute(
+                "DELETE FROM jobs WHERE scope = ? AND source_path = ? AND member = ?",
+                (self.scope, identity[0], member),
+            )
+
+    def _write(self, identity, member, state, commands=None, outputs=None, output_size=None,
+               started=None, duration=None):
+        path, size, mtime_ns = identity
+        row = {
+            "source_size": size, "source_mtime_ns": mtime_ns, "state": state,
+            "commands": commands or [], "outputs": outputs or [], "output_size": output_size,
+            "started": started, "duration": duration,
+        }
+        with self._lock:
+            self._rows.setdefault(path, {})[member] = row
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (scope, source_path, member, source_size, source_mtime_ns,"
+                " state, commands, outputs, output_size, started, duration, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.scope, path, member, size, mtime_ns, state, json.dumps(row["commands"]),
+                 json.dumps(row["outputs"]), output_size, started, duration, time.time()),
+            )
+
+
+def remove_outputs(outputs: List[Path]) -> List[Path]:
+    """Supprime les fichiers de sortie d'un élément interrompu; renvoie ceux supprimés.
+
+    Les dossiers ne sont jamais supprimés: ils peuvent contenir des fichiers de l'utilisateur.
+    """
+    removed = []
+    for output in outputs:
+        try:
+            if output.is_file():
+                os.unlink(output)
+                removed.append(output)
+        except OSError:
+            pass
+    return removed
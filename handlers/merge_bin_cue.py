@@ -1,52 +1,254 @@
-from .base import ConversionHandler
-from .chdv5 import ChdV5Handler
-from .extract_chd import ExtractChdHandler
+from .base import ConversionHandler, DescriptorError, DescriptorSheet, read_descriptor
+from .cdrom import msf
 from pathlib import Path
+import os
+from typing import Callable, List, Optional, Set, Tuple
+
+# Fusion native: les BIN sont concaténés tels quels (copy_file_range / sendfile quand le système
+# le permet, sinon gros tampons) et la fiche est réécrite avec un seul FILE, les INDEX décalés du nombre de
+# trames des fichiers précédents. PREGAP / POSTGAP (absents des BIN) et les autres commandes
+# (REM, TITLE, FLAGS...) sont recopiés tels quels.
+
+_COPY_CHUNK = 64 * 1024 * 1024  # Octets par appel à copy_file_range
+_BUFFER_SIZE = 8 * 1024 * 1024  # Tampon de la copie classique
+
+
+class CueMergeError(ValueError):
+    """Fiche CUE incohérente (piste sans fichier, taille de BIN inattendue...)."""
+
+
+class CueMergeUnsupported(CueMergeError):
+    """Fiche valide que la fusion native ne couvre pas (fichiers WAVE, MP3...)."""
+
+
+class MergeStopped(Exception):
+    """Arrêt demandé pendant une fusion."""
+
+
+def plan_cue_merge(cue_path: Path, bin_name: str, sheet: Optional[DescriptorSheet] = None
+                   ) -> Tuple[str, List[Path]]:
+    """Fiche fusionnée (un seul FILE bin_name) et BIN à concaténer, dans l'ordre.
+
+    sheet: la fiche déjà lue par read_descriptor (sinon elle est lue ici). Lève
+    CueMergeUnsupported (fichiers non BINARY) ou CueMergeError (fiche invalide ou incohérente).
+    """
+    if sheet is None:
+        try:
+            sheet = read_descriptor(cue_path)
+        except DescriptorError as e:
+            raise CueMergeError(str(e)) from e
+    entries = sheet.file_entries
+    for entry in entries:
+        if entry.type != "BINARY":
+            raise CueMergeUnsupported(f"fichier {entry.type or '?'}")
+        if entry.path.suffix.lower() == ".ecm":
+            raise CueMergeUnsupported(f"fichier ECM {entry.path.name}")
+    position_of = {entry: number for number, entry in enumerate(entries)}
+
+    # Par fichier: [octets par secteur, premier INDEX dans ce fichier] de chacune de ses pistes.
+    # Une piste peut commencer dans le fichier précédent (pregap en fin de fichier, façon EAC).
+    file_tracks: List[List[list]] = [[] for _ in entries]
+    for track in sheet.tracks:
+        for entry in dict.fromkeys([track.file] + [index.file for index in track.indexes]):
+            first = next((index.frames for index in track.indexes if index.file is entry), None)
+            file_tracks[position_of[entry]].append([track.sector_size, first])
+
+    # Position de chaque fichier dans le BIN fusionné, en trames: INDEX de sa dernière piste
+    # plus les secteurs qui la suivent (octets restants / taille de secteur de cette piste)
+    starts = []
+    position = 0
+    for entry, tracks in zip(entries, file_tracks):
+        starts.append(position)
+        if not tracks:
+            raise CueMergeError(f"fichier sans piste : {entry.path.name}")
+        if any(first is None for _, first in tracks):
+            raise CueMergeError(f"piste sans INDEX dans {entry.path.name}")
+        before_last = tracks[0][1] * tracks[0][0]
+        for (size, first), (_, following) in zip(tracks, tracks[1:]):
+            before_last += (following - first) * size
+        remaining = entry.path.stat().st_size - before_last
+        last_size, last_first = tracks[-1]
+        if remaining < 0 or remaining % last_size:
+            raise CueMergeError(f"taille de {entry.path.name} incohérente avec la fiche")
+        position += last_first + remaining // last_size
+
+    # Lignes d'origine: le premier FILE devient bin_name, les suivants disparaissent et les
+    # INDEX sont décalés de la position de leur fichier
+    file_lines = {entry.line for entry in entries}
+    index_at = {index.line: index for track in sheet.tracks for index in track.indexes}
+    lines = []
+    file_written = False
+    for number, raw in enumerate(sheet.lines):
+        if number in file_lines:
+            if not file_written:
+                lines.append(f'FILE "{bin_name}" BINARY')
+                file_written = True
+        elif number in index_at:
+            index = index_at[number]
+            indent = raw[:len(raw) - len(raw.lstrip())]
+            start = starts[position_of[index.file]]
+            lines.append(f"{indent}INDEX {index.number:02d} {msf(start + index.frames)}")
+        else:
+            lines.append(raw)
+    return "\n".join(lines) + "\n", [entry.path for entry in entries]
+
+
+def _write_all(fd: int, view: memoryview):
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def copy_range(src_fd: int, out_fd: int, offset: int, length: int, on_chunk: Callable[[int], None],
+               name: str = "") -> None:
+    """Copie length octets de src_fd (à partir de offset) à la position courante de out_fd.
+
+    Sans passer par Python quand le système le permet (copy_file_range, puis sendfile),
+    sinon par gros tampons; on_chunk(octets) après chaque bloc (peut lever MergeStopped).
+    """
+    end = offset + length
+    for zero_copy in ("copy_file_range", "sendfile"):
+        if offset >= end or not hasattr(os, zero_copy):
+            continue
+        try:
+            while offset < end:
+                count = min(_COPY_CHUNK, end - offset)
+                if zero_copy == "copy_file_range":
+                    copied = os.copy_file_range(src_fd, out_fd, count, offset)
+                else:
+                    copied = os.sendfile(out_fd, src_fd, offset, count)
+                if not copied:
+                    raise CueMergeError(f"{name} raccourci pendant la copie")
+                offset += copied
+                on_chunk(copied)
+        except OSError:
+            continue  # Autre système de fichiers, noyau ancien...: méthode suivante à partir d'ici
+    if offset >= end:
+        return
+    buffer = memoryview(bytearray(min(_BUFFER_SIZE, end - offset)))
+    while offset < end:
+        read = _pread_into(src_fd, buffer[:min(len(buffer), end - offset)], offset)
+        if not read:
+            raise CueMergeError(f"{name} raccourci pendant la copie")
+        _write_all(out_fd, buffer[:read])
+        offset += read
+        on_chunk(read)
+
+
+def _pread_into(fd: int, view: memoryview, offset: int) -> int:
+    if hasattr(os, "preadv"):
+        return os.preadv(fd, [view], offset)
+    # Windows: pas de lecture positionnée, lseek puis read
+    os.lseek(fd, offset, os.SEEK_SET)
+    data = os.read(fd, len(view))
+    view[:len(data)] = data
+    return len(data)
+
+
+def concatenate_files(sources: List[Path], output: Path, on_chunk: Callable[[int], None]):
+    """Concatène les fichiers dans output; on_chunk(octets) après chaque bloc (peut lever MergeStopped)."""
+    with open(output, "wb", buffering=0) as out:
+        for source in sources:
+            with open(source, "rb", buffering=0) as src:
+                copy_range(src.fileno(), out.fileno(), 0, os.fstat(src.fileno()).st_size, on_chunk, source.name)
+
 
 class MergeBinCueHandler(ConversionHandler):
-    """Handler pour fusionner BIN/CUE en un nouveau BIN/CUE propre via CHD roundtrip"""
+    """Handler pour fusionner les BIN/CUE multi-pistes en un BIN unique et sa fiche CUE.
+
+    Fusion native, à la vitesse du disque; les fiches hors de portée (pistes WAVE...) passent
+    par un aller-retour CHD avec chdman (createcd puis extractcd)."""
+    def archive_member_extensions(self) -> Set[str]:
+        return {".cue"}
+
+    def job_outputs(self, cue_file: Path) -> List[Path]:
+        dest_path = Path(self.dest_folder)
+        return [dest_path / f"{cue_file.stem}.cue", dest_path / f"{cue_file.stem}.bin"]
+
+    def _archive_inputs(self, extracted_folder: Path) -> List[Path]:
+        return [p for p in extracted_folder.iterdir() if p.is_file() and p.suffix.lower() == ".cue"]
+
+    def _merge_with_chdman(self, cue_file: Path) -> bool:
+        """Aller-retour CHD (chdman createcd puis extractcd) dans le dossier de travail du job."""
+        cue_name, bin_name = f"{cue_file.stem}.cue", f"{cue_file.stem}.bin"
+        with self.staged_outputs() as staging:
+            chd_file = staging.path / f"{cue_file.stem}.chd"
+            created = self.run_tool("chdman.exe", [
+                "createcd", "-i", str(cue_file), "-o", str(chd_file), *self.tool_thread_args("chdman.exe")
+            ], show_output=True)
+            if created and self.run_tool("chdman.exe", [
+                "extractcd", "-i", str(chd_file), "-o", str(staging.path / cue_name)
+            ], show_output=True) and (staging.path / bin_name).exists():
+                staging.commit([bin_name, cue_name])
+                return True
+        return False
+
+    def _convert_input(self, cue_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        if self.should_stop:
+            return None
+        dest_path = Path(self.dest_folder)
+        cue_out = dest_path / f"{cue_file.stem}.cue"
+        bin_out = dest_path / f"{cue_file.stem}.bin"
+        if cue_out.exists() and bin_out.exists():
+            self.log(f"⏭️ Déjà fusionné : {cue_out.name}")
+            return None
+
+        try:
+            sheet = read_descriptor(cue_file)
+            cue_text, sources = plan_cue_merge(cue_file, bin_out.name, sheet)
+        except CueMergeUnsupported as e:
+            self.log(f"ℹ️ Fusion native non disponible ({e}), aller-retour CHD avec chdman : {cue_file.name}")
+            if self._merge_with_chdman(cue_file):
+                self.log(f"✅ Fusionné : {cue_file.name} → {bin_out.name} / {cue_out.name}")
+                return True
+            self.log(f"❌ Échec fusion : {cue_file.name}")
+            return False
+        except (OSError, DescriptorError, CueMergeError) as e:
+            self.log(f"❌ Fiche CUE invalide ({cue_file.name}) : {e}")
+            return False
+
+        total = sum(path.stat().st_size for path in sources)
+        done = [0]
+        report_progress = self.max_jobs <= 1
+
+        def on_chunk(count: int):
+            if self.should_stop:
+                raise MergeStopped()
+            done[0] += count
+            if report_progress and total:
+                percent = done[0] * 100 / total
+                self.progress(percent, f"{cue_file.name}: {percent:.1f}%")
+
+        self.log(f"🔗 Fusion de {len(sources)} fichier(s) : {cue_file.name}")
+        with self.staged_outputs() as staging:
+            try:
+                concatenate_files(sources, staging.path / bin_out.name, on_chunk)
+                with open(staging.path / cue_out.name, "w", encoding=sheet.encoding, newline="\n") as cue:
+                    cue.write(cue_text)
+            except MergeStopped:
+                return False
+            except (OSError, CueMergeError) as e:
+                self.log(f"❌ Échec fusion ({cue_file.name}) : {e}")
+                return False
+            staging.commit()
+        self.log(f"✅ Fusionné : {cue_file.name} → {bin_out.name} / {cue_out.name}")
+        return True
+
     def convert(self) -> dict:
-        """Convertit BIN/CUE en CHD puis extrait en BIN/CUE (roundtrip)"""
+        """Fusionne chaque fiche CUE du dossier source (plusieurs disques en parallèle)."""
         dest_path = Path(self.dest_folder)
         dest_path.mkdir(exist_ok=True)
-        # 1. Conversion en CHD
-        chd_temp = dest_path / "_temp_chd"
-        chd_temp.mkdir(exist_ok=True)
-        chd_handler = ChdV5Handler(str(self.tools_path), self.log, self.progress)
-        chd_handler.source_folder = self.source_folder
-        chd_handler.dest_folder = str(chd_temp)
-        chd_handler.should_stop = self.should_stop
-        chd_result = chd_handler.convert()
-        if chd_result.get("error_count", 0) > 0 or chd_handler.should_stop:
-            self.log("❌ Erreur lors de la conversion en CHD, fusion annulée")
-            return {"error": "Erreur conversion CHD", **chd_result}
-        # 2. Extraction du CHD en BIN/CUE
-        extract_handler = ExtractChdHandler(str(self.tools_path), self.log, self.progress)
-        extract_handler.source_folder = str(chd_temp)
-        extract_handler.dest_folder = self.dest_folder
-        extract_handler.should_stop = self.should_stop
-        extract_result = extract_handler.convert()
-        # Nettoyage du dossier temporaire
-        for f in chd_temp.glob("*.chd"):
-            try:
-                f.unlink()
-            except Exception:
-                pass
         try:
-            chd_temp.rmdir()
-        except Exception:
-            pass
-        # Fusion des résultats
-        result = {
-            "merged_games": extract_result.get("extracted_games", 0),
-            "error_count": extract_result.get("error_count", 0),
-            "stopped": extract_handler.should_stop or chd_handler.should_stop
-        }
-
-        if self.delete_source_after_conversion and not result.get("error_count") and not result.get("stopped"):
             source_files = self.get_multiple_source_files([".cue"])
-            for source_item, extract_type in source_files:
-                if extract_type is None:
-                    self.delete_source_after_success(source_item)
-
-        return result
+            self.log(f"📁 Fiches CUE détectées : {len(source_files)}")
+            merged, errors = self.run_batch(source_files, self._archive_inputs, self._convert_input, "Fusion")
+            if self.should_stop:
+                self.log("🛑 Fusion arrêtée par l'utilisateur")
+            return {
+                "merged_games": merged,
+                "error_count": errors,
+                "total_files": len(source_files),
+                "stopped": self.should_stop
+            }
+        finally:
+            self.cleanup_temp_folder()
@@ -0,0 +1,40 @@
+import re
+from typing import Optional, Tuple
+
+# Noms de jeux façon No-Intro / Redump: "Titre (Région) (Langues) (Rev 1) (Disc 2) [!]".
+# Les étiquettes entre parenthèses ou crochets distinguent les variantes d'un même disque.
+
+_DISC_TAG = re.compile(r"\((?:disc|disk|cd)\s*(\d+)(?:\s*of\s*\d+)?\)", re.IGNORECASE)
+_REVISION_TAG = re.compile(r"\((?:rev|v)\s*[0-9a-z.]+\)", re.IGNORECASE)
+_TAGS = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+
+
+def disc_number(name: str) -> Optional[int]:
+    """Numéro de disque d'un nom ('... (Disc 2)' -> 2), ou None."""
+    match = _DISC_TAG.search(name)
+    return int(match.group(1)) if match else None
+
+
+def is_revision(name: str) -> bool:
+    """Vrai pour une révision ('(Rev 1)', '(v1.1)')."""
+    return _REVISION_TAG.search(name) is not None
+
+
+def title_key(name: str) -> Tuple[str, int]:
+    """Titre sans étiquettes (casse ignorée) et numéro de disque (0 si absent).
+
+    Les révisions et variantes régionales d'un même disque partagent la même clé,
+    les différents disques d'un jeu non.
+    """
+    title = " ".join(_TAGS.sub(" ", name).split()).casefold()
+    return title, disc_number(name) or 0
+
+
+def disc_set_name(name: str) -> Optional[str]:
+    """Nom du jeu sans l'étiquette de disque ('Jeu (France) (Disc 2)' -> 'Jeu (France)'), ou None.
+
+    Les disques d'un même jeu partagent ce nom; les révisions et régions restent distinctes.
+    """
+    if _DISC_TAG.search(name) is None:
+        return None
+    return " ".join(_DISC_TAG.sub(" ", name).split())
@@ -0,0 +1,150 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+# Profils de compression: codec, niveau, taille de bloc (hunk pour chdman) et threads, par
+# cible d'outil. "default" reproduit les réglages historiques de B2PC, "staging" privilégie la
+# vitesse (serveurs d'ingestion), "archive" le taux de compression (stockage à froid).
+# Les profils utilisateur (compression_profiles.json) complètent ou remplacent ces profils;
+# un champ absent reprend la valeur du profil "default" pour la même cible.
+#
+# Cibles: chd_cd / chd_dvd (chdman createcd / createdvd: -c codecs, -hs taille de hunk;
+# le niveau n'est pas réglable), rvz (dolphin-tool: -c, -l, -b), squashfs (gensquashfs:
+# --compressor, --comp-extra level=N, --block-size).
+
+PROFILE_TARGETS = ("chd_cd", "chd_dvd", "rvz", "squashfs")
+# Cibles utilisées par chaque famille de handlers (clé des profils dédiés à un handler)
+FAMILY_TARGETS = {"chd": ("chd_cd", "chd_dvd"), "rvz": ("rvz",), "squashfs": ("squashfs",)}
+DEFAULT_PROFILE = "default"
+_FIELDS = ("codec", "level", "block_size", "threads")
+
+
+class ProfileError(ValueError):
+    """Profil de compression inconnu ou fichier de profils invalide."""
+
+
+class CompressionSettings:
+    """Réglages d'une cible; None laisse la valeur par défaut de l'outil."""
+    __slots__ = _FIELDS
+
+    def __init__(self, codec: Optional[str] = None, level: Optional[int] = None,
+                 block_size: Optional[int] = None, threads: Optional[int] = None):
+        self.codec = codec
+        self.level = level
+        self.block_size = block_size
+        self.threads = threads
+
+    @classmethod
+    def from_dict(cls, data: dict, base: Optional["CompressionSettings"] = None) -> "CompressionSettings":
+        if not isinstance(data, dict):
+            raise ProfileError("réglages attendus sous forme d'objet")
+        unknown = set(data) - set(_FIELDS)
+        if unknown:
+            raise ProfileError(f"champ(s) inconnu(s) : {', '.join(sorted(unknown))}")
+        values = {field: getattr(base, field) if base else None for field in _FIELDS}
+        for field, value in data.items():
+            if value is None:
+                values[field] = None
+            elif field == "codec":
+                if not isinstance(value, str) or not value.strip():
+                    raise ProfileError("codec attendu sous forme de texte")
+                values[field] = value.strip()
+            elif isinstance(value, bool) or not isinstance(value, int) or value < (0 if field == "level" else 1):
+                raise ProfileError(f"{field} attendu sous forme d'entier positif")
+            else:
+                values[field] = value
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in _FIELDS if getattr(self, field) is not None}
+
+
+class CompressionProfile:
+    """Un profil nommé: réglages par cible (PROFILE_TARGETS)."""
+    __slots__ = ("name", "targets")
+
+    def __init__(self, name: str, targets: Dict[str, CompressionSettings]):
+        self.name = name
+        self.targets = targets
+
+    def settings(self, target: str) -> CompressionSettings:
+        return self.targets.get(target) or CompressionSettings()
+
+    def to_dict(self, family: Optional[str] = None) -> dict:
+        """Profil tel qu'inscrit dans les résultats (limité aux cibles d'une famille si précisée)."""
+        targets = FAMILY_TARGETS.get(family, PROFILE_TARGETS)
+        return {"name": self.name, **{target: self.settings(target).to_dict() for target in targets}}
+
+
+def _builtin(name: str, targets: Dict[str, dict]) -> CompressionProfile:
+    return CompressionProfile(name, {target: CompressionSettings(**values) for target, values in targets.items()})
+
+
+BUILTIN_PROFILES: Dict[str, CompressionProfile] = {
+    profile.name: profile for profile in (
+        _builtin(DEFAULT_PROFILE, {
+            "chd_cd": {}, "chd_dvd": {},
+            "rvz": {"codec": "zstd", "level": 5, "block_size": 131072},
+            "squashfs": {"codec": "zstd", "block_size": 1048576},
+        }),
+        _builtin("staging", {
+            "chd_cd": {"codec": "cdzl,cdfl"}, "chd_dvd": {"codec": "zlib"},
+            "rvz": {"codec": "zstd", "level": 1, "block_size": 131072},
+            "squashfs": {"codec": "zstd", "level": 1, "block_size": 1048576},
+        }),
+        _builtin("archive", {
+            "chd_cd": {"codec": "cdlz,cdzl,cdfl"}, "chd_dvd": {"codec": "lzma,zlib,huff,flac"},
+            "rvz": {"codec": "zstd", "level": 22, "block_size": 2097152},
+            "squashfs": {"codec": "zstd", "level": 22, "block_size": 1048576},
+        }),
+    )
+}
+
+
+def user_profiles_path() -> Path:
+    """Fichier des profils utilisateur, à côté de settings.json."""
+    base = os.getenv('APPDATA') or str(Path.home())
+    return Path(base) / 'B2PC' / 'compression_profiles.json'
+
+
+def load_profiles(path: Optional[Path] = None) -> Dict[str, CompressionProfile]:
+    """Profils intégrés et profils utilisateur du fichier JSON (absent: profils intégrés seuls).
+
+    Format: {"nom": {"rvz": {"codec": "lzma2", "level": 9, "block_size": 2097152}, ...}, ...}
+    Lève ProfileError si le fichier est illisible ou un profil invalide.
+    """
+    profiles = dict(BUILTIN_PROFILES)
+    path = Path(path) if path else user_profiles_path()
+    if not path.exists():
+        return profiles
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ProfileError(f"{path.name} illisible : {e}") from e
+    if not isinstance(data, dict):
+        raise ProfileError(f"{path.name} : objet JSON attendu")
+    defaults = BUILTIN_PROFILES[DEFAULT_PROFILE]
+    for name, targets in data.items():
+        if not isinstance(targets, dict):
+            raise ProfileError(f"profil {name} : objet JSON attendu")
+        unknown = set(targets) - set(PROFILE_TARGETS)
+        if unknown:
+            raise ProfileError(f"profil {name} : cible(s) inconnue(s) : {', '.join(sorted(unknown))}")
+        try:
+            profiles[name] = CompressionProfile(name, {
+                target: CompressionSettings.from_dict(targets.get(target, {}), defaults.settings(target))
+                for target in PROFILE_TARGETS
+            })
+        except ProfileError as e:
+            raise ProfileError(f"profil {name} : {e}") from e
+    return profiles
+
+
+def select_profile(profiles: Dict[str, CompressionProfile], name: Optional[str], family: Optional[str] = None,
+                   overrides: Optional[Dict[str, str]] = None) -> CompressionProfile:
+    """Profil d'un handler: son profil dédié (overrides[famille]) sinon celui du lancement."""
+    chosen = (overrides or {}).get(family or "") or name or DEFAULT_PROFILE
+    if chosen not in profiles:
+        raise ProfileError(f"profil de compression inconnu : {chosen}")
+    return profiles[chosen]
@@ -1,4 +1,5 @@
 from .base import ConversionHandler
+from .tool_output import ToolOutputEvent, ToolOutputParser, iter_output_lines
 from pathlib import Path
 import os
 import subprocess
@@ -15,7 +16,7 @@ class Ps3DecryptHandler(ConversionHandler):
     KEY_ARCHIVE_NAMES = ("ps3_dec.zip", "ps3dec.zip")
 
     def _get_bundled_7z_variants(self) -> List[Path]:
-        from main import resource_path
+        from appinfo import resource_path
 
         # Priorite aux variantes 7z.exe (moteur complet), puis fallback 7za.exe.
         return [
@@ -28,7 +29,7 @@ class Ps3DecryptHandler(ConversionHandler):
 
     def validate_tools(self) -> bool:
         """Valide les outils minimaux necessaires au traitement PS3."""
-        from main import resource_path
+        from appinfo import resource_path
 
         ps3dec_path = Path(resource_path("ressources/ps3dec_win.exe"))
         if not ps3dec_path.exists():
@@ -143,7 +144,7 @@ class Ps3DecryptHandler(ConversionHandler):
         return None
 
     def _get_local_key_archives(self, search_dir: Path) -> List[Path]:
-        from main import resource_path
+        from appinfo import resource_path
 
         archives: List[Path] = []
         seen = set()
@@ -199,32 +200,6 @@ class Ps3DecryptHandler(ConversionHandler):
             self.log(f"❌ Impossible de lire la cle {dkey_path.name}: {e}")
             return None
 
-    def _extract_percent_from_output(self, line: str, tool_name: str) -> Optional[float]:
-        percent = self._extract_progress(line, tool_name)
-        if percent is not None:
-            return max(0.0, min(100.0, percent))
-
-        generic_percent = re.search(r"(\d+(?:\.\d+)?)\s*%", line)
-        if generic_percent:
-            try:
-                value = float(generic_percent.group(1))
-                return max(0.0, min(100.0, value))
-            except ValueError:
-                pass
-
-        ratio_progress = re.search(r"(\d+)\s*/\s*(\d+)", line)
-        if ratio_progress:
-            try:
-                done = float(ratio_progress.group(1))
-                total = float(ratio_progress.group(2))
-                if total > 0:
-                    value = (done / total) * 100.0
-                    return max(0.0, min(100.0, value))
-            except ValueError:
-                pass
-
-        return None
-
     def _should_suppress_line(self, line: str, progress_tool: str) -> bool:
         tool = (progress_tool or "").lower()
         text = (line or "").strip().lower()
@@ -291,44 +266,38 @@ class Ps3DecryptHandler(ConversionHandler):
         if hasattr(subprocess, "CREATE_NO_WINDOW"):
             flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
 
+        process = None
         try:
-            self.current_process = subprocess.Popen(
+            process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
                 creationflags=flags,
             )
+            self._register_process(process)
 
-            if self.current_process.stdout:
-                while True:
+            parser = ToolOutputParser(progress_tool, generic_progress=True)
+            if process.stdout:
+                for line in iter_output_lines(process.stdout):
                     if self.check_should_stop():
-                        self.current_process.terminate()
+                        process.terminate()
                         return False
 
-                    line = self.current_process.stdout.readline()
-                    if line:
-                        clean_line = line.strip()
-                        if clean_line:
-                            if self._should_suppress_line(clean_line, progress_tool):
-                                continue
-
-                            percent = self._extract_percent_from_output(clean_line, progress_tool)
-                            if percent is not None:
-                                emit_progress(percent)
-                            elif progress_range is not None and line_fallback_progress < 95.0:
-                                line_fallback_progress += 1.0
-                                emit_progress(line_fallback_progress)
-
-                            if self._is_important_message(clean_line, progress_tool):
-                                self.log(f"   {clean_line}")
-                    elif self.current_process.poll() is not None:
-                        break
+                    if self._should_suppress_line(line, progress_tool):
+                        continue
+
+                    event = parser.parse(line)
+                    if event.kind == ToolOutputEvent.PROGRESS:
+                        emit_progress(event.percent)
+                    elif progress_range is not None and line_fallback_progress < 95.0:
+                        line_fallback_progress += 1.0
+                        emit_progress(line_fallback_progress)
 
-            self.current_process.wait()
-            code = self.current_process.returncode
+                    if parser.is_important(line):
+                        self.log(f"   {line}")
+
+            process.wait()
+            code = process.returncode
             if code in allow_returncodes:
                 emit_progress(100.0)
                 return True
@@ -339,7 +308,7 @@ class Ps3DecryptHandler(ConversionHandler):
             self.log(f"❌ Erreur execution commande: {e}")
             return False
         finally:
-            self.current_process = None
+            self._release_process(process)
 
     def _decrypt_iso(
         self,
@@ -349,7 +318,7 @@ class Ps3DecryptHandler(ConversionHandler):
         progress_start: float,
         progress_end: float,
     ) -> bool:
-        from main import resource_path
+        from appinfo import resource_path
 
         ps3dec_exe = Path(resource_path("ressources/ps3dec_win.exe"))
         if not ps3dec_exe.exists():
@@ -657,6 +626,7 @@ class Ps3DecryptHandler(ConversionHandler):
         dest_path.mkdir(exist_ok=True)
 
         try:
+            self.cleanup_partial_outputs(dest_path)
             source_files = self.get_all_source_files(".iso")
             self.log(f"🎮 Traitement de {len(source_files)} source(s) PS3")
 
@@ -763,12 +733,17 @@ class Ps3DecryptHandler(ConversionHandler):
                         errors += 1
                         continue
 
-                    if not self._extract_decrypted_iso(
-                        decrypted_iso,
-                        game_folder,
-                        progress_start=map_iso_progress(75.0),
-                        progress_end=map_iso_progress(98.0),
-                    ):
+                    # Extraction dans un dossier de travail: le dossier .ps3 n'apparaît que complet
+                    with self.staged_outputs(dest_path) as staging:
+                        extracted = self._extract_decrypted_iso(
+                            decrypted_iso,
+                            staging.path / game_folder.name,
+                            progress_start=map_iso_progress(75.0),
+                            progress_end=map_iso_progress(98.0),
+                        )
+                        if extracted:
+                            staging.commit()
+                    if not extracted:
                         self.log(f"❌ Echec extraction ISO decrypte: {decrypted_iso.name}")
                         self.log(f"ℹ️ ISO decrypte conserve pour diagnostic: {decrypted_iso}")
                         self.progress(map_iso_progress(100.0), f"Echec extraction: {decrypted_iso.name}")
@@ -0,0 +1,171 @@
+from .base import ConversionHandler
+from .cdrom import FRAME_SIZE
+from .chd import ChdFormatError, ChdInfo, read_chd_info, scan_chd_folder
+from pathlib import Path
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Réglages visés par type de disque: codecs et taille de hunk par défaut de chdman
+# (createcd / createdvd), qui donnent les meilleurs taux de compression
+_TARGETS: Dict[str, Tuple[Tuple[str, ...], int]] = {
+    "CD": (("cdlz", "cdzl", "cdfl"), 8 * FRAME_SIZE),
+    "DVD": (("lzma", "zlib", "huff", "flac"), 4096),
+}
+# Codec principal attendu: sans lui, le CHD est presque toujours plus gros que nécessaire
+_PRIMARY_CODECS = {"CD": "cdlz", "DVD": "lzma"}
+
+
+class RecompressChdHandler(ConversionHandler):
+    """Optimisation de CHD existants (chdman copy).
+
+    Les CHD du dossier source sont inventoriés (version, codecs, taille de hunk, taux);
+    seuls ceux qui ont des chances de rétrécir (v3/v4, non compressés, sans LZMA, hunks
+    plus petits que ceux de chdman, pistes audio sans FLAC) sont recompressés. Chaque copie
+    est vérifiée (chdman verify puis SHA1 des données comparé à l'original) et n'est gardée
+    que si elle est plus petite.
+
+    Destination = source: l'original est remplacé. Sinon le CHD optimisé est écrit dans la
+    destination et l'original n'est supprimé qu'avec l'option de suppression des sources."""
+    def __init__(self, tools_path=None, log_callback=None, progress_callback=None):
+        super().__init__(tools_path, log_callback, progress_callback)
+        self._inventory: Dict[Path, ChdInfo] = {}
+        self._saved_bytes = 0
+        self._saved_lock = threading.Lock()
+
+    def _in_place(self) -> bool:
+        return Path(self.dest_folder).resolve() == Path(self.source_folder).resolve()
+
+    def job_outputs(self, chd_file: Path) -> List[Path]:
+        # Sur place, la sortie est l'original: le journal ne doit jamais la supprimer
+        if self._in_place():
+            return []
+        return [Path(self.dest_folder) / chd_file.name]
+
+    def delete_source_after_success(self, source_item) -> bool:
+        if self._in_place():
+            return False  # L'original a été remplacé par le CHD optimisé
+        return super().delete_source_after_success(source_item)
+
+    def recompress_reasons(self, info: ChdInfo) -> List[str]:
+        """Raisons de recompresser un CHD (liste vide: déjà optimal)."""
+        if info.kind not in ("CD", "GD-ROM", "DVD"):
+            return []  # Disques durs, A/V: hors du périmètre de B2PC
+        codecs, hunk_bytes = _TARGETS[info.disc_type]
+        reasons = []
+        if info.version < 5:
+            reasons.append(f"CHD v{info.version}")
+        if not info.compressors:
+            reasons.append("non compressé")
+        elif _PRIMARY_CODECS[info.disc_type] not in info.compressors:
+            reasons.append(f"codecs {', '.join(info.compressor_names())}")
+        elif "cdfl" in codecs and "cdfl" not in info.compressors and any(t.get("type") == "AUDIO" for t in info.tracks):
+            reasons.append("pistes audio sans FLAC")
+        if info.hunk_bytes < hunk_bytes:
+            reasons.append(f"hunks de {info.hunk_bytes} octets")
+        return reasons
+
+    def _plan(self, folder: Path) -> List[tuple]:
+        """Inventaire du dossier source; renvoie les CHD à recompresser."""
+        entries = scan_chd_folder(folder)
+        parents = {info.parent_sha1 for _, info, _ in entries if info is not None and info.has_parent}
+        candidates = []
+        for path, info, error in entries:
+            if info is None:
+                self.log(f"⚠️ CHD illisible ignoré : {error}")
+                continue
+            ratio = f"{info.ratio * 100:.1f}%" if info.ratio is not None else "?"
+            codecs = ", ".join(info.compressor_names()) or "aucune"
+            summary = f"v{info.version}, {info.kind}, [{codecs}], hunks {info.hunk_bytes} o, taux {ratio}"
+            if info.has_parent or info.sha1 in parents:
+                # La copie d'un parent ou d'un enfant casserait le lien entre les deux
+                self.log(f"⏭️ CHD parent/enfant ignoré : {path.name} ({summary})")
+                continue
+            reasons = self.recompress_reasons(info)
+            if not reasons:
+                self.log(f"✔️ Déjà optimal : {path.name} ({summary})")
+                continue
+            self.log(f"🎯 Candidat : {path.name} ({summary}) → {', '.join(reasons)}")
+            self._inventory[path] = info
+            candidates.append((str(path), None))
+        return candidates
+
+    def _verify_copy(self, original: ChdInfo, copy: Path) -> bool:
+        """chdman verify de la copie, puis SHA1 des données comparé à celui de l'original."""
+        if not self.run_tool("chdman.exe", ["verify", "-i", str(copy)], show_output=False):
+            self.log(f"❌ chdman verify en échec : {copy.name}")
+            return False
+        try:
+            copied = read_chd_info(copy)
+        except (OSError, ChdFormatError) as e:
+            self.log(f"❌ Copie illisible ({copy.name}) : {e}")
+            return False
+        # En v3, le SHA1 de l'en-tête est celui des données brutes
+        expected = original.raw_sha1 if original.version >= 4 else original.sha1
+        if copied.raw_sha1 != expected or copied.logical_size != original.logical_size:
+            self.log(f"❌ SHA1 différent de l'original : {copy.name}")
+            return False
+        return True
+
+    def _convert_input(self, chd_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        if self.should_stop:
+            return None
+        info = self._inventory[chd_file]
+        dest_file = Path(self.dest_folder) / chd_file.name
+        if not self._in_place() and dest_file.exists():
+            self.log(f"⏭️ Déjà optimisé : {dest_file.name}")
+            return None
+        codecs, hunk_bytes = _TARGETS[info.disc_type]
+        hunk_bytes = max(hunk_bytes, info.hunk_bytes)
+
+        with self.staged_outputs() as staging:
+            output = staging.path / chd_file.name
+            self.log(f"🔧 chdman copy → {chd_file.name} ({','.join(codecs)}, hunks {hunk_bytes} o)")
+            args = [
+                "copy",
+                "-i", str(chd_file),
+                "-o", str(output),
+                "-c", ",".join(codecs),
+                "-hs", str(hunk_bytes),
+                *self.tool_thread_args("chdman.exe")
+            ]
+            if not self.run_tool("chdman.exe", args, show_output=True) or not self._verify_copy(info, output):
+                self.log(f"❌ Échec : {chd_file.name}")
+                return False
+            new_size = output.stat().st_size
+            if new_size >= info.file_size:
+                self.log(f"↩️ Original conservé : {chd_file.name} ({info.file_size / 1e6:.1f} Mo, copie {new_size / 1e6:.1f} Mo)")
+                # Résultat retenu au journal: inutile de refaire copie et vérification au prochain lancement
+                self.settle_job()
+                return None
+            staging.commit()
+        saved = info.file_size - new_size
+        with self._saved_lock:
+            self._saved_bytes += saved
+        self.log(
+            f"✅ Optimisé : {chd_file.name} {info.file_size / 1e6:.1f} Mo → {new_size / 1e6:.1f} Mo "
+            f"(-{saved * 100 / info.file_size:.1f}%)"
+        )
+        return True
+
+    def convert(self) -> dict:
+        source_path = Path(self.source_folder)
+        dest_path = Path(self.dest_folder)
+        dest_path.mkdir(exist_ok=True)
+        self._inventory = {}
+        self._saved_bytes = 0
+        if self._in_place():
+            self.log("♻️ Destination = source : les CHD optimisés remplacent les originaux")
+        source_files = self._plan(source_path)
+        self.log(f"📁 {len(source_files)} CHD à recompresser")
+        optimized, errors = self.run_batch(source_files, lambda folder: [], self._convert_input, "Optimisation")
+        if self.should_stop:
+            self.log("🛑 Optimisation arrêtée par l'utilisateur")
+        if optimized:
+            self.log(f"💾 Espace gagné : {self._saved_bytes / 1e6:.1f} Mo")
+        return {
+            "optimized_games": optimized,
+            "error_count": errors,
+            "total_files": len(source_files),
+            "saved_bytes": self._saved_bytes,
+            "stopped": self.should_stop
+        }
@@ -1,9 +1,11 @@
 from .base import ConversionHandler
 from pathlib import Path
+from typing import List, Optional, Set
 
 
 class RvzHandler(ConversionHandler):
     """Handler pour conversion bidirectionnelle ISO <-> RVZ (GameCube/Wii)."""
+    compression_family = "rvz"
 
     def __init__(self, tools_path=None, log_callback=None, progress_callback=None):
         super().__init__(tools_path, log_callback, progress_callback)
@@ -15,6 +17,13 @@ class RvzHandler(ConversionHandler):
             return ".rvz"
         return ".iso"
 
+    def archive_member_extensions(self) -> Set[str]:
+        return {self._source_extension()}
+
+    def job_outputs(self, input_file: Path) -> List[Path]:
+        output_ext = ".iso" if self.direction == "rvz_to_iso" else ".rvz"
+        return [Path(self.dest_folder) / f"{input_file.stem}{output_ext}"]
+
     def _archive_files(self, extracted_folder: Path):
         wanted_ext = self._source_extension()
         return [p for p in extracted_folder.iterdir() if p.is_file() and p.suffix.lower() == wanted_ext]
@@ -26,15 +35,17 @@ class RvzHandler(ConversionHandler):
                 self.log(f"⏭️ ISO deja existant : {output_file.name}")
                 return True
 
-            args = [
-                "convert",
-                "-f", "iso",
-                "-i", str(source_file),
-                "-o", str(output_file)
-            ]
-            if self.run_tool("dolphin-tool.exe", args, show_output=True):
-                self.log(f"🐬 Converti en ISO : {source_file.name}")
-                return True
+            with self.staged_outputs(dest_path) as staging:
+                args = [
+                    "convert",
+                    "-f", "iso",
+                    "-i", str(source_file),
+                    "-o", str(staging.path / output_file.name)
+                ]
+                if self.run_tool("dolphin-tool.exe", args, show_output=True):
+                    staging.commit()
+                    self.log(f"🐬 Converti en ISO : {source_file.name}")
+                    return True
 
             self.log(f"❌ Échec ISO : {source_file.name}")
             return False
@@ -44,22 +55,29 @@ class RvzHandler(ConversionHandler):
             self.log(f"⏭️ RVZ déjà existant : {output_file.name}")
             return True
 
-        args = [
-            "convert",
-            "-f", "rvz",
-            "-c", "zstd",
-            "-l", "5",
-            "-b", "131072",
-            "-i", str(source_file),
-            "-o", str(output_file)
-        ]
-        if self.run_tool("dolphin-tool.exe", args, show_output=True):
-            self.log(f"🐬 Converti en RVZ : {source_file.name}")
-            return True
+        with self.staged_outputs(dest_path) as staging:
+            args = [
+                "convert",
+                "-f", "rvz",
+                *self.tool_compression_args("dolphin-tool.exe", "rvz"),
+                "-i", str(source_file),
+                "-o", str(staging.path / output_file.name)
+            ]
+            if self.run_tool("dolphin-tool.exe", args, show_output=True):
+                staging.commit()
+                self.log(f"🐬 Converti en RVZ : {source_file.name}")
+                return True
 
         self.log(f"❌ Échec RVZ : {source_file.name}")
         return False
 
+    def _convert_input(self, input_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        if self.should_stop:
+            return None
+        if self._convert_file(input_file, Path(self.dest_folder)):
+            return True
+        return False
+
     def convert(self) -> dict:
         """Convertit ISO->RVZ ou RVZ->ISO avec extraction d'archives."""
         dest_path = Path(self.dest_folder)
@@ -73,57 +91,24 @@ class RvzHandler(ConversionHandler):
                 progress_label = "Traitement [GC/WII] RVZ > ISO"
             else:
                 self.log(f"🎮 Traitement de {len(source_files)} source(s) ISO")
+                self.log_compression_profile()
                 progress_label = "Traitement ISO > RVZ"
 
-            converted = 0
-            errors = 0
-            total_sources = max(1, len(source_files))
-
-            for i, (source_item, extract_type) in enumerate(source_files):
-                if self.check_should_stop():
-                    break
-
-                self.progress((i / total_sources) * 100, f"{progress_label} {i+1}/{len(source_files)}")
-
-                if extract_type is None:
-                    input_files = [source_item]
-                    self.log(f"📄 Traitement direct: {source_item.name}")
-                elif extract_type == "archive":
-                    self.log(f"📦 Extraction de l'archive: {source_item.name}")
-                    try:
-                        extracted_folder = self.extract_single_archive(source_item)
-                        input_files = self._archive_files(extracted_folder)
-                        if self.direction == "rvz_to_iso":
-                            self.log(f"📁 Trouvé {len(input_files)} RVZ dans l'archive")
-                        else:
-                            self.log(f"📁 Trouvé {len(input_files)} ISOs dans l'archive")
-                    except Exception as e:
-                        self.log(f"❌ Échec extraction {source_item.name}: {str(e)}")
-                        errors += 1
-                        continue
-
-                for input_file in input_files:
-                    if self.check_should_stop():
-                        break
-
-                    if self._convert_file(input_file, dest_path):
-                        converted += 1
-                        if extract_type is None:
-                            self.delete_source_after_success(input_file)
-                    else:
-                        errors += 1
-
-                if self.check_should_stop():
-                    break
+            converted, errors = self.run_batch(
+                source_files, self._archive_files, self._convert_input, progress_label
+            )
 
             if self.should_stop:
                 self.log("🛑 Conversion arrêtée par l'utilisateur")
 
-            return {
+            results = {
                 "converted_games": converted,
                 "error_count": errors,
                 "total_files": len(source_files),
                 "stopped": self.should_stop
             }
+            if self.direction != "rvz_to_iso":
+                results["compression_profile"] = self.compression_report()
+            return results
         finally:
             self.cleanup_temp_folder()
@@ -0,0 +1,169 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .base import DescriptorTrack, read_descriptor
+from .cdrom import ECC_P_OFFSET, SECTOR_SIZE, SYNC_HEADER
+from .sectors import ecc_generate_batch, edc_many
+
+# Contrôle des secteurs bruts des pistes de données d'un CUE/GDI avant conversion: motif de
+# synchronisation, en-tête (mode, sous-en-tête Mode 2), continuité des adresses MSF, EDC et
+# ECC. Les fichiers sont projetés en mémoire (np.memmap) et vérifiés par lots de secteurs.
+
+ERROR_KINDS = ("sync", "header", "msf", "edc", "ecc")
+_CHECK_BATCH = 4096
+_SYNC = np.frombuffer(SYNC_HEADER, dtype=np.uint8)
+_FORM2_FLAG = 0x20
+_NO_ADDRESS = -(1 << 40)
+
+
+class SectorCheckStopped(Exception):
+    """Arrêt demandé pendant un contrôle de secteurs."""
+
+
+class TrackReport:
+    """Résultat du contrôle d'une piste: secteurs lus, secteurs en erreur et erreurs par type."""
+    __slots__ = ("number", "name", "mode", "sectors", "bad_sectors", "errors")
+
+    def __init__(self, track: DescriptorTrack):
+        self.number = track.number
+        self.name = track.name
+        self.mode = track.mode
+        self.sectors = 0
+        self.bad_sectors = 0
+        self.errors: Dict[str, int] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return {"file": self.name, "mode": self.mode, "sectors": self.sectors,
+                "bad_sectors": self.bad_sectors, "errors": dict(self.errors)}
+
+
+def _stored_edc(sectors: np.ndarray, offset: int) -> np.ndarray:
+    return np.ascontiguousarray(sectors[:, offset:offset + 4]).view("<u4").ravel()
+
+
+def _bcd(values: np.ndarray):
+    """Octets BCD -> (valeurs, validité)."""
+    high, low = values >> 4, values & 0x0F
+    return high.astype(np.int64) * 10 + low, (high <= 9) & (low <= 9)
+
+
+def check_raw_sectors(sectors: np.ndarray, mode: int) -> Dict[str, np.ndarray]:
+    """Contrôle un lot de secteurs bruts (N x 2352) d'une piste Mode 1 ou Mode 2.
+
+    Renvoie un masque par type d'erreur (sauf msf) et 'address', la position MSF lue dans
+    l'en-tête en trames (-1 si illisible), pour le contrôle de continuité de toute la piste.
+    """
+    sync_bad = (sectors[:, :12] != _SYNC).any(axis=1)
+    minutes, minutes_ok = _bcd(sectors[:, 12])
+    seconds, seconds_ok = _bcd(sectors[:, 13])
+    frames, frames_ok = _bcd(sectors[:, 14])
+    address_ok = minutes_ok & seconds_ok & frames_ok & (seconds < 60) & (frames < 75)
+    header_bad = ~address_ok | (sectors[:, 15] != mode)
+    if mode == 2:
+        header_bad |= (sectors[:, 16:20] != sectors[:, 20:24]).any(axis=1)
+    readable = ~(sync_bad | header_bad)
+
+    edc_bad = np.zeros(len(sectors), dtype=bool)
+    ecc_bad = np.zeros(len(sectors), dtype=bool)
+    if mode == 1:
+        protected = readable
+        edc_bad[readable] = edc_many(sectors[readable, :0x810]) != _stored_edc(sectors[readable], 0x810)
+    else:
+        form2 = readable & ((sectors[:, 18] & _FORM2_FLAG) != 0)
+        protected = readable & ~form2
+        edc_bad[protected] = edc_many(sectors[protected, 16:0x818]) != _stored_edc(sectors[protected], 0x818)
+        # Form 2: EDC facultatif (0 = absent)
+        stored = _stored_edc(sectors[form2], 0x92C)
+        edc_bad[form2] = (stored != 0) & (edc_many(sectors[form2, 16:0x92C]) != stored)
+    if protected.any():
+        rebuilt = sectors[protected]  # Copie (indexation par masque)
+        ecc_generate_batch(rebuilt)
+        ecc_bad[protected] = (rebuilt[:, ECC_P_OFFSET:] != sectors[protected, ECC_P_OFFSET:]).any(axis=1)
+
+    address = np.where(address_ok, (minutes * 60 + seconds) * 75 + frames, -1)
+    return {"sync": sync_bad, "header": header_bad, "edc": edc_bad, "ecc": ecc_bad, "address": address}
+
+
+def _track_ranges(tracks: List[DescriptorTrack]) -> List[tuple]:
+    """(piste, fichier, premier secteur, nombre de secteurs ou None jusqu'à la fin du fichier)."""
+    ranges = []
+    for index, track in enumerate(tracks):
+        start = track.start or 0
+        following = tracks[index + 1] if index + 1 < len(tracks) else None
+        count = None
+        if following is not None and following.name == track.name and following.start is not None:
+            count = max(0, following.start - start)
+        ranges.append((track, track.path, start, count))
+    return ranges
+
+
+def check_descriptor(
+    descriptor_path: Path,
+    should_stop: Optional[Callable[[], bool]] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> List[TrackReport]:
+    """Contrôle toutes les pistes d'un CUE/GDI; les pistes audio et non brutes ne sont que mesurées."""
+    descriptor_path = Path(descriptor_path)
+    ranges = _track_ranges(read_descriptor(descriptor_path, strict=False).tracks)
+    total = sum(path.stat().st_size for path in {item[1] for item in ranges} if path) or 1
+    done = 0
+    reports = []
+    for track, path, start, count in ranges:
+        report = TrackReport(track)
+        reports.append(report)
+        if path is None:
+            report.errors["missing"] = 1
+            continue
+        size = path.stat().st_size
+        available = size // track.sector_size - start
+        if count is None:
+            count = available
+            if size % track.sector_size:
+                report.errors["size"] = 1
+        if count > available or count < 0:
+            report.errors["size"] = 1
+            count = max(0, available)
+        report.sectors = count
+        if not count or not track.is_data or track.sector_size != SECTOR_SIZE:
+            done += count * track.sector_size
+            continue
+
+        mode = 2 if track.mode.startswith("MODE2") else 1
+        data = np.memmap(path, dtype=np.uint8, mode="r", offset=start * SECTOR_SIZE, shape=(count, SECTOR_SIZE))
+        bad_batches, lba_batches = [], []
+        counts = dict.fromkeys(ERROR_KINDS, 0)
+        for first in range(0, count, _CHECK_BATCH):
+            if should_stop and should_stop():
+                raise SectorCheckStopped()
+            batch = np.asarray(data[first:first + _CHECK_BATCH])
+            result = check_raw_sectors(batch, mode)
+            bad = np.zeros(len(batch), dtype=bool)
+            for kind in ("sync", "header", "edc", "ecc"):
+                counts[kind] += int(result[kind].sum())
+                bad |= result[kind]
+            bad_batches.append(bad)
+            # Adresse du premier secteur de la piste d'après chaque secteur lisible
+            address = result["address"]
+            lba_batches.append(np.where(address >= 0, address - np.arange(first, first + len(batch)), _NO_ADDRESS))
+            done += len(batch) * SECTOR_SIZE
+            if progress:
+                progress(done * 100 / total)
+        del data
+
+        bad = np.concatenate(bad_batches)
+        bases = np.concatenate(lba_batches)
+        readable = bases != _NO_ADDRESS
+        if readable.any():
+            values, occurrences = np.unique(bases[readable], return_counts=True)
+            msf_bad = readable & (bases != values[occurrences.argmax()])
+            counts["msf"] = int(msf_bad.sum())
+            bad |= msf_bad
+        report.bad_sectors = int(bad.sum())
+        report.errors.update({kind: value for kind, value in counts.items() if value})
+    return reports
@@ -0,0 +1,160 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+from .cdrom import ECC_P_OFFSET, ECC_P_SIZE, ECC_Q_OFFSET, ECC_Q_SIZE, MODE_OFFSET, SECTOR_SIZE, _ECC_B
+
+# EDC et ECC de secteurs CD bruts calculés avec NumPy, par lots (tableaux N x 2352): chaque
+# étape traite la même position de tous les secteurs du lot, au lieu d'une boucle par octet.
+
+_EDC_POLY = 0xD8018001
+_EDC_ROW_BATCH = 1024
+
+
+def _edc_step(edc: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    return (edc >> 8) ^ lut[edc & 0xFF]
+
+
+def _edc_tables() -> Tuple[np.ndarray, np.ndarray]:
+    lut = np.arange(256, dtype=np.int64)
+    for _ in range(8):
+        lut = (lut >> 1) ^ np.where(lut & 1, _EDC_POLY, 0)
+    # Deux octets par étape: table indexée par les 16 bits de poids faible de l'EDC
+    pairs = _edc_step(_edc_step(np.arange(65536, dtype=np.int64), lut), lut)
+    return lut, pairs
+
+
+_EDC_LUT, _EDC_PAIRS = _edc_tables()
+_EDC_LUT_LIST: List[int] = _EDC_LUT.tolist()
+
+
+def edc_many(blocks: np.ndarray) -> np.ndarray:
+    """EDC de chaque ligne d'un tableau uint8 (N x L), en uint32."""
+    count, length = blocks.shape
+    if length % 2:
+        # Un zéro en tête ne change pas un EDC parti de zéro
+        blocks = np.concatenate([np.zeros((count, 1), dtype=np.uint8), blocks], axis=1)
+    result = np.empty(count, dtype=np.uint32)
+    for start in range(0, count, _EDC_ROW_BATCH):
+        rows = np.ascontiguousarray(blocks[start:start + _EDC_ROW_BATCH])
+        words = rows.view("<u2").T.astype(np.int64)
+        edc = np.zeros(len(rows), dtype=np.int64)
+        index = np.empty_like(edc)
+        value = np.empty_like(edc)
+        for column in words:
+            np.bitwise_xor(edc, column, out=index)
+            index &= 0xFFFF
+            _EDC_PAIRS.take(index, out=value)
+            edc >>= 16
+            edc ^= value
+        result[start:start + len(rows)] = edc
+    return result
+
+
+@lru_cache(maxsize=None)
+def _edc_shift_tables(length: int) -> Tuple[List[int], ...]:
+    """Contribution de chaque octet d'un EDC courant après `length` (>= 4) octets nuls."""
+    trailing = _EDC_LUT
+    for _ in range(length - 4):
+        trailing = _edc_step(trailing, _EDC_LUT)
+    tables = [trailing]
+    for _ in range(3):
+        tables.append(_edc_step(tables[-1], _EDC_LUT))
+    return tuple(table.tolist() for table in reversed(tables))
+
+
+def edc_shift(edc: int, length: int) -> int:
+    """EDC courant prolongé de `length` octets nuls: EDC(A + B) = edc_shift(EDC(A), len(B)) ^ EDC(B)."""
+    if length < 4:
+        for _ in range(length):
+            edc = (edc >> 8) ^ _EDC_LUT_LIST[edc & 0xFF]
+        return edc
+    t0, t1, t2, t3 = _edc_shift_tables(length)
+    return t0[edc & 0xFF] ^ t1[(edc >> 8) & 0xFF] ^ t2[(edc >> 16) & 0xFF] ^ t3[edc >> 24]
+
+
+def edc_shift_many(edcs: np.ndarray, length: int) -> np.ndarray:
+    """edc_shift appliqué à un tableau d'EDC (length >= 4)."""
+    tables = [np.array(table, dtype=np.uint32) for table in _edc_shift_tables(length)]
+    edcs = edcs.astype(np.int64)
+    return (
+        tables[0][edcs & 0xFF] ^ tables[1][(edcs >> 8) & 0xFF]
+        ^ tables[2][(edcs >> 16) & 0xFF] ^ tables[3][edcs >> 24]
+    )
+
+
+def edc_update(edc: int, data) -> int:
+    """Prolonge un EDC courant sur des octets quelconques (somme de contrôle d'un fichier ECM)."""
+    size = len(data)
+    if size < 256:
+        for byte in bytes(data):
+            edc = (edc >> 8) ^ _EDC_LUT_LIST[(edc ^ byte) & 0xFF]
+        return edc
+    buf = np.frombuffer(data, dtype=np.uint8)
+    pad = -size % SECTOR_SIZE
+    if pad:
+        buf = np.concatenate([np.zeros(pad, dtype=np.uint8), buf])
+    row_edcs = edc_many(buf.reshape(-1, SECTOR_SIZE)).tolist()
+    edc = edc_shift(edc, SECTOR_SIZE - pad) ^ row_edcs[0]
+    for row_edc in row_edcs[1:]:
+        edc = edc_shift(edc, SECTOR_SIZE) ^ row_edc
+    return edc
+
+
+def store_edc(sectors: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Écrit l'EDC des octets [start:end] de chaque secteur à l'offset end; renvoie les EDC."""
+    edcs = edc_many(sectors[:, start:end])
+    sectors[:, end:end + 4] = edcs.astype("<u4").view(np.uint8).reshape(-1, 4)
+    return edcs
+
+
+# --- ECC (codes P et Q) ----------------------------------------------------------------------
+
+_B = np.frombuffer(_ECC_B, dtype=np.uint8)
+_ECC_SOURCE_SIZE = ECC_P_OFFSET - 12          # En-tête + données: 2064 octets
+# Vecteurs Q: 52 diagonales de 43 octets dans en-tête + données + code P (2236 octets)
+_Q_INDEX = np.array([
+    [((major >> 1) * 86 + (major & 1) + 88 * minor) % (_ECC_SOURCE_SIZE + ECC_P_SIZE) for major in range(52)]
+    for minor in range(43)
+]).ravel()
+_LOW_BITS = np.uint64(0x7F7F7F7F7F7F7F7F)
+_HIGH_BITS = np.uint64(0x0101010101010101)
+_ECC_POLY = np.uint64(0x1D)
+_ONE = np.uint64(1)
+_SEVEN = np.uint64(7)
+
+
+def _ecc_double(words: np.ndarray) -> np.ndarray:
+    """Multiplication par 2 dans GF(2^8) de 8 octets par mot de 64 bits (table _ECC_F de cdrom)."""
+    return ((words & _LOW_BITS) << _ONE) ^ (((words >> _SEVEN) & _HIGH_BITS) * _ECC_POLY)
+
+
+def _ecc_block(vectors: np.ndarray, majors: int) -> np.ndarray:
+    """Code (P ou Q) de vecteurs mineurs x N x majeurs: les deux moitiés concaténées."""
+    count, minors = vectors.shape[1], vectors.shape[0]
+    padded = np.zeros((minors, count, -(-majors // 8) * 8), dtype=np.uint8)
+    padded[:, :, :majors] = vectors
+    words = padded.view(np.uint64)
+    ecc_a = np.zeros(words.shape[1:], dtype=np.uint64)
+    ecc_b = np.zeros_like(ecc_a)
+    for column in words:
+        ecc_b ^= column
+        ecc_a ^= column
+        ecc_a = _ecc_double(ecc_a)
+    ecc_a = _B[(_ecc_double(ecc_a) ^ ecc_b).view(np.uint8)[:, :majors]]
+    return np.concatenate([ecc_a, ecc_a ^ ecc_b.view(np.uint8)[:, :majors]], axis=1)
+
+
+def ecc_generate_batch(sectors: np.ndarray):
+    """Régénère les codes ECC P et Q de secteurs bruts (tableau N x 2352, modifié sur place)."""
+    count = len(sectors)
+    source = sectors[:, 12:ECC_P_OFFSET].copy()
+    # En mode 2, les 4 octets d'adresse sont comptés comme nuls (comme cdrom.ecc_generate)
+    source[sectors[:, MODE_OFFSET] == 2, :4] = 0
+    p_code = _ecc_block(source.reshape(count, 24, 86).transpose(1, 0, 2), 86)
+    sectors[:, ECC_P_OFFSET:ECC_P_OFFSET + ECC_P_SIZE] = p_code
+    q_vectors = np.concatenate([source, p_code], axis=1).take(_Q_INDEX, axis=1)
+    sectors[:, ECC_Q_OFFSET:ECC_Q_OFFSET + ECC_Q_SIZE] = _ecc_block(
+        q_vectors.reshape(count, 43, 52).transpose(1, 0, 2), 52
+    )
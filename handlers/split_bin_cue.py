@@ -0,0 +1,168 @@
+from .base import ConversionHandler, DescriptorError, DescriptorSheet, read_descriptor
+from .cdrom import msf
+from .merge_bin_cue import CueMergeError, CueMergeUnsupported, MergeStopped, copy_range
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+# Découpage natif d'un BIN unique (sortie de chdman extractcd) en un BIN par piste, façon Redump:
+# chaque piste va de son premier INDEX (00 s'il existe) au premier INDEX de la suivante, et ses
+# INDEX sont réécrits relativement au début de son fichier. Les plages sont copiées sans passer
+# par Python quand le système le permet (copy_file_range / sendfile).
+
+
+def track_file_name(stem: str, number: int, track_count: int) -> str:
+    """Nom Redump d'une piste: 'Jeu (Track 2).bin', ou 'Jeu (Track 02).bin' à partir de 10 pistes."""
+    return f"{stem} (Track {number:02d}).bin" if track_count >= 10 else f"{stem} (Track {number}).bin"
+
+
+def plan_cue_split(cue_path: Path, stem: str, sheet: Optional[DescriptorSheet] = None
+                   ) -> Tuple[str, Path, List[Tuple[str, int, int]]]:
+    """Fiche découpée, BIN source et plages à copier [(nom du BIN de piste, offset, octets)].
+
+    sheet: la fiche déjà lue par read_descriptor (sinon elle est lue ici). Lève
+    CueMergeUnsupported si la fiche n'a pas un seul FILE BINARY, CueMergeError si elle est
+    invalide ou incohérente avec la taille du BIN.
+    """
+    if sheet is None:
+        try:
+            sheet = read_descriptor(cue_path)
+        except DescriptorError as e:
+            raise CueMergeError(str(e)) from e
+    if len(sheet.file_entries) > 1:
+        raise CueMergeUnsupported("déjà un fichier par piste")
+    entry = sheet.file_entries[0]
+    if entry.type != "BINARY":
+        raise CueMergeUnsupported(f"fichier {entry.type or '?'}")
+    if entry.path.suffix.lower() == ".ecm":
+        raise CueMergeUnsupported(f"fichier ECM {entry.path.name}")
+    tracks = sheet.tracks
+    if len(tracks) == 1:
+        raise CueMergeUnsupported("une seule piste")
+    source = entry.path
+
+    # Début de chaque piste en trames dans le BIN (0 pour la première: rien n'est perdu)
+    bases = [0] + [track.start for track in tracks[1:]]
+    ranges: List[Tuple[str, int, int]] = []
+    offset = 0
+    for index, track in enumerate(tracks):
+        if index + 1 < len(tracks):
+            length = (bases[index + 1] - bases[index]) * track.sector_size
+        else:
+            length = source.stat().st_size - offset
+            if length % track.sector_size:
+                raise CueMergeError(f"taille de {source.name} incohérente avec la fiche")
+        if length <= 0:
+            raise CueMergeError(f"piste {track.number} vide")
+        ranges.append((track_file_name(stem, track.number, len(tracks)), offset, length))
+        offset += length
+    if offset > source.stat().st_size:
+        raise CueMergeError(f"{source.name} plus court que la fiche")
+
+    # Lignes d'origine: l'en-tête (sans le FILE) puis, par piste, de son TRACK au suivant,
+    # avec les INDEX réécrits depuis le début du BIN de la piste
+    index_at = {index.line: (index, base) for track, base in zip(tracks, bases) for index in track.indexes}
+    track_at = {track.line: name for track, (name, _, _) in zip(tracks, ranges)}
+    lines = []
+    for number, raw in enumerate(sheet.lines):
+        if number == entry.line:
+            continue
+        if number in track_at:
+            lines.append(f'FILE "{track_at[number]}" BINARY')
+        if number in index_at:
+            index, base = index_at[number]
+            indent = raw[:len(raw) - len(raw.lstrip())]
+            lines.append(f"{indent}INDEX {index.number:02d} {msf(index.frames - base)}")
+        else:
+            lines.append(raw)
+    return "\n".join(lines) + "\n", source, ranges
+
+
+class SplitBinCueHandler(ConversionHandler):
+    """Handler pour découper un BIN/CUE à fichier unique en un BIN par piste (format Redump).
+
+    Plusieurs disques sont découpés en parallèle (max_jobs); les fiches qui ont déjà un fichier
+    par piste, ou une seule piste, sont ignorées."""
+    def archive_member_extensions(self) -> Set[str]:
+        return {".cue"}
+
+    def job_outputs(self, cue_file: Path) -> List[Path]:
+        dest_path = Path(self.dest_folder)
+        outputs = [dest_path / cue_file.name]
+        try:
+            _, _, ranges = plan_cue_split(cue_file, cue_file.stem)
+        except (OSError, CueMergeError):
+            return outputs
+        return outputs + [dest_path / name for name, _, _ in ranges]
+
+    def _archive_inputs(self, extracted_folder: Path) -> List[Path]:
+        return [p for p in extracted_folder.iterdir() if p.is_file() and p.suffix.lower() == ".cue"]
+
+    def _convert_input(self, cue_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        if self.should_stop:
+            return None
+        cue_out = Path(self.dest_folder) / cue_file.name
+        if cue_out.resolve() == cue_file.resolve():
+            self.log(f"❌ Destination = source : {cue_file.name} serait écrasé, choisissez un autre dossier")
+            return False
+        if cue_out.exists():
+            self.log(f"⏭️ Déjà découpé : {cue_out.name}")
+            return None
+
+        try:
+            sheet = read_descriptor(cue_file)
+            cue_text, source, ranges = plan_cue_split(cue_file, cue_file.stem, sheet)
+        except CueMergeUnsupported as e:
+            self.log(f"⏭️ Pas de découpage ({e}) : {cue_file.name}")
+            return None
+        except (OSError, DescriptorError, CueMergeError) as e:
+            self.log(f"❌ Fiche CUE invalide ({cue_file.name}) : {e}")
+            return False
+
+        total = sum(length for _, _, length in ranges)
+        done = [0]
+        report_progress = self.max_jobs <= 1
+
+        def on_chunk(count: int):
+            if self.should_stop:
+                raise MergeStopped()
+            done[0] += count
+            if report_progress and total:
+                percent = done[0] * 100 / total
+                self.progress(percent, f"{cue_file.name}: {percent:.1f}%")
+
+        self.log(f"✂️ Découpage en {len(ranges)} pistes : {cue_file.name}")
+        with self.staged_outputs() as staging:
+            try:
+                with open(source, "rb", buffering=0) as src:
+                    for name, offset, length in ranges:
+                        with open(staging.path / name, "wb", buffering=0) as out:
+                            copy_range(src.fileno(), out.fileno(), offset, length, on_chunk, source.name)
+                with open(staging.path / cue_out.name, "w", encoding=sheet.encoding, newline="\n") as cue:
+                    cue.write(cue_text)
+            except MergeStopped:
+                return False
+            except (OSError, CueMergeError) as e:
+                self.log(f"❌ Échec découpage ({cue_file.name}) : {e}")
+                return False
+            staging.commit()
+        self.log(f"✅ Découpé : {cue_file.name} → {len(ranges)} pistes")
+        return True
+
+    def convert(self) -> dict:
+        """Découpe chaque fiche CUE du dossier source (plusieurs disques en parallèle)."""
+        dest_path = Path(self.dest_folder)
+        dest_path.mkdir(exist_ok=True)
+        try:
+            source_files = self.get_multiple_source_files([".cue"])
+            self.log(f"📁 Fiches CUE détectées : {len(source_files)}")
+            split, errors = self.run_batch(source_files, self._archive_inputs, self._convert_input, "Découpage")
+            if self.should_stop:
+                self.log("🛑 Découpage arrêté par l'utilisateur")
+            return {
+                "split_games": split,
+                "error_count": errors,
+                "total_files": len(source_files),
+                "stopped": self.should_stop
+            }
+        finally:
+            self.cleanup_temp_folder()
@@ -1,8 +1,11 @@
+import os
 from .base import ConversionHandler
 from pathlib import Path
+from typing import List, Optional, Set
 
 class SquashFSHandler(ConversionHandler):
     """Handler pour compression/wSquashFS Extraction"""
+    compression_family = "squashfs"
 
     def _is_supported_wsquashfs_folder(self, folder: Path) -> bool:
         name = folder.name.lower()
@@ -32,7 +35,7 @@ class SquashFSHandler(ConversionHandler):
             for item in source_path.iterdir():
                 if item.is_dir():
                     if self._is_supported_wsquashfs_folder(item):
-                        items_to_compress.append((item, None, "folder"))
+                        items_to_compress.append((item, None))
                         self.log(f"📁 Dossier trouvé: {item.name}")
                     else:
                         self.log(f"⏭️ Dossier ignoré (suffixe non supporté): {item.name}")
@@ -49,32 +52,45 @@ class SquashFSHandler(ConversionHandler):
                 }
 
             self.log(f"📦 Compression de {len(items_to_compress)} éléments")
-            compressed = 0
-            errors = 0
-            for i, (source_item, extract_type, item_type) in enumerate(items_to_compress):
-                if self.check_should_stop():
-                    break
-                if isinstance(source_item, str):
-                    source_item = Path(source_item)
-                self.progress((i / len(items_to_compress)) * 100, f"Compression {i+1}/{len(items_to_compress)}")
-                if item_type == "folder":
-                    self.log(f"📁 Compression dossier: {source_item.name}")
-                    output_ext = self._get_output_extension_for_folder(source_item)
-                    squashfs_file = dest_path / f"{source_item.name}{output_ext}"
-                    if self._compress_folder(source_item, squashfs_file):
-                        compressed += 1
-                    else:
-                        errors += 1
+            self.log_compression_profile()
+            compressed, errors = self.run_batch(
+                items_to_compress,
+                lambda _folder: [],
+                self._compress_input,
+                "Compression",
+            )
             if self.should_stop:
                 self.log("🛑 Compression arrêtée par l'utilisateur")
             return {
                 "converted_games": compressed,
                 "error_count": errors,
                 "total_files": len(items_to_compress),
-                "stopped": self.should_stop
+                "stopped": self.should_stop,
+                "compression_profile": self.compression_report(),
             }
         finally:
             self.cleanup_temp_folder()
+    def job_outputs(self, input_file: Path) -> List[Path]:
+        if input_file.is_dir():
+            return [Path(self.dest_folder) / f"{input_file.name}{self._get_output_extension_for_folder(input_file)}"]
+        return [Path(self.dest_folder) / input_file.stem]
+    def job_size(self, source_path: Path) -> int:
+        """Un dossier .pc/.ps3 pèse la somme de ses fichiers (gensquashfs les lit tous)."""
+        if not source_path.is_dir():
+            return super().job_size(source_path)
+        total = 0
+        for root, _dirs, files in os.walk(source_path, onerror=lambda e: None):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+    def _compress_input(self, folder: Path, extract_type: Optional[str]) -> bool:
+        self.log(f"📁 Compression dossier: {folder.name}")
+        output_ext = self._get_output_extension_for_folder(folder)
+        squashfs_file = Path(self.dest_folder) / f"{folder.name}{output_ext}"
+        return self._compress_folder(folder, squashfs_file)
     def _compress_folder(self, folder_path: Path, output_file: Path) -> bool:
         if output_file.exists():
             self.log(f"⏭️ Archive déjà existante : {output_file.name}")
@@ -82,77 +98,30 @@ class SquashFSHandler(ConversionHandler):
         if self.check_should_stop():
             return False
         self.log(f"📦 Compression du dossier: {folder_path.name}")
-        # IMPORTANT: pour gensquashfs, le fichier de sortie DOIT être le DERNIER argument
-        args = [
-            "--pack-dir", str(folder_path),
-            "--compressor", "zstd",
-            "--block-size", "1048576",
-            "--num-jobs", "8",
-            "--force",  # écrase si existe
-            str(output_file)
-        ]
-        self.log(f"🔧 Commande: gensquashfs.exe {' '.join(args)}")
-        if self.run_tool("gensquashfs.exe", args):
-            self.log(f"✅ Compressé : {folder_path.name} → {output_file.name}")
-            return True
-        else:
-            self.log(f"❌ Échec compression : {folder_path.name}")
-            return False
+        with self.staged_outputs(output_file.parent) as staging:
+            # IMPORTANT: pour gensquashfs, le fichier de sortie DOIT être le DERNIER argument
+            args = [
+                "--pack-dir", str(folder_path),
+                *self.tool_compression_args("gensquashfs.exe", "squashfs"),
+                "--force",  # écrase si existe
+                str(staging.path / output_file.name)
+            ]
+            self.log(f"🔧 Commande: gensquashfs.exe {' '.join(args)}")
+            if self.run_tool("gensquashfs.exe", args):
+                staging.commit()
+                self.log(f"✅ Compressé : {folder_path.name} → {output_file.name}")
+                return True
+        self.log(f"❌ Échec compression : {folder_path.name}")
+        return False
     def extract(self) -> dict:
         dest_path = Path(self.dest_folder)
         dest_path.mkdir(exist_ok=True)
         try:
             source_files = self.get_all_source_files_extract([".wsquashfs", ".squashfs"])
             self.log(f"📂 Traitement de {len(source_files)} sources SquashFS")
-            extracted = 0
-            errors = 0
-            for i, (source_item, extract_type) in enumerate(source_files):
-                if self.check_should_stop():
-                    break
-                if isinstance(source_item, str):
-                    source_item = Path(source_item)
-                self.progress((i / len(source_files)) * 100, f"Extraction {i+1}/{len(source_files)}")
-                if extract_type is None:
-                    squashfs_files = [source_item]
-                    self.log(f"📄 Extraction directe: {source_item.name}")
-                elif extract_type == "archive":
-                    self.log(f"📦 Extraction de l'archive: {source_item.name}")
-                    try:
-                        extracted_folder = self.extract_single_archive(source_item)
-                        squashfs_files = [
-                            p for p in extracted_folder.iterdir()
-                            if p.is_file() and p.suffix.lower() in {".wsquashfs", ".squashfs"}
-                        ]
-                        self.log(f"📁 Trouvé {len(squashfs_files)} fichiers SquashFS dans l'archive")
-                    except Exception as e:
-                        self.log(f"❌ Échec extraction archive {source_item.name}: {str(e)}")
-                        errors += 1
-                        continue
-                for squashfs_file in squashfs_files:
-                    if self.check_should_stop():
-                        break
-                    if isinstance(squashfs_file, str):
-                        squashfs_file = Path(squashfs_file)
-                    extract_dir = dest_path / squashfs_file.stem
-                    if extract_dir.exists():
-                        self.log(f"⏭️ Dossier déjà extrait : {extract_dir.name}")
-                        continue
-                    args = [
-                        "--unpack-path", "/",
-                        "--unpack-root", str(extract_dir),
-                        str(squashfs_file)
-                    ]
-                    self.log(f"🔧 Commande: unsquashfs.exe {' '.join(args)}")
-                    if self.run_tool("unsquashfs.exe", args):
-                        extracted += 1
-                        self.log(f"📂 Extrait : {squashfs_file.name} → {extract_dir.name}")
-                        if extract_type is None:
-                            self.delete_source_after_success(squashfs_file)
-                    else:
-                        errors += 1
-                        self.log(f"❌ Échec extraction : {squashfs_file.name}")
-                if self.check_should_stop():
-                    break
+            extracted, errors = self.run_batch(
+                source_files, self._archive_squashfs_files, self._extract_input, "Extraction"
+            )
             if self.should_stop:
                 self.log("🛑 Extraction arrêtée par l'utilisateur")
             return {
@@ -163,6 +132,33 @@ class SquashFSHandler(ConversionHandler):
             }
         finally:
             self.cleanup_temp_folder()
+    def archive_member_extensions(self) -> Set[str]:
+        return {".wsquashfs", ".squashfs"}
+    def _archive_squashfs_files(self, extracted_folder: Path) -> List[Path]:
+        return [
+            p for p in extracted_folder.iterdir()
+            if p.is_file() and p.suffix.lower() in {".wsquashfs", ".squashfs"}
+        ]
+    def _extract_input(self, squashfs_file: Path, extract_type: Optional[str]) -> Optional[bool]:
+        if self.should_stop:
+            return None
+        extract_dir = Path(self.dest_folder) / squashfs_file.stem
+        if extract_dir.exists():
+            self.log(f"⏭️ Dossier déjà extrait : {extract_dir.name}")
+            return None
+        with self.staged_outputs() as staging:
+            args = [
+                "--unpack-path", "/",
+                "--unpack-root", str(staging.path / extract_dir.name),
+                str(squashfs_file)
+            ]
+            self.log(f"🔧 Commande: unsquashfs.exe {' '.join(args)}")
+            if self.run_tool("unsquashfs.exe", args):
+                staging.commit()
+                self.log(f"📂 Extrait : {squashfs_file.name} → {extract_dir.name}")
+                return True
+        self.log(f"❌ Échec extraction : {squashfs_file.name}")
+        return False
     def get_all_source_files_extract(self, file_extensions: list) -> list:
         source_path = Path(self.source_folder)
         files_list = []
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Outils exécutés sur place: leurs DLL sont à côté dans le dossier ressources
+IN_PLACE_TOOLS = {"gensquashfs.exe", "unsquashfs.exe"}
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ToolCache:
+    """Copies persistantes des outils externes, indexées par contenu et version de l'application.
+
+    Chaque outil est copié une seule fois dans <cache>/<version>/<sha256>/<outil> puis réutilisé
+    d'un lancement à l'autre. Le manifeste associe la taille+mtime de la source à son empreinte:
+    on ne relit le binaire que si la source a changé (nouvelle extraction PyInstaller par ex.),
+    et on ne le recopie que si son contenu a changé. Dans un même processus, un outil déjà
+    préparé n'est revérifié que par un stat de sa copie.
+    """
+
+    def __init__(self, root: Optional[Path] = None, app_version: str = ""):
+        if root is None:
+            base = os.getenv('LOCALAPPDATA') or os.getenv('APPDATA') or str(Path.home())
+            root = Path(base) / 'B2PC' / 'tools'
+        self.root = Path(root) / (app_version or "dev")
+        self._lock = threading.Lock()
+        self._staged: Dict[str, Tuple[Path, Tuple[int, int]]] = {}
+        self._manifest: Optional[dict] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _load_manifest(self) -> dict:
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        # Écriture atomique: plusieurs instances de B2PC peuvent partager le cache
+        tmp = self.manifest_path.with_name(f"manifest.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_text(json.dumps(self._manifest, indent=2), encoding="utf-8")
+            os.replace(tmp, self.manifest_path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def is_staged(self, tool_name: str) -> bool:
+        """Outil déjà préparé dans ce processus (sans accès disque)."""
+        return tool_name in self._staged
+
+    def stage(self, source: Path) -> Path:
+        """Renvoie le chemin exécutable de l'outil, en le copiant dans le cache si nécessaire."""
+        source = Path(source)
+        tool_name = source.name
+        if tool_name in IN_PLACE_TOOLS:
+            if tool_name not in self._staged:
+                if not source.exists():
+                    raise FileNotFoundError(tool_name)
+                self._staged[tool_name] = (source, (0, 0))
+            return source
+        with self._lock:
+            cached = self._staged.get(tool_name)
+            if cached:
+                staged, signature = cached
+                try:
+                    if _file_signature(staged) == signature:
+                        return staged
+                except OSError:
+                    pass
+                del self._staged[tool_name]
+
+            size, mtime_ns = _file_signature(source)
+            manifest = self._load_manifest()
+            entry = manifest.get(tool_name) or {}
+            if entry.get("source") == str(source) and entry.get("size") == size and entry.get("mtime_ns") == mtime_ns:
+                digest = entry["sha256"]
+            else:
+                digest = _sha256(source)
+                manifest[tool_name] = {"source": str(source), "size": size, "mtime_ns": mtime_ns, "sha256": digest}
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._save_manifest()
+
+            staged = self.root / digest[:16] / tool_name
+            if not staged.exists() or staged.stat().st_size != size:
+                staged.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(prefix=f".{tool_name}.", dir=staged.parent)
+                os.close(fd)
+                try:
+                    shutil.copy2(source, tmp_name)
+                    os.replace(tmp_name, staged)
+                except OSError:
+                    # Une autre instance vient de déposer la même copie (éventuellement en cours d'exécution)
+                    if not staged.exists() or staged.stat().st_size != size:
+                        raise
+                finally:
+                    if os.path.exists(tmp_name):
+                        os.unlink(tmp_name)
+
+            self._staged[tool_name] = (staged, _file_signature(staged))
+            return staged
+
+
+_default_cache: Optional[ToolCache] = None
+_default_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolCache:
+    """Cache partagé par tous les handlers du processus."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            from appinfo import APP_VERSION
+            _default_cache = ToolCache(app_version=APP_VERSION)
+        return _default_cache
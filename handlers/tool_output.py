@@ -0,0 +1,137 @@
+import codecs
+import locale
+import re
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+# Les outils redessinent leur progression avec \r: on découpe sur \r comme sur \n
+_LINE_BREAK = re.compile(r"[\r\n]+")
+_BARE_PERCENT = re.compile(r"^\s*\d+%\s*$")
+_GENERIC_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_RATIO = re.compile(r"(\d+)\s*/\s*(\d+)")
+
+_IMPORTANT_KEYWORDS = [
+    "complete", "completed", "finished", "done", "success",
+    "error", "failed", "warning", "exception",
+    "final ratio", "compression ratio", "total time",
+    "created", "extracted", "converted"
+]
+
+
+def _keyword_regex(keywords: List[str]) -> "re.Pattern":
+    return re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+
+
+class ToolPatterns:
+    """Motifs précompilés d'un outil: progression (par ordre de priorité) et messages importants."""
+    def __init__(self, progress: List[str], keywords: List[str]):
+        self.progress = [re.compile(p, re.IGNORECASE) for p in progress]
+        self.important = _keyword_regex(_IMPORTANT_KEYWORDS + keywords)
+
+
+TOOL_PATTERNS: Dict[str, ToolPatterns] = {
+    "chdman.exe": ToolPatterns(
+        [r"(\d+(?:\.\d+)?)%\s+complete", r"Compression:\s*(\d+(?:\.\d+)?)%", r"(\d+(?:\.\d+)?)%"],
+        ["compression complete", "final ratio", "created"],
+    ),
+    "dolphin-tool.exe": ToolPatterns(
+        [r"(\d+(?:\.\d+)?)%"],
+        ["successfully converted", "conversion complete"],
+    ),
+    "7za.exe": ToolPatterns(
+        [r"(\d+(?:\.\d+)?)%"],
+        ["everything is ok", "files", "folders"],
+    ),
+    "wbfs_file.exe": ToolPatterns(
+        [],
+        ["not a wii disc", "writing:", "done in"],
+    ),
+}
+_DEFAULT_PATTERNS = ToolPatterns([], [])
+
+
+class ToolOutputEvent:
+    """Événement issu d'une ligne de sortie: progression (percent) ou message (important)."""
+    PROGRESS = "progress"
+    MESSAGE = "message"
+
+    __slots__ = ("kind", "text", "percent", "important")
+
+    def __init__(self, kind: str, text: str, percent: Optional[float] = None, important: bool = False):
+        self.kind = kind
+        self.text = text
+        self.percent = percent
+        self.important = important
+
+
+class ToolOutputParser:
+    """Transforme les lignes d'un outil en événements typés.
+
+    generic_progress ajoute, après les motifs de l'outil, un pourcentage quelconque puis un
+    ratio « n/total » (sorties sans format de progression établi, comme ps3dec).
+    """
+    def __init__(self, tool_name: str, generic_progress: bool = False):
+        self.tool_name = tool_name
+        self.patterns = TOOL_PATTERNS.get(tool_name, _DEFAULT_PATTERNS)
+        self.generic_progress = generic_progress
+
+    def progress_of(self, line: str) -> Optional[float]:
+        # Tous les motifs de progression d'outil exigent un '%': évite les regex sur les autres lignes
+        if "%" in line:
+            for pattern in self.patterns.progress:
+                match = pattern.search(line)
+                if match:
+                    try:
+                        return float(match.group(1))
+                    except (ValueError, IndexError):
+                        continue
+            if self.generic_progress:
+                match = _GENERIC_PERCENT.search(line)
+                if match:
+                    return max(0.0, min(100.0, float(match.group(1))))
+        if self.generic_progress and "/" in line:
+            match = _RATIO.search(line)
+            if match:
+                done, total = float(match.group(1)), float(match.group(2))
+                if total > 0:
+                    return max(0.0, min(100.0, (done / total) * 100.0))
+        return None
+
+    def is_important(self, line: str) -> bool:
+        if _BARE_PERCENT.match(line):
+            return False
+        return self.patterns.important.search(line) is not None
+
+    def parse(self, line: str) -> ToolOutputEvent:
+        percent = self.progress_of(line)
+        if percent is not None:
+            return ToolOutputEvent(ToolOutputEvent.PROGRESS, line, percent=percent)
+        return ToolOutputEvent(ToolOutputEvent.MESSAGE, line, important=self.is_important(line))
+
+
+def iter_output_lines(stream: BinaryIO, chunk_size: int = 8192, encoding: Optional[str] = None) -> Iterator[str]:
+    """Lit un flux binaire par blocs et renvoie les lignes non vides au fil de l'eau.
+
+    read1 rend ce qui est disponible sans attendre un bloc complet: un pourcentage redessiné
+    avec \\r est traité dès son arrivée, sans attendre le prochain \\n.
+    """
+    decoder = codecs.getincrementaldecoder(encoding or locale.getpreferredencoding(False))(errors="replace")
+    read = getattr(stream, "read1", stream.read)
+    pending = ""
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        parts = _LINE_BREAK.split(pending + decoder.decode(chunk))
+        pending = parts.pop()
+        for part in parts:
+            part = part.strip()
+            if part:
+                yield part
+    tail = (pending + decoder.decode(b"", final=True)).strip()
+    if tail:
+        yield tail
+
+
+def iter_tool_events(stream: BinaryIO, parser: ToolOutputParser) -> Iterator[ToolOutputEvent]:
+    for line in iter_output_lines(stream):
+        yield parser.parse(line)
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import shutil
 import tempfile
 
@@ -9,6 +9,8 @@ from .base import ConversionHandler
 class WbfsIsoHandler(ConversionHandler):
     """Handler for WBFS <-> ISO conversion using wbfs_file.exe."""
 
+    # Compression profile used by the WBFS > RVZ step (dolphin-tool)
+    compression_family = "rvz"
     SUPPORTED_EXTENSIONS = (".iso", ".wbfs")
     ARCHIVE_EXTENSIONS = (".zip", ".rar", ".7z")
 
@@ -16,20 +18,19 @@ class WbfsIsoHandler(ConversionHandler):
         super().__init__(tools_path, log_callback, progress_callback)
         # Allowed values: both, iso_to_wbfs, wbfs_to_iso
         self.direction = "both"
+        # _list_convertible_files explore la racine et un niveau de sous-dossier
+        self.archive_member_depth = 1
 
     def validate_tools(self) -> bool:
         """Validate tools needed for WBFS/ISO conversion."""
-        from main import resource_path
-
-        wbfs_tool = Path(resource_path("ressources/wbfs_file.exe"))
-        if not wbfs_tool.exists():
-            self.log("❌ Outil manquant : wbfs_file.exe")
-            return False
-
+        required_tools = ["wbfs_file.exe"]
         if self.direction == "wbfs_to_rvz":
-            dolphin_tool = Path(resource_path("ressources/dolphin-tool.exe"))
-            if not dolphin_tool.exists():
-                self.log("❌ Outil manquant : dolphin-tool.exe")
+            required_tools.append("dolphin-tool.exe")
+
+        # Prepared once in the shared tool cache, then reused by run_tool
+        for tool in required_tools:
+            if not self._prepare_tool(tool, quiet_missing=True):
+                self.log(f"❌ Outil manquant : {tool}")
                 return False
 
         self.log("✅ Outils WBFS detectes")
@@ -114,6 +115,13 @@ class WbfsIsoHandler(ConversionHandler):
             return (".wbfs",)
         return self.SUPPORTED_EXTENSIONS
 
+    def archive_member_extensions(self) -> Set[str]:
+        extensions = set(self._allowed_extensions())
+        if ".wbfs" in extensions:
+            # Parties d'un WBFS découpé (jeu.wbfs, jeu.wbf1, jeu.wbf2...)
+            extensions.update(f".wbf{i}" for i in range(1, 10))
+        return extensions
+
     def _ensure_temp_extract_folder(self, dest_path: Path) -> Path:
         if self.temp_extract_folder and self.temp_extract_folder.exists():
             return self.temp_extract_folder
@@ -313,18 +321,18 @@ class WbfsIsoHandler(ConversionHandler):
             self.log(f"⏭️ RVZ deja existant : {rvz_file.name}")
             return True, rvz_file.name
 
-        args = [
-            "convert",
-            "-f", "rvz",
-            "-c", "zstd",
-            "-l", "5",
-            "-b", "131072",
-            "-i", str(iso_file),
-            "-o", str(rvz_file),
-        ]
-        if self.run_tool("dolphin-tool.exe", args, show_output=True):
-            self.log(f"🐬 Converti en RVZ : {iso_file.name}")
-            return True, rvz_file.name
+        with self.staged_outputs(dest_path) as staging:
+            args = [
+                "convert",
+                "-f", "rvz",
+                *self.tool_compression_args("dolphin-tool.exe", "rvz"),
+                "-i", str(iso_file),
+                "-o", str(staging.path / rvz_file.name),
+            ]
+            if self.run_tool("dolphin-tool.exe", args, show_output=True):
+                staging.commit()
+                self.log(f"🐬 Converti en RVZ : {iso_file.name}")
+                return True, rvz_file.name
 
         self.log(f"❌ Echec conversion ISO -> RVZ: {iso_file.name}")
         return False, None
@@ -446,6 +454,7 @@ class WbfsIsoHandler(ConversionHandler):
         dest_path.mkdir(exist_ok=True)
 
         try:
+            self.cleanup_partial_outputs(dest_path)
             source_files = self._collect_source_items()
 
             if self.direction == "iso_to_wbfs":
@@ -462,6 +471,8 @@ class WbfsIsoHandler(ConversionHandler):
                 source_label = "WBFS/ISO"
 
             self.log(f"🎮 Traitement de {len(source_files)} source(s) {source_label}")
+            if self.direction == "wbfs_to_rvz":
+                self.log_compression_profile()
 
             converted = 0
             errors = 0
@@ -526,11 +537,14 @@ class WbfsIsoHandler(ConversionHandler):
                 self.log("🛑 Conversion arretee par l'utilisateur")
 
             self.progress(100, f"Conversion {mode_label} terminee")
-            return {
+            results = {
                 "converted_games": converted,
                 "error_count": errors,
                 "total_files": len(source_files),
                 "stopped": self.should_stop,
             }
+            if self.direction == "wbfs_to_rvz":
+                results["compression_profile"] = self.compression_report()
+            return results
         finally:
             self.cleanup_temp_folder()
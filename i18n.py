@@ -0,0 +1,80 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# Langues livrées dans ressources/i18n; les messages de log sont écrits en français
+SUPPORTED_LANGUAGES = ("fr", "en", "de", "es", "it")
+SOURCE_LANGUAGE = "fr"
+
+
+class TranslationCatalog:
+    """Catalogues ressources/i18n/<langue>.json, chargés au premier usage puis gardés en cache.
+
+    Pour les logs, la table log_fragments d'une langue est compilée une fois en une seule
+    expression alternative (fragments les plus longs d'abord): chaque message est traduit
+    en un passage, quel que soit le nombre de fragments.
+    """
+
+    def __init__(self, i18n_dir: str):
+        self.i18n_dir = i18n_dir
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._log_translators: Dict[str, Optional[Tuple["re.Pattern", Dict[str, str]]]] = {}
+
+    def _load(self, language: str) -> Dict[str, Any]:
+        data = self._files.get(language)
+        if data is not None:
+            return data
+        with self._lock:
+            data = self._files.get(language)
+            if data is None:
+                data = {}
+                path = os.path.join(self.i18n_dir, f"{language}.json")
+                try:
+                    if os.path.exists(path):
+                        with open(path, 'r', encoding='utf-8') as f:
+                            loaded = json.load(f)
+                        if isinstance(loaded, dict):
+                            data = loaded
+                except Exception as e:
+                    print(f"Erreur chargement traduction {language}: {e}")
+                self._files[language] = data
+        return data
+
+    def section(self, language: str, name: str) -> Dict[str, str]:
+        table = self._load(language).get(name, {})
+        return table if isinstance(table, dict) else {}
+
+    def ui(self, language: str) -> Dict[str, str]:
+        return self.section(language, 'ui')
+
+    def _log_translator(self, language: str) -> Optional[Tuple["re.Pattern", Dict[str, str]]]:
+        if language in self._log_translators:
+            return self._log_translators[language]
+        source = self.section(SOURCE_LANGUAGE, 'log_fragments')
+        target = self.section(language, 'log_fragments')
+        mapping = {}
+        for key, fragment in source.items():
+            translated = target.get(key)
+            if fragment and translated and translated != fragment and fragment not in mapping:
+                mapping[fragment] = translated
+        compiled = None
+        if mapping:
+            # À position égale, l'alternative la plus longue doit gagner
+            ordered = sorted(mapping, key=len, reverse=True)
+            compiled = (re.compile("|".join(re.escape(fragment) for fragment in ordered)), mapping)
+        with self._lock:
+            self._log_translators[language] = compiled
+        return compiled
+
+    def translate_log(self, message: str, language: str) -> str:
+        """Remplace les fragments FR par ceux de la langue cible en conservant emojis et chiffres."""
+        if language == SOURCE_LANGUAGE or not message:
+            return message
+        compiled = self._log_translator(language)
+        if compiled is None:
+            return message
+        pattern, mapping = compiled
+        return pattern.sub(lambda match: mapping[match.group(0)], message)
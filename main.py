@@ -1,62 +1,48 @@
-APP_VERSION = "3.6.5.0"
-UPDATE_URL = "https://raw.githubusercontent.com/RetroGameSets/B2PC/refs/heads/main/ressources/last_version.json"
-DISCORD_URL = "https://discord.gg/chz59Z9Bhj"
-
 import os
 import sys
-import urllib.request
 import webbrowser
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QGridLayout, QLabel, QPushButton, QLineEdit, QTextEdit, QProgressBar,
-    QFileDialog, QDialog, QComboBox, QCheckBox
+    QGridLayout, QLabel, QPushButton, QLineEdit, QProgressBar,
+    QFileDialog, QDialog, QComboBox, QCheckBox, QSpinBox, QListView, QAbstractItemView,
+    QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont, QCursor
-from typing import Optional, Dict, Any
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QFont, QCursor, QBrush, QColor, QKeySequence, QShortcut
+from collections import deque
+from typing import Optional, Dict, List, Tuple
 import logging
 from datetime import datetime
+import multiprocessing
 import subprocess
-from handlers.chdv5 import ChdV5Handler
-from handlers.rvz import RvzHandler
-from handlers.squashfs import SquashFSHandler
-from handlers.xbox_patch import XboxPatchHandler
-from handlers.extract_chd import ExtractChdHandler
-from handlers.merge_bin_cue import MergeBinCueHandler
-from handlers.ps3 import Ps3DecryptHandler
-from handlers.wbfs_iso import WbfsIsoHandler
+import threading
+import time
+from appinfo import APP_VERSION, DISCORD_URL, resource_path, fetch_available_update
 from handlers.base import ConversionHandler
+from handlers.factory import create_operation_handler
+from handlers.profiles import BUILTIN_PROFILES, DEFAULT_PROFILE, ProfileError, load_profiles, select_profile
+from i18n import SUPPORTED_LANGUAGES, TranslationCatalog
 import json
 import re
 
-# Fonction utilitaire pour compatibilité PyInstaller
-def resource_path(relative_path):
-    """Retourne le chemin absolu vers une ressource, compatible PyInstaller."""
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path) # type: ignore
-    return os.path.join(os.path.abspath("."), relative_path)
-
-def check_for_update():
-    try:
-        with urllib.request.urlopen(UPDATE_URL, timeout=5) as response:
-            data = response.read().decode("utf-8")
-            import json
-            info = json.loads(data)
-            latest_version = info.get("version", "")
-            download_url = info.get("url", "")
-            if latest_version and latest_version != APP_VERSION:
-                import ctypes
-                msg = f"Une nouvelle version ({latest_version}) est disponible !\nTélécharger ?"
-                if ctypes.windll.user32.MessageBoxW(0, msg, "Mise à jour disponible", 1) == 1:
-                    import webbrowser
-                    webbrowser.open(download_url)
-                    sys.exit(0)  # Ferme l'application immédiatement
-    except Exception as e:
-        print(f"[Update] Impossible de vérifier la mise à jour : {e}")
-
-# Appeler le check au démarrage
-check_for_update()
+class UpdateChecker(QObject):
+    """Vérifie la mise à jour en arrière-plan: la fenêtre s'affiche sans attendre le réseau.
+
+    Thread démon: une vérification hors ligne (timeout) ne retarde pas non plus la fermeture.
+    """
+    update_available = pyqtSignal(str, str)
+
+    def start(self):
+        threading.Thread(target=self._run, name="B2PC_update_check", daemon=True).start()
+
+    def _run(self):
+        update = fetch_available_update()
+        if update:
+            try:
+                self.update_available.emit(*update)
+            except RuntimeError:
+                pass  # Fenêtre déjà fermée
 
 class LogHandler(logging.Handler):
     """Handler personnalisé pour rediriger les logs vers l'interface"""
@@ -71,17 +57,31 @@ class LogHandler(logging.Handler):
 class WorkerThread(QThread):
     """Thread worker pour les opérations de conversion avec logs réels"""
     progress_update = pyqtSignal(int, str)
-    log_message = pyqtSignal(str)
+    log_batch = pyqtSignal(list)
     finished = pyqtSignal(dict)
+    # Cadence max d'envoi vers l'interface: les logs sont regroupés, seule la dernière progression est gardée
+    SIGNAL_FLUSH_INTERVAL = 0.05  # 20 Hz
 
-    def __init__(self, operation, source_folder, dest_folder, delete_source_after_conversion=False):
+    def __init__(self, operation, source_folder, dest_folder, delete_source_after_conversion=False, max_jobs=1, archive_lookahead=1, chd_backend='chdman', parent_chds=False, sector_check='off', compression_profile=DEFAULT_PROFILE, compression_profile_overrides=None):
         super().__init__()
         self.operation = operation
         self.source_folder = source_folder
         self.dest_folder = dest_folder
         self.delete_source_after_conversion = delete_source_after_conversion
+        self.max_jobs = max_jobs
+        self.archive_lookahead = archive_lookahead
+        self.chd_backend = chd_backend
+        self.parent_chds = parent_chds
+        self.sector_check = sector_check
+        self.compression_profile = compression_profile
+        self.compression_profile_overrides = dict(compression_profile_overrides or {})
         self.log_file = None
         self.handler: Optional[ConversionHandler] = None  # Référence au handler pour pouvoir l'arrêter
+        self._signal_lock = threading.Lock()
+        self._pending_logs: List[str] = []
+        self._pending_progress: Optional[Tuple[int, str]] = None
+        self._flush_stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
         self.setup_logging()
     
     def stop_conversion(self):
@@ -131,7 +131,54 @@ class WorkerThread(QThread):
         file_handler.setFormatter(formatter)
         self.logger.addHandler(file_handler)
 
-        self.log_message.emit(f"📄 Fichier de log créé: {self.log_file.name}")
+        self.queue_log(f"📄 Fichier de log créé: {self.log_file.name}")
+
+    def queue_log(self, message: str):
+        """Met un message en attente du prochain envoi groupé vers l'interface."""
+        with self._signal_lock:
+            self._pending_logs.append(message)
+            flushing = self._flusher is not None
+        # Avant le démarrage on garde les messages; après la fin, envoi immédiat
+        if not flushing and self.isFinished():
+            self.flush_signals()
+
+    def queue_progress(self, value, text: str):
+        """Mémorise la progression: seule la plus récente est envoyée à chaque cycle."""
+        with self._signal_lock:
+            self._pending_progress = (value, text)
+            flushing = self._flusher is not None
+        if not flushing and self.isFinished():
+            self.flush_signals()
+
+    def flush_signals(self):
+        """Envoie les logs en attente (en un seul signal) puis la dernière progression."""
+        with self._signal_lock:
+            messages, self._pending_logs = self._pending_logs, []
+            progress, self._pending_progress = self._pending_progress, None
+        if messages:
+            self.log_batch.emit(messages)
+        if progress is not None:
+            self.progress_update.emit(*progress)
+
+    def _flush_loop(self):
+        while not self._flush_stop.wait(self.SIGNAL_FLUSH_INTERVAL):
+            self.flush_signals()
+
+    def _start_signal_flusher(self):
+        self._flush_stop.clear()
+        flusher = threading.Thread(target=self._flush_loop, name="B2PC_ui_flush", daemon=True)
+        with self._signal_lock:
+            self._flusher = flusher
+        flusher.start()
+
+    def _stop_signal_flusher(self):
+        """Arrête le cycle d'envoi puis vide ce qui reste (fin normale comme sur erreur)."""
+        with self._signal_lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher:
+            self._flush_stop.set()
+            flusher.join()
+        self.flush_signals()
 
     def log_both(self, message):
         """Log vers fichier ET interface"""
@@ -139,11 +186,12 @@ class WorkerThread(QThread):
         clean_message = message.encode('ascii', 'ignore').decode('ascii')
         self.logger.info(clean_message)
         
-        # Affichage interface avec emojis
-        self.log_message.emit(message)
+        # Affichage interface avec emojis (envoi groupé)
+        self.queue_log(message)
 
     def run(self):
         """Exécute la conversion"""
+        self._start_signal_flusher()
         try:
             self.log_both(f"🚀 Début de l'opération : {self.operation}")
             self.log_both(f"📁 Dossier source: {self.source_folder}")
@@ -169,16 +217,18 @@ class WorkerThread(QThread):
             else:
                 self.log_both("🎉 Opération terminée avec succès!")
             self.log_both(f"📄 Log sauvegardé: {self.log_file}")
-            
-            self.finished.emit(results)
         except Exception as e:
             error_msg = f"❌ Erreur critique : {str(e)}"
             self.log_both(error_msg)
-            self.finished.emit({'error': str(e)})
+            results = {'error': str(e)}
+        finally:
+            # Tout ce qui est en attente part avant le signal de fin
+            self._stop_signal_flusher()
+        self.finished.emit(results)
 
     def run_conversion(self):
         """Exécute une vraie conversion avec les handlers"""
-        self.progress_update.emit(10, "Initialisation des outils")
+        self.queue_progress(10, "Initialisation des outils")
         
         # Sélectionner le bon handler
         handler = None
@@ -188,66 +238,148 @@ class WorkerThread(QThread):
             self.log_both(f"🔧 {msg}")
         
         def progress_callback(progress, msg):
-            self.progress_update.emit(progress, msg)
+            self.queue_progress(progress, msg)
         
         try:
-            if self.operation == "Conversion ISO/CUE/GDI > CHD":
-                self.handler = ChdV5Handler(str(tools_path), log_callback, progress_callback)
-            elif any(k in self.operation for k in ("Extraire CHD", "Extract CHD")):
-                self.handler = ExtractChdHandler(str(tools_path), log_callback, progress_callback)
-            elif "Merge BIN/CUE" in self.operation:
-                self.handler = MergeBinCueHandler(str(tools_path), log_callback, progress_callback)
-            elif "RVZ" in self.operation and "WBFS" not in self.operation:
-                self.handler = RvzHandler(str(tools_path), log_callback, progress_callback)
-                if "[GC/WII] RVZ > ISO" in self.operation:
-                    self.handler.direction = "rvz_to_iso"
-                else:
-                    self.handler.direction = "iso_to_rvz"
-            elif "wSquashFS" in self.operation:
-                self.handler = SquashFSHandler(str(tools_path), log_callback, progress_callback)
-            elif "Xbox" in self.operation:
-                self.handler = XboxPatchHandler(str(tools_path), log_callback, progress_callback)
-            elif "PS3" in self.operation:
-                self.handler = Ps3DecryptHandler(str(tools_path), log_callback, progress_callback)
-            elif any(k in self.operation for k in ("[WII] ISO > WBFS", "[WII] WBFS > ISO", "[WII] WBFS > RVZ", "[WII] WBFS <> ISO")):
-                self.handler = WbfsIsoHandler(str(tools_path), log_callback, progress_callback)
-                if "[WII] ISO > WBFS" in self.operation:
-                    self.handler.direction = "iso_to_wbfs"
-                elif "[WII] WBFS > RVZ" in self.operation:
-                    self.handler.direction = "wbfs_to_rvz"
-                elif "[WII] WBFS > ISO" in self.operation:
-                    self.handler.direction = "wbfs_to_iso"
-            else:
-                raise ValueError(f"Handler non disponible pour: {self.operation}")
+            # Handler résolu via le registre (module importé seulement à ce moment-là)
+            self.handler, method = create_operation_handler(
+                self.operation, str(tools_path), log_callback, progress_callback
+            )
 
             # Configurer le handler
             self.handler.source_folder = self.source_folder
             self.handler.dest_folder = self.dest_folder
             self.handler.delete_source_after_conversion = self.delete_source_after_conversion
+            self.handler.max_jobs = self.max_jobs
+            self.handler.archive_lookahead = self.archive_lookahead
+            if hasattr(self.handler, 'chd_backend'):
+                self.handler.chd_backend = self.chd_backend
+            if hasattr(self.handler, 'parent_chds'):
+                self.handler.parent_chds = self.parent_chds
+            if hasattr(self.handler, 'sector_check'):
+                self.handler.sector_check = self.sector_check
+            if self.handler.compression_family:
+                try:
+                    self.handler.compression_profile = select_profile(
+                        load_profiles(), self.compression_profile,
+                        self.handler.compression_family, self.compression_profile_overrides
+                    )
+                except ProfileError as e:
+                    self.log_both(f"⚠️ {e} : profil {DEFAULT_PROFILE} utilisé")
 
             # Valider les outils
             if not self.handler.validate_tools():
                 raise Exception("Outils requis manquants")
 
             # Exécuter la conversion
-            self.progress_update.emit(20, "Conversion en cours")
-
-            # Pour SquashFSHandler, on peut appeler compress/extract selon l'opération
-            if isinstance(self.handler, SquashFSHandler):
-                if "Compression" in self.operation:
-                    results = self.handler.compress()
-                elif any(k in self.operation for k in ("Extraction", "Extract", "Décompression")):
-                    results = self.handler.extract()
-                else:
-                    results = self.handler.convert()
-            else:
-                results = self.handler.convert()
+            self.queue_progress(20, "Conversion en cours")
+
+            # convert(), ou compress()/extract() pour SquashFSHandler selon l'opération
+            results = getattr(self.handler, method)()
 
             return results
         except Exception as e:
             self.log_both(f"❌ Erreur handler réel: {e}")
             raise
 
+def log_message_category(message: str) -> str:
+    """Catégorie d'affichage d'un message (calculée une seule fois, à l'ajout)."""
+    if "❌" in message or "Erreur" in message or "Échec" in message:
+        return "error"
+    if "⚠️" in message or "erreur(s)" in message or "avec erreurs" in message:
+        return "warning"
+    if "✅" in message or "Succès" in message or "terminée" in message:
+        return "success"
+    if "⏳" in message or "🔄" in message or "Traitement" in message:
+        return "pending"
+    if "🎉" in message or "Statistiques" in message:
+        return "summary"
+    return "default"
+
+
+LOG_CATEGORY_COLORS = {
+    "error": "#dc2626",    # Rouge
+    "warning": "#eab308",  # Jaune
+    "success": "#16a34a",  # Vert
+    "pending": "#eab308",  # Jaune
+    "summary": "#8b5cf6",  # Violet
+}
+
+
+class LogListModel(QAbstractListModel):
+    """Journal affiché: tampon circulaire de lignes (texte, catégorie), ajouts par lots.
+
+    Seules les lignes visibles sont dessinées par la vue; au-delà de max_lines les plus
+    anciennes sont retirées (le fichier LOG garde l'historique complet).
+    """
+    def __init__(self, max_lines: int = 10000, parent=None):
+        super().__init__(parent)
+        self.max_lines = max(100, int(max_lines))
+        self._entries = deque()
+        self._brushes: Dict[str, QBrush] = {}
+        self.set_theme('light')
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, category = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._brushes.get(category, self._brushes["default"])
+        return None
+
+    def set_theme(self, theme_mode: str):
+        """Une couleur par catégorie; en mode accessibilité tout est monochrome."""
+        if theme_mode == 'accessibility':
+            colors = {category: "#FFFFFF" for category in LOG_CATEGORY_COLORS}
+            colors["default"] = "#FFFFFF"
+        else:
+            colors = dict(LOG_CATEGORY_COLORS)
+            # Les messages standards doivent rester lisibles en thème sombre.
+            colors["default"] = "#cbd5e1" if theme_mode == 'dark' else "#374151"
+        self._brushes = {category: QBrush(QColor(color)) for category, color in colors.items()}
+        if self._entries:
+            self.dataChanged.emit(self.index(0), self.index(len(self._entries) - 1), [Qt.ItemDataRole.ForegroundRole])
+
+    def set_max_lines(self, max_lines: int):
+        self.max_lines = max(100, int(max_lines))
+        self._trim(0)
+
+    def _trim(self, incoming: int):
+        overflow = len(self._entries) + incoming - self.max_lines
+        if overflow <= 0:
+            return
+        overflow = min(overflow, len(self._entries))
+        if overflow:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._entries.popleft()
+            self.endRemoveRows()
+
+    def append_entries(self, entries: List[Tuple[str, str]]):
+        if len(entries) > self.max_lines:
+            entries = entries[-self.max_lines:]
+        if not entries:
+            return
+        self._trim(len(entries))
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self._entries.extend(entries)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._entries.clear()
+        self.endResetModel()
+
+    def plain_text(self) -> str:
+        return "\n".join(text for text, _ in self._entries)
+
+
 class LogDialog(QDialog):
     """Dialog modal pour afficher les logs"""
     stop_requested = pyqtSignal()  # Signal pour demander l'arrêt
@@ -263,11 +395,28 @@ class LogDialog(QDialog):
 
         layout = QVBoxLayout(self)
 
-        # Zone de logs
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setFont(QFont("Consolas", 9))
-        layout.addWidget(self.log_text)
+        # Recherche / filtre (n'agit que sur la vue, pas sur l'historique)
+        self.search_input = QLineEdit()
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setPlaceholderText("Search...")
+        self.search_input.textChanged.connect(self.on_search_changed)
+        layout.addWidget(self.search_input)
+
+        # Zone de logs: modèle borné + vue virtualisée (seules les lignes visibles sont dessinées)
+        self.log_model = LogListModel(getattr(parent, 'log_max_lines', 10000), self)
+        self.log_model.set_theme(getattr(parent, 'theme_mode', 'light'))
+        self.log_proxy = QSortFilterProxyModel(self)
+        self.log_proxy.setSourceModel(self.log_model)
+        self.log_proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.log_view = QListView()
+        self.log_view.setObjectName("logView")
+        self.log_view.setModel(self.log_proxy)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setFont(QFont("Consolas", 9))
+        self.log_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.log_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        QShortcut(QKeySequence.StandardKey.Copy, self.log_view, activated=self.copy_selected_logs)
+        layout.addWidget(self.log_view)
 
         # Barre de progression
         self.progress_bar = QProgressBar()
@@ -353,44 +502,52 @@ class LogDialog(QDialog):
         self.progress_bar.setValue(100)
         self.progress_bar.setFormat(final_progress_text)
     
+    def add_logs(self, messages):
+        """Ajoute un lot de messages (envoi groupé du worker) en une seule insertion."""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        parent = self.parent()
+        main_window = parent if parent and isinstance(parent, B2PCMainWindow) else None
+
+        entries = []
+        for message in messages:
+            if main_window and not main_window.should_display_log_message(message):
+                continue
+            # Catégorie sur le message d'origine (mots-clés français), avant traduction
+            category = log_message_category(message)
+            # Traduction dynamique si interface dans une autre langue que le français
+            if main_window and main_window.language != 'fr':
+                message = main_window.translate_log_message(message)
+            entries.append((f"[{timestamp}] {message}", category))
+        if not entries:
+            return
+
+        scrollbar = self.log_view.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append_entries(entries)
+        # Ne suivre la fin que si l'utilisateur n'est pas remonté dans l'historique
+        if follow:
+            self.log_view.scrollToBottom()
+
     def add_log(self, message):
         """Ajoute un message au log avec coloration"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.add_logs([message])
 
-        parent = self.parent()
-        if parent and isinstance(parent, B2PCMainWindow):
-            if not parent.should_display_log_message(message):
-                return
+    def clear_logs(self):
+        self.log_model.clear()
 
-        # Traduction dynamique si interface en anglais
-        # Vérification stricte du type pour éviter l'avertissement de l'analyseur statique
-        if parent and isinstance(parent, B2PCMainWindow) and parent.language == 'en':
-            # Appel direct garanti par isinstance
-            message = parent.translate_log_message(message)  # type: ignore[attr-defined]
+    def apply_theme(self, theme_mode: str):
+        self.log_model.set_theme(theme_mode)
 
-        is_dark_mode = bool(parent.dark_mode) if parent and isinstance(parent, B2PCMainWindow) else False
-        is_accessibility_mode = bool(getattr(parent, 'theme_mode', '') == 'accessibility') if parent and isinstance(parent, B2PCMainWindow) else False
-        
-        # En mode accessibilité: monochrome (pas de codage couleur par type de message).
-        if is_accessibility_mode:
-            color = "#FFFFFF"
-        elif "❌" in message or "Erreur" in message or "Échec" in message:
-            color = "#dc2626"  # Rouge
-        elif "⚠️" in message or "erreur(s)" in message or "avec erreurs" in message:
-            color = "#eab308"  # Jaune
-        elif "✅" in message or "Succès" in message or "terminée" in message:
-            color = "#16a34a"  # Vert
-        elif "⏳" in message or "🔄" in message or "Traitement" in message:
-            color = "#eab308"  # Jaune
-        elif "🎉" in message or "Statistiques" in message:
-            color = "#8b5cf6"  # Violet
-        else:
-            # Les messages standards doivent rester lisibles en thème sombre.
-            color = "#cbd5e1" if is_dark_mode else "#374151"
-        
-        formatted_message = f'<span style="color: {color};">[{timestamp}] {message}</span><br>'
-        self.log_text.insertHtml(formatted_message)
-        self.log_text.ensureCursorVisible()
+    def on_search_changed(self, text: str):
+        self.log_proxy.setFilterFixedString(text)
+        if not text:
+            self.log_view.scrollToBottom()
+
+    def copy_selected_logs(self):
+        rows = sorted(index.row() for index in self.log_view.selectionModel().selectedRows())
+        lines = [self.log_proxy.index(row, 0).data() for row in rows]
+        if lines:
+            QApplication.clipboard().setText("\n".join(lines))
     
     def update_progress(self, value, text):
         """Met à jour la barre de progression"""
@@ -454,7 +611,7 @@ class LogDialog(QDialog):
                     f.write(f"{header_line}\n")
                     f.write(f"{generated_on} {datetime.now()}\n")
                     f.write("=" * 50 + "\n\n")
-                    f.write(self.log_text.toPlainText())
+                    f.write(self.log_model.plain_text())
                 
                 # Afficher confirmation
                 self.add_log(f"{saved_prefix} {Path(filename).name}")
@@ -485,6 +642,7 @@ class LogDialog(QDialog):
         self.close_button.setText(main_window.tr('ui.common.close', language=language))
         self.save_log_button.setText(main_window.tr('ui.log.save_logs', language=language))
         self.open_log_folder_button.setText(main_window.tr('ui.log.open_folder', language=language))
+        self.search_input.setPlaceholderText(main_window.tr('ui.log.search_placeholder', language=language))
 
 
 class SettingsDialog(QDialog):
@@ -494,7 +652,7 @@ class SettingsDialog(QDialog):
         super().__init__(parent)
         self.main_window = parent
         self.setModal(True)
-        self.resize(420, 330)
+        self.resize(420, 390)
 
         layout = QVBoxLayout(self)
         layout.setSpacing(14)
@@ -534,12 +692,79 @@ class SettingsDialog(QDialog):
         log_level_row.addStretch()
         layout.addLayout(log_level_row)
 
+        max_jobs_row = QHBoxLayout()
+        self.max_jobs_label = QLabel("Parallel conversions")
+        max_jobs_row.addWidget(self.max_jobs_label)
+        self.max_jobs_spin = QSpinBox()
+        self.max_jobs_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.max_jobs_spin.valueChanged.connect(self.on_max_jobs_changed)
+        max_jobs_row.addWidget(self.max_jobs_spin)
+        max_jobs_row.addStretch()
+        layout.addLayout(max_jobs_row)
+
+        lookahead_row = QHBoxLayout()
+        self.archive_lookahead_label = QLabel("Archives extracted in advance")
+        lookahead_row.addWidget(self.archive_lookahead_label)
+        self.archive_lookahead_spin = QSpinBox()
+        self.archive_lookahead_spin.setRange(0, 4)
+        self.archive_lookahead_spin.valueChanged.connect(self.on_archive_lookahead_changed)
+        lookahead_row.addWidget(self.archive_lookahead_spin)
+        lookahead_row.addStretch()
+        layout.addLayout(lookahead_row)
+
+        chd_backend_row = QHBoxLayout()
+        self.chd_backend_label = QLabel("CHD creation")
+        chd_backend_row.addWidget(self.chd_backend_label)
+        self.chd_backend_combo = QComboBox()
+        self.chd_backend_combo.addItem("chdman", "chdman")
+        self.chd_backend_combo.addItem("Native (multi-core)", "native")
+        self.chd_backend_combo.currentIndexChanged.connect(self.on_chd_backend_changed)
+        chd_backend_row.addWidget(self.chd_backend_combo)
+        chd_backend_row.addStretch()
+        layout.addLayout(chd_backend_row)
+
+        self.parent_chds_checkbox = QCheckBox("Revisions and regional variants as child CHDs")
+        self.parent_chds_checkbox.toggled.connect(self.on_parent_chds_toggled)
+        layout.addWidget(self.parent_chds_checkbox)
+
+        sector_check_row = QHBoxLayout()
+        self.sector_check_label = QLabel("Sector check before CHD creation")
+        sector_check_row.addWidget(self.sector_check_label)
+        self.sector_check_combo = QComboBox()
+        self.sector_check_combo.addItem("Off", "off")
+        self.sector_check_combo.addItem("Report errors", "report")
+        self.sector_check_combo.addItem("Skip failing discs", "exclude")
+        self.sector_check_combo.currentIndexChanged.connect(self.on_sector_check_changed)
+        sector_check_row.addWidget(self.sector_check_combo)
+        sector_check_row.addStretch()
+        layout.addLayout(sector_check_row)
+
+        compression_profile_row = QHBoxLayout()
+        self.compression_profile_label = QLabel("Compression profile")
+        compression_profile_row.addWidget(self.compression_profile_label)
+        self.compression_profile_combo = QComboBox()
+        self.compression_profile_combo.currentIndexChanged.connect(self.on_compression_profile_changed)
+        compression_profile_row.addWidget(self.compression_profile_combo)
+        compression_profile_row.addStretch()
+        layout.addLayout(compression_profile_row)
+
+        log_lines_row = QHBoxLayout()
+        self.log_max_lines_label = QLabel("Log lines kept on screen")
+        log_lines_row.addWidget(self.log_max_lines_label)
+        self.log_max_lines_spin = QSpinBox()
+        self.log_max_lines_spin.setRange(1000, 200000)
+        self.log_max_lines_spin.setSingleStep(1000)
+        self.log_max_lines_spin.valueChanged.connect(self.on_log_max_lines_changed)
+        log_lines_row.addWidget(self.log_max_lines_spin)
+        log_lines_row.addStretch()
+        layout.addLayout(log_lines_row)
+
         language_row = QHBoxLayout()
         self.language_label = QLabel("Language")
         language_row.addWidget(self.language_label)
         self.language_combo = QComboBox()
-        self.language_combo.addItem("FR", "fr")
-        self.language_combo.addItem("EN", "en")
+        for language_code in SUPPORTED_LANGUAGES:
+            self.language_combo.addItem(language_code.upper(), language_code)
         self.language_combo.currentIndexChanged.connect(self.on_language_changed)
         language_row.addWidget(self.language_combo)
         language_row.addStretch()
@@ -564,6 +789,12 @@ class SettingsDialog(QDialog):
         self.remember_source_checkbox.blockSignals(True)
         self.delete_source_checkbox.blockSignals(True)
         self.log_level_combo.blockSignals(True)
+        self.max_jobs_spin.blockSignals(True)
+        self.archive_lookahead_spin.blockSignals(True)
+        self.chd_backend_combo.blockSignals(True)
+        self.parent_chds_checkbox.blockSignals(True)
+        self.sector_check_combo.blockSignals(True)
+        self.log_max_lines_spin.blockSignals(True)
         self.language_combo.blockSignals(True)
 
         theme_index = self.theme_combo.findData(self.main_window.theme_mode)
@@ -574,6 +805,17 @@ class SettingsDialog(QDialog):
         log_level_index = self.log_level_combo.findData(self.main_window.screen_log_level)
         if log_level_index >= 0:
             self.log_level_combo.setCurrentIndex(log_level_index)
+        self.max_jobs_spin.setValue(int(self.main_window.max_jobs))
+        self.archive_lookahead_spin.setValue(int(self.main_window.archive_lookahead))
+        chd_backend_index = self.chd_backend_combo.findData(self.main_window.chd_backend)
+        if chd_backend_index >= 0:
+            self.chd_backend_combo.setCurrentIndex(chd_backend_index)
+        self.parent_chds_checkbox.setChecked(bool(self.main_window.parent_chds))
+        sector_check_index = self.sector_check_combo.findData(self.main_window.sector_check)
+        if sector_check_index >= 0:
+            self.sector_check_combo.setCurrentIndex(sector_check_index)
+        self.fill_compression_profiles(self.main_window.language)
+        self.log_max_lines_spin.setValue(int(self.main_window.log_max_lines))
         index = self.language_combo.findData(self.main_window.language)
         if index >= 0:
             self.language_combo.setCurrentIndex(index)
@@ -582,6 +824,12 @@ class SettingsDialog(QDialog):
         self.remember_source_checkbox.blockSignals(False)
         self.delete_source_checkbox.blockSignals(False)
         self.log_level_combo.blockSignals(False)
+        self.max_jobs_spin.blockSignals(False)
+        self.archive_lookahead_spin.blockSignals(False)
+        self.chd_backend_combo.blockSignals(False)
+        self.parent_chds_checkbox.blockSignals(False)
+        self.sector_check_combo.blockSignals(False)
+        self.log_max_lines_spin.blockSignals(False)
         self.language_combo.blockSignals(False)
 
     def apply_language(self, language, main_window=None):
@@ -599,6 +847,19 @@ class SettingsDialog(QDialog):
         self.log_level_label.setText(main_window.tr('ui.settings.log_level', language=language))
         self.log_level_combo.setItemText(0, main_window.tr('ui.settings.log_level_verbose', language=language))
         self.log_level_combo.setItemText(1, main_window.tr('ui.settings.log_level_error_only', language=language))
+        self.max_jobs_label.setText(main_window.tr('ui.settings.max_jobs', language=language))
+        self.archive_lookahead_label.setText(main_window.tr('ui.settings.archive_lookahead', language=language))
+        self.chd_backend_label.setText(main_window.tr('ui.settings.chd_backend', language=language))
+        self.chd_backend_combo.setItemText(0, main_window.tr('ui.settings.chd_backend_chdman', language=language))
+        self.chd_backend_combo.setItemText(1, main_window.tr('ui.settings.chd_backend_native', language=language))
+        self.parent_chds_checkbox.setText(main_window.tr('ui.settings.parent_chds', language=language))
+        self.sector_check_label.setText(main_window.tr('ui.settings.sector_check', language=language))
+        self.sector_check_combo.setItemText(0, main_window.tr('ui.settings.sector_check_off', language=language))
+        self.sector_check_combo.setItemText(1, main_window.tr('ui.settings.sector_check_report', language=language))
+        self.sector_check_combo.setItemText(2, main_window.tr('ui.settings.sector_check_exclude', language=language))
+        self.compression_profile_label.setText(main_window.tr('ui.settings.compression_profile', language=language))
+        self.fill_compression_profiles(language)
+        self.log_max_lines_label.setText(main_window.tr('ui.settings.log_max_lines', language=language))
         self.language_label.setText(main_window.tr('ui.settings.language', language=language))
         self.support_button.setText(main_window.tr('ui.settings.support', language=language))
         self.close_button.setText(main_window.tr('ui.common.close', language=language))
@@ -623,10 +884,63 @@ class SettingsDialog(QDialog):
             if level in ('verbose', 'error_only'):
                 self.main_window.set_screen_log_level(str(level))
 
+    def on_max_jobs_changed(self, value):
+        if self.main_window:
+            self.main_window.set_max_jobs(value)
+
+    def on_archive_lookahead_changed(self, value):
+        if self.main_window:
+            self.main_window.set_archive_lookahead(value)
+
+    def on_chd_backend_changed(self):
+        if self.main_window:
+            backend = self.chd_backend_combo.currentData()
+            if backend in ('chdman', 'native'):
+                self.main_window.set_chd_backend(str(backend))
+
+    def on_parent_chds_toggled(self, checked):
+        if self.main_window:
+            self.main_window.set_parent_chds(checked)
+
+    def on_sector_check_changed(self):
+        if self.main_window:
+            mode = self.sector_check_combo.currentData()
+            if mode in ('off', 'report', 'exclude'):
+                self.main_window.set_sector_check(str(mode))
+
+    def fill_compression_profiles(self, language):
+        """Profils intégrés (libellés traduits) puis profils utilisateur de compression_profiles.json."""
+        if not self.main_window:
+            return
+        try:
+            names = list(load_profiles())
+        except ProfileError:
+            names = list(BUILTIN_PROFILES)
+        self.compression_profile_combo.blockSignals(True)
+        self.compression_profile_combo.clear()
+        for name in names:
+            label = name
+            if name in BUILTIN_PROFILES:
+                label = self.main_window.tr(f'ui.settings.compression_profile_{name}', language=language, default=name)
+            self.compression_profile_combo.addItem(label, name)
+        index = self.compression_profile_combo.findData(self.main_window.compression_profile)
+        self.compression_profile_combo.setCurrentIndex(max(0, index))
+        self.compression_profile_combo.blockSignals(False)
+
+    def on_compression_profile_changed(self):
+        if self.main_window:
+            name = self.compression_profile_combo.currentData()
+            if name:
+                self.main_window.set_compression_profile(str(name))
+
+    def on_log_max_lines_changed(self, value):
+        if self.main_window:
+            self.main_window.set_log_max_lines(value)
+
     def on_language_changed(self):
         if self.main_window:
             data = self.language_combo.currentData()
-            if data in ('fr', 'en'):
+            if data in SUPPORTED_LANGUAGES:
                 self.main_window.set_language(data)
 
     def open_support(self):
@@ -649,16 +963,23 @@ class B2PCMainWindow(QMainWindow):
         self.language = 'fr'
         self.remember_folders = True
         self.screen_log_level = 'error_only'
+        self.max_jobs = 1
+        self.archive_lookahead = 1
+        self.chd_backend = 'chdman'
+        self.parent_chds = False
+        self.sector_check = 'off'
+        self.compression_profile = DEFAULT_PROFILE
+        self.compression_profile_overrides: Dict[str, str] = {}  # famille de handlers -> profil dédié
+        self.log_max_lines = 10000
         self._settings = {}
         self._translation_store = []  # Liste de tuples (widget, i18n_key)
-        self.translations_fr: Dict[str, str] = {}
-        self.translations_en: Dict[str, str] = {}
-        self.log_translations_fr: Dict[str, str] = {}
-        self.log_translations_en: Dict[str, str] = {}
+        self.i18n: Optional[TranslationCatalog] = None
         self.operation_title_keys: Dict[str, str] = {
             "Conversion ISO/CUE/GDI > CHD": "ui.operation.chd_convert",
             "Extraire CHD": "ui.operation.extract_chd",
+            "Optimiser CHD": "ui.operation.recompress_chd",
             "Merge BIN/CUE": "ui.operation.merge_bin_cue",
+            "Split BIN/CUE": "ui.operation.split_bin_cue",
             "Conversion ISO vers RVZ": "ui.operation.iso_to_rvz",
             "wSquashFS Compression": "ui.operation.wsquashfs_compress",
             "wSquashFS Extraction": "ui.operation.wsquashfs_extract",
@@ -675,6 +996,8 @@ class B2PCMainWindow(QMainWindow):
         self._settings = self.load_settings()
         if isinstance(self._settings, dict):
             self.language = self._settings.get('language', 'fr')
+            if self.language not in SUPPORTED_LANGUAGES:
+                self.language = 'fr'
             loaded_theme_mode = str(self._settings.get('theme_mode', '') or '').strip().lower()
             if loaded_theme_mode in ('light', 'dark', 'accessibility'):
                 self.theme_mode = loaded_theme_mode
@@ -685,6 +1008,27 @@ class B2PCMainWindow(QMainWindow):
             self.delete_source_after_conversion = bool(self._settings.get('delete_source_after_conversion', False))
             loaded_log_level = str(self._settings.get('screen_log_level', 'error_only') or '').strip().lower()
             self.screen_log_level = loaded_log_level if loaded_log_level in ('verbose', 'error_only') else 'error_only'
+            try:
+                self.max_jobs = max(1, int(self._settings.get('max_jobs', 1) or 1))
+            except (TypeError, ValueError):
+                self.max_jobs = 1
+            try:
+                self.archive_lookahead = max(0, int(self._settings.get('archive_lookahead', 1)))
+            except (TypeError, ValueError):
+                self.archive_lookahead = 1
+            loaded_chd_backend = str(self._settings.get('chd_backend', 'chdman') or '').strip().lower()
+            self.chd_backend = loaded_chd_backend if loaded_chd_backend in ('chdman', 'native') else 'chdman'
+            self.parent_chds = bool(self._settings.get('parent_chds', False))
+            loaded_sector_check = str(self._settings.get('sector_check', 'off') or '').strip().lower()
+            self.sector_check = loaded_sector_check if loaded_sector_check in ('off', 'report', 'exclude') else 'off'
+            self.compression_profile = str(self._settings.get('compression_profile', DEFAULT_PROFILE) or DEFAULT_PROFILE)
+            overrides = self._settings.get('compression_profile_overrides', {})
+            if isinstance(overrides, dict):
+                self.compression_profile_overrides = {str(k): str(v) for k, v in overrides.items() if v}
+            try:
+                self.log_max_lines = max(1000, int(self._settings.get('log_max_lines', 10000)))
+            except (TypeError, ValueError):
+                self.log_max_lines = 10000
         # Charger la configuration UI
         self.ui_config = self.load_ui_config()
 
@@ -692,42 +1036,17 @@ class B2PCMainWindow(QMainWindow):
         self.restore_folder_settings()
         self.apply_styles()
         # Appliquer la langue chargée
-        if self.language == 'en':
+        if self.language != 'fr':
             self.retranslate_ui()
 
-    def load_translation_file(self, language: str) -> Dict[str, Any]:
-        """Charge un fichier de traduction JSON depuis ressources/i18n."""
-        try:
-            path = resource_path(f"ressources/i18n/{language}.json")
-            if not os.path.exists(path):
-                return {}
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                return data
-        except Exception as e:
-            print(f"Erreur chargement traduction {language}: {e}")
-        return {}
-
     def load_translations(self):
-        """Charge les chaînes UI et logs depuis fr.json/en.json."""
-        fr_data = self.load_translation_file('fr')
-        en_data = self.load_translation_file('en')
-
-        fr_ui = fr_data.get('ui', {}) if isinstance(fr_data, dict) else {}
-        en_ui = en_data.get('ui', {}) if isinstance(en_data, dict) else {}
-        fr_logs = fr_data.get('log_fragments', {}) if isinstance(fr_data, dict) else {}
-        en_logs = en_data.get('log_fragments', {}) if isinstance(en_data, dict) else {}
-
-        self.translations_fr = fr_ui if isinstance(fr_ui, dict) else {}
-        self.translations_en = en_ui if isinstance(en_ui, dict) else {}
-        self.log_translations_fr = fr_logs if isinstance(fr_logs, dict) else {}
-        self.log_translations_en = en_logs if isinstance(en_logs, dict) else {}
+        """Prépare le catalogue ressources/i18n: chaque langue est lue au premier usage."""
+        self.i18n = TranslationCatalog(resource_path("ressources/i18n"))
 
     def tr(self, key: str, language: Optional[str] = None, default: Optional[str] = None) -> str:
         lang = language or self.language
-        table = self.translations_en if lang == 'en' else self.translations_fr
-        fallback = self.translations_fr
+        table = self.i18n.ui(lang)
+        fallback = self.i18n.ui('fr')
 
         if key in table:
             return str(table[key])
@@ -765,6 +1084,14 @@ class B2PCMainWindow(QMainWindow):
                 'remember_folders': self.remember_folders,
                 'delete_source_after_conversion': self.delete_source_after_conversion,
                 'screen_log_level': self.screen_log_level,
+                'max_jobs': self.max_jobs,
+                'archive_lookahead': self.archive_lookahead,
+                'chd_backend': self.chd_backend,
+                'parent_chds': self.parent_chds,
+                'sector_check': self.sector_check,
+                'compression_profile': self.compression_profile,
+                'compression_profile_overrides': self.compression_profile_overrides,
+                'log_max_lines': self.log_max_lines,
                 'source_folder': source_saved,
                 'dest_folder': ''
             }
@@ -992,8 +1319,10 @@ class B2PCMainWindow(QMainWindow):
             "ui.group.tools",
             [
                 ("ui.button.chd_info", self.show_chd_info, "#a855f7"),
+                ("ui.button.recompress_chd", self.recompress_chd, "#22c55e"),
                 ("ui.button.xbox_patch", self.patch_xbox_iso, "#a855f7"),
                 ("ui.button.merge_bin_cue", self.merge_bin_cue, "#22c55e"),
+                ("ui.button.split_bin_cue", self.split_bin_cue, "#22c55e"),
                 ("ui.button.ps3_decrypt", self.decrypt_ps3_iso, "#a855f7")
             ]
         )
@@ -1268,10 +1597,12 @@ class B2PCMainWindow(QMainWindow):
         self.theme_mode = normalized
         self.dark_mode = normalized == 'dark'
         self.apply_styles()
+        if self.log_dialog:
+            self.log_dialog.apply_theme(normalized)
         self.save_settings()
 
     def set_language(self, language_code: str):
-        if language_code not in ('fr', 'en'):
+        if language_code not in SUPPORTED_LANGUAGES:
             return
         self.language = language_code
         self.retranslate_ui()
@@ -1292,6 +1623,38 @@ class B2PCMainWindow(QMainWindow):
         self.screen_log_level = normalized
         self.save_settings()
 
+    def set_max_jobs(self, value: int):
+        self.max_jobs = max(1, int(value))
+        self.save_settings()
+
+    def set_archive_lookahead(self, value: int):
+        self.archive_lookahead = max(0, int(value))
+        self.save_settings()
+
+    def set_chd_backend(self, backend: str):
+        normalized = str(backend or '').strip().lower()
+        self.chd_backend = normalized if normalized in ('chdman', 'native') else 'chdman'
+        self.save_settings()
+
+    def set_parent_chds(self, enabled: bool):
+        self.parent_chds = bool(enabled)
+        self.save_settings()
+
+    def set_sector_check(self, mode: str):
+        normalized = str(mode or '').strip().lower()
+        self.sector_check = normalized if normalized in ('off', 'report', 'exclude') else 'off'
+        self.save_settings()
+
+    def set_compression_profile(self, name: str):
+        self.compression_profile = str(name or '').strip() or DEFAULT_PROFILE
+        self.save_settings()
+
+    def set_log_max_lines(self, value: int):
+        self.log_max_lines = max(1000, int(value))
+        if self.log_dialog:
+            self.log_dialog.log_model.set_max_lines(self.log_max_lines)
+        self.save_settings()
+
     def should_display_log_message(self, message: str) -> bool:
         """Filtre les logs affichés à l'écran selon le niveau choisi."""
         if self.screen_log_level != 'error_only':
@@ -1325,18 +1688,8 @@ class B2PCMainWindow(QMainWindow):
             self.settings_dialog.apply_language(self.language, self)
 
     def translate_log_message(self, message: str) -> str:
-        """Remplace les fragments FR par EN en conservant emojis et chiffres."""
-        if self.language != 'en':
-            return message
-
-        translated = message
-        for key, fr_fragment in self.log_translations_fr.items():
-            en_fragment = self.log_translations_en.get(key)
-            if not en_fragment:
-                continue
-            if fr_fragment in translated:
-                translated = translated.replace(fr_fragment, en_fragment)
-        return translated
+        """Traduit les fragments FR d'un message de log dans la langue de l'interface."""
+        return self.i18n.translate_log(message, self.language)
     
     def update_button_states(self):
         """Met à jour l'état des boutons selon la sélection des dossiers"""
@@ -1417,7 +1770,7 @@ class B2PCMainWindow(QMainWindow):
         self.log_dialog.apply_language(self.language, self)
 
         # Reset contenu
-        self.log_dialog.log_text.clear()
+        self.log_dialog.clear_logs()
         self.log_dialog.hide_progress()
 
         # Traduction du titre d'opération
@@ -1434,19 +1787,44 @@ class B2PCMainWindow(QMainWindow):
             self.source_folder,
             self.dest_folder,
             delete_source_after_conversion=self.delete_source_after_conversion,
+            max_jobs=self.max_jobs,
+            archive_lookahead=self.archive_lookahead,
+            chd_backend=self.chd_backend,
+            parent_chds=self.parent_chds,
+            sector_check=self.sector_check,
+            compression_profile=self.compression_profile,
+            compression_profile_overrides=self.compression_profile_overrides,
         )
         self.log_dialog.set_worker_thread(self.current_worker)
 
         self.update_main_progress(0, "Initialisation...")
         self.current_worker.progress_update.connect(self.log_dialog.update_progress)
         self.current_worker.progress_update.connect(self.update_main_progress)
-        self.current_worker.log_message.connect(self.log_dialog.add_log)
+        self.current_worker.log_batch.connect(self.log_dialog.add_logs)
         self.current_worker.finished.connect(self.on_conversion_finished)
         self.current_worker.finished.connect(self.log_dialog.on_finished)
         self.current_worker.start()
 
         self.log_dialog.show()
 
+    def start_update_check(self):
+        """Lance la vérification de mise à jour sans bloquer l'affichage."""
+        self.update_checker = UpdateChecker(self)
+        self.update_checker.update_available.connect(self.on_update_available)
+        self.update_checker.start()
+
+    def on_update_available(self, latest_version: str, download_url: str):
+        msg = f"Une nouvelle version ({latest_version}) est disponible !\nTélécharger ?"
+        answer = QMessageBox.question(
+            self,
+            "Mise à jour disponible",
+            msg,
+            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel,
+        )
+        if answer == QMessageBox.StandardButton.Ok:
+            webbrowser.open(download_url)
+            QApplication.quit()  # Ferme l'application immédiatement
+
     def show_logs_dialog(self):
         """Affiche ou crée la fenêtre de logs sans démarrer une nouvelle conversion."""
         if not self.log_dialog:
@@ -1480,8 +1858,14 @@ class B2PCMainWindow(QMainWindow):
         # Utiliser l'intitulé FR comme clé de traduction
         self.show_conversion_dialog("Extraire CHD")
     
+    def recompress_chd(self):
+        self.show_conversion_dialog("Optimiser CHD")
+
     def merge_bin_cue(self):
         self.show_conversion_dialog("Merge BIN/CUE")
+
+    def split_bin_cue(self):
+        self.show_conversion_dialog("Split BIN/CUE")
     
     def convert_iso_rvz(self):
         self.show_conversion_dialog("Conversion ISO vers RVZ")
@@ -1531,20 +1915,90 @@ class B2PCMainWindow(QMainWindow):
             return
 
         dialog = CHDInfoDialog(self)
-        dialog.populate(chd_files, tools_path=Path('ressources'))
+        dialog.populate(sorted(chd_files, key=lambda f: f.name.lower()))
         dialog.exec()
 
 
+class ChdInfoScanThread(QThread):
+    """Lecture des en-têtes CHD hors du thread de l'interface, avec cache disque.
+
+    Les lignes en cache sont envoyées tout de suite, les autres au fil de leur lecture
+    (pool de threads: la lecture d'un en-tête est surtout de l'attente disque).
+    Les lignes partent par lots de (index, ligne), au plus toutes les 50 ms.
+    """
+    rows_ready = pyqtSignal(list)
+    SIGNAL_FLUSH_INTERVAL = 0.05
+
+    def __init__(self, files, parent=None):
+        super().__init__(parent)
+        self.files = list(files)
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from handlers.chd_cache import ChdInfoCache
+
+        cache = ChdInfoCache()
+        pending: List[Tuple[int, dict]] = []
+        last_flush = time.monotonic()
+        to_read = []
+        for index, path in enumerate(self.files):
+            row = cache.lookup(path)
+            if row is None:
+                to_read.append(index)
+            else:
+                pending.append((index, row))
+        if pending:
+            self.rows_ready.emit(pending)
+            pending = []
+        try:
+            if to_read:
+                workers = min(8, len(to_read), 2 * (os.cpu_count() or 1))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="B2PC_chdinfo") as executor:
+                    futures = {executor.submit(cache.get, self.files[index]): index for index in to_read}
+                    for future in as_completed(futures):
+                        if self._stop.is_set():
+                            for other in futures:
+                                other.cancel()
+                            break
+                        pending.append((futures[future], future.result()))
+                        if time.monotonic() - last_flush >= self.SIGNAL_FLUSH_INTERVAL:
+                            self.rows_ready.emit(pending)
+                            pending, last_flush = [], time.monotonic()
+            if pending:
+                self.rows_ready.emit(pending)
+        finally:
+            if self.files:
+                cache.forget_missing(self.files[0].parent)
+            cache.save()
+
+
+class _SortableItem(QTableWidgetItem):
+    """Cellule triée sur sa valeur (Qt.ItemDataRole.UserRole) plutôt que sur son texte."""
+    def __lt__(self, other):
+        mine = self.data(Qt.ItemDataRole.UserRole)
+        theirs = other.data(Qt.ItemDataRole.UserRole)
+        if mine is None or theirs is None:
+            return theirs is None and mine is not None  # Valeurs inconnues en dernier
+        return mine < theirs
+
+
 class CHDInfoDialog(QDialog):
-    """Dialog pour afficher les infos des CHD."""
+    """Dialog pour afficher les infos des CHD.
+
+    Le tableau se remplit au fil du scan (ChdInfoScanThread); le tri et les totaux se font
+    sur les valeurs déjà lues, sans relire les fichiers."""
     def __init__(self, parent=None):
         super().__init__(parent)
         p = parent if isinstance(parent, B2PCMainWindow) else None
+        self._p = p
         title = p.tr('ui.chdinfo.title', default='Infos CHD') if p else 'Infos CHD'
         self.setWindowTitle(title)
         self.resize(900, 400)
         layout = QVBoxLayout(self)
-        from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
         self.table = QTableWidget(0, 6)
         if p:
             headers = [
@@ -1568,9 +2022,17 @@ class CHDInfoDialog(QDialog):
                     self.table.setColumnWidth(i, w)
             header.setStretchLastSection(False)
         layout.addWidget(self.table)
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
         btn_close = QPushButton(p.tr('ui.common.close', default='Fermer') if p else 'Fermer')
         btn_close.clicked.connect(self.accept)
         layout.addWidget(btn_close)
+        self._name_items: List[QTableWidgetItem] = []
+        self._rows: Dict[int, dict] = {}
+        self._scanner: Optional[ChdInfoScanThread] = None
+
+    def _text(self, key: str, default: str) -> str:
+        return self._p.tr(key, default=default) if self._p else default
 
     def human(self, n):
         try:
@@ -1583,57 +2045,69 @@ class CHDInfoDialog(QDialog):
         except Exception:
             return str(n)
 
-    def parse_info(self, text: str):
-        version = None
-        logical = None
-        chd_size = None
-        ratio = None
-        chd_type = None
-        # Regex lignes
-        for line in text.splitlines():
-            line=line.strip()
-            if line.startswith('File Version:'):
-                version = line.split(':',1)[1].strip()
-            elif line.startswith('Logical size:'):
-                logical = re.sub(r'[^0-9]','', line.split(':',1)[1])
-            elif line.startswith('CHD size:'):
-                chd_size = re.sub(r'[^0-9]','', line.split(':',1)[1])
-            elif line.startswith('Ratio:'):
-                ratio = line.split(':',1)[1].strip()
-            elif line.startswith('Metadata:') and "Tag='DVD" in line:
-                chd_type = 'DVD'
-            elif line.startswith('Metadata:') and "TRACK:1" in line:
-                chd_type = 'CD'
-        if not chd_type:
-            # heuristique: si logical size > 1.5GB => DVD
-            try:
-                if logical and int(logical) > 1500*1024*1024:
-                    chd_type='DVD'
-                else:
-                    chd_type='CD'
-            except Exception:
-                chd_type='?'
-        return version or '?', chd_type, logical, chd_size, ratio or '?'
-
-    def populate(self, files, tools_path: Path):
-        from PyQt6.QtWidgets import QTableWidgetItem
-        chdman = tools_path / 'chdman.exe'
-        for f in files:
-            try:
-                # Exécuter chdman info
-                proc = subprocess.run([str(chdman), 'info', '--input', str(f)], capture_output=True, text=True, timeout=30)
-                output = proc.stdout + '\n' + proc.stderr
-                version, chd_type, logical, chd_size, ratio = self.parse_info(output)
-            except Exception as e:
-                version, chd_type, logical, chd_size, ratio = ('?','?',None,None,'?')
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row,0,QTableWidgetItem(f.name))
-            self.table.setItem(row,1,QTableWidgetItem(version))
-            self.table.setItem(row,2,QTableWidgetItem(chd_type))
-            self.table.setItem(row,3,QTableWidgetItem(self.human(logical) if logical else '?'))
-            self.table.setItem(row,4,QTableWidgetItem(self.human(chd_size) if chd_size else '?'))
-            self.table.setItem(row,5,QTableWidgetItem(ratio))
+    def populate(self, files):
+        """Crée une ligne par fichier puis lance la lecture des en-têtes en arrière-plan."""
+        files = list(files)
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(files))
+        for row, f in enumerate(files):
+            item = _SortableItem(f.name)
+            item.setData(Qt.ItemDataRole.UserRole, f.name.lower())
+            self.table.setItem(row, 0, item)
+            self._name_items.append(item)
+            for column in range(1, 6):
+                self.table.setItem(row, column, _SortableItem("…"))
+        self.table.setSortingEnabled(True)
+        self._update_summary(len(files))
+        self._scanner = ChdInfoScanThread(files, self)
+        self._scanner.rows_ready.connect(self.add_rows)
+        self._scanner.finished.connect(lambda: self._update_summary(len(files)))
+        self._scanner.start()
+
+    def add_rows(self, rows):
+        """Affiche des lignes lues par le scan: [(index du fichier, ligne), ...]."""
+        # Tri suspendu pendant la mise à jour, sinon les lignes bougent sous nos pieds
+        self.table.setSortingEnabled(False)
+        for index, data in rows:
+            self._rows[index] = data
+            row = self.table.row(self._name_items[index])
+            logical, chd_size = data.get("logical_size"), data.get("file_size")
+            ratio = chd_size / logical if logical and chd_size else None
+            cells = [
+                (str(data["version"]) if data.get("version") else '?', data.get("version")),
+                (data.get("type") or '?', data.get("type")),
+                (self.human(logical) if logical else '?', logical),
+                (self.human(chd_size) if chd_size else '?', chd_size),
+                (f"{ratio * 100:.1f}%" if ratio is not None else '?', ratio),
+            ]
+            for column, (text, value) in enumerate(cells, start=1):
+                item = _SortableItem(text)
+                item.setData(Qt.ItemDataRole.UserRole, value)
+                if data.get("error"):
+                    item.setToolTip(data["error"])
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self._update_summary(len(self._name_items))
+
+    def _update_summary(self, total: int):
+        """Totaux des lignes déjà lues (tailles cumulées et ratio d'ensemble)."""
+        readable = [r for r in self._rows.values() if r.get("logical_size") and r.get("file_size")]
+        logical = sum(r["logical_size"] for r in readable)
+        compressed = sum(r["file_size"] for r in readable)
+        parts = []
+        if len(self._rows) < total:
+            parts.append(f"{self._text('ui.chdinfo.scanning', 'Analyse en cours')} {len(self._rows)}/{total}")
+        parts.append(f"{self._text('ui.chdinfo.total', 'Total')} : {len(readable)} CHD")
+        if logical:
+            parts.append(f"{self.human(logical)} → {self.human(compressed)} ({compressed * 100 / logical:.1f}%)")
+        self.summary_label.setText("  ·  ".join(parts))
+
+    def done(self, result):
+        # Fermeture (bouton, Échap ou croix): arrêter le scan avant de détruire le tableau
+        if self._scanner is not None:
+            self._scanner.stop()
+            self._scanner.wait()
+        super().done(result)
 
 def main():
     """Point d'entrée principal"""
@@ -1647,8 +2121,11 @@ def main():
     # Fenêtre principale
     window = B2PCMainWindow()
     window.show()
+    window.start_update_check()
     
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Exécutable PyInstaller: les processus de décodage CHD relancent l'exécutable
+    multiprocessing.freeze_support()
     main()